@@ -0,0 +1,414 @@
+"""
+Microbenchmarks for cora's per-call hot paths: payload assembly, phone
+normalisation, call serialisation and the poll loops (driven by a stub client
+with zero poll spacing, so only cora's own overhead is timed).
+
+    python benchmarks/hotpaths.py                     # run, compare with baseline.json
+    python benchmarks/hotpaths.py -k payload          # only matching benchmarks
+    python benchmarks/hotpaths.py --json out.json     # also write raw results
+    python benchmarks/hotpaths.py --save-baseline     # refresh the stored baseline
+
+Exits non-zero when a benchmark's fastest sample is more than ``--tolerance``
+slower than the baseline's (the minimum is far less sensitive to noisy
+neighbours than the median). Baselines are machine-specific: refresh them on
+the box that runs the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_TIME = 0.1
+DEFAULT_REPEAT = 7
+
+Setup = Callable[[], Callable[[], Any]]
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def bench(name: str) -> Callable[[Setup], Setup]:
+    """
+    Register ``setup``; it runs once and returns the zero-argument callable to time.
+    """
+
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+# --- payload assembly ---------------------------------------------------------
+
+
+@bench("assistant.voice_payload")
+def _voice_payload() -> Callable[[], Any]:
+    from cora import openai_voices
+    from cora.assistants import _voice_payload
+
+    voice = openai_voices.alloy
+    return lambda: _voice_payload(voice)
+
+
+@bench("assistant.transcriber_payload")
+def _transcriber_payload() -> Callable[[], Any]:
+    from cora import deepgram_transcribers
+    from cora.assistants import _transcriber_payload
+
+    transcriber = deepgram_transcribers.english
+    return lambda: _transcriber_payload(transcriber)
+
+
+@bench("assistant.pass_fail_plan")
+def _pass_fail_plan() -> Callable[[], Any]:
+    from cora import pass_fail_plan
+
+    return lambda: pass_fail_plan(rubric="PassFail", timeout_seconds=20)
+
+
+@bench("assistant.build_payload")
+def _assistant_payload() -> Callable[[], Any]:
+    from cora import deepgram_transcribers, openai_voices, pass_fail_plan
+    from cora.assistants import _build_assistant_payload
+
+    plan = pass_fail_plan()
+    return lambda: _build_assistant_payload(
+        name="Scheduler",
+        system_prompt="You help patients reschedule appointments.",
+        voice=openai_voices.alloy,
+        transcriber=deepgram_transcribers.english,
+        analysis_plan=plan,
+        first_message="Hi, this is the clinic calling.",
+        model_provider="openai",
+        model_name="gpt-4o-mini",
+        tool_ids=[],
+    )
+
+
+@bench("calls.normalize_phone")
+def _normalize_phone() -> Callable[[], Any]:
+    from cora import normalize_phone
+
+    numbers = ["+1 (954) 320-0121", "954.320.0121", "9543200121", "+44 20 7946 0958", "1-800-555-0199"]
+    return lambda: [normalize_phone(number) for number in numbers]
+
+
+@bench("calls.normalize_phones[10k]")
+def _normalize_phones() -> Callable[[], Any]:
+    from cora import normalize_phones
+
+    rng = random.Random(5)
+    numbers = [
+        f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}" for _ in range(10_000)
+    ]
+    return lambda: normalize_phones(numbers)
+
+
+@bench("calls.normalize_customer")
+def _normalize_customer() -> Callable[[], Any]:
+    from cora.calls import _normalize_customer
+
+    customers = ["+1 (954) 320-0121", {"number": "954.320.0121"}, {"number": "+44 20 7946 0958", "name": "Ana"}]
+    return lambda: [_normalize_customer(customer) for customer in customers]
+
+
+@bench("calls.build_payload")
+def _call_payload() -> Callable[[], Any]:
+    from cora.calls import _build_call_payload
+
+    return lambda: _build_call_payload(
+        assistant_id="22222222-2222-4222-8222-222222222222",
+        phone_number_id="33333333-3333-4333-8333-333333333333",
+        customer="+1 (954) 320-0121",
+        assistant_overrides={"variableValues": {"name": "Ana"}},
+    )
+
+
+# --- serialisation --------------------------------------------------------------
+
+
+def _sample_calls(count: int, messages: int) -> List[Any]:
+    from serializer import build_call
+    from vapi.types import Call
+
+    rng = random.Random(11)
+    return [Call.model_validate(build_call(rng, i, messages)) for i in range(count)]
+
+
+@bench("serialize.call_to_payload[100 msgs]")
+def _call_to_payload() -> Callable[[], Any]:
+    from cora.calls import _call_to_payload
+
+    (call,) = _sample_calls(1, 100)
+    return lambda: _call_to_payload(call)
+
+
+@bench("serialize.messages[100 msgs]")
+def _serialize_messages() -> Callable[[], Any]:
+    from cora.serialization import dumps_messages
+
+    (call,) = _sample_calls(1, 100)
+    return lambda: dumps_messages(call.messages)
+
+
+@bench("serialize.to_python[call]")
+def _to_python() -> Callable[[], Any]:
+    from cora.serialization import to_python
+
+    (call,) = _sample_calls(1, 20)
+    return lambda: to_python(call)
+
+
+# --- poll loops -------------------------------------------------------------------
+
+
+class _StubCalls:
+    """
+    Replays a fixed sequence of call states; ``get`` never blocks.
+    """
+
+    def __init__(self, states: List[Any]) -> None:
+        self._states = states
+        self._cursor: Dict[str, int] = {}
+
+    def get(self, call_id: str) -> Any:
+        index = self._cursor.get(call_id, 0)
+        self._cursor[call_id] = index + 1
+        return self._states[min(index, len(self._states) - 1)]
+
+    def reset(self) -> None:
+        self._cursor.clear()
+
+
+def _poll_states(polls: int, messages_per_poll: int = 2) -> List[Any]:
+    states = []
+    messages: List[Dict[str, Any]] = []
+    for index in range(polls):
+        for turn in range(messages_per_poll):
+            messages.append({"role": "bot" if turn % 2 else "user", "message": f"turn {index}.{turn}"})
+        terminal = index == polls - 1
+        states.append(
+            SimpleNamespace(
+                id="call-1",
+                status="ended" if terminal else "in-progress",
+                messages=list(messages),
+                updated_at=index,
+                ended_reason="customer-ended-call" if terminal else None,
+            )
+        )
+    return states
+
+
+def _stub_client(polls: int) -> SimpleNamespace:
+    return SimpleNamespace(calls=_StubCalls(_poll_states(polls)))
+
+
+@bench("poll.poll_until_terminal[20 polls]")
+def _poll_until_terminal() -> Callable[[], Any]:
+    from cora import poll_until_terminal
+
+    client = _stub_client(20)
+
+    def run() -> Any:
+        client.calls.reset()
+        return poll_until_terminal(client, "call-1", interval=0.0)
+
+    return run
+
+
+@bench("poll.wait_for_terminal[20 polls]")
+def _wait_for_terminal() -> Callable[[], Any]:
+    from cora import wait_for_terminal
+
+    client = _stub_client(20)
+
+    def run() -> Any:
+        client.calls.reset()
+        return wait_for_terminal(client, "call-1", interval=0.0, echo_messages=False)
+
+    return run
+
+
+@bench("poll.watch_call[20 polls]")
+def _watch_call() -> Callable[[], Any]:
+    from cora import watch_call
+
+    client = _stub_client(20)
+
+    def run() -> Any:
+        client.calls.reset()
+        return sum(1 for _ in watch_call(client, "call-1", interval=0.0))
+
+    return run
+
+
+@bench("poll.adaptive_tracker[20 polls]")
+def _adaptive_tracker() -> Callable[[], Any]:
+    from cora import DEFAULT_POLL_POLICY
+
+    states = _poll_states(20)
+
+    def run() -> Any:
+        tracker = DEFAULT_POLL_POLICY.tracker()
+        return [tracker.observe(state) for state in states]
+
+    return run
+
+
+@bench("poll.call_monitor[50 calls x 5 polls]")
+def _call_monitor() -> Callable[[], Any]:
+    from cora import CallMonitor
+
+    client = _stub_client(5)
+    call_ids = [f"call-{i}" for i in range(50)]
+
+    def run() -> Any:
+        client.calls.reset()
+        monitor = CallMonitor(client, interval=0.0, concurrency=1)
+        for call_id in call_ids:
+            monitor.add(call_id)
+        return sum(1 for _ in monitor.events())
+
+    return run
+
+
+@bench("poll.call_monitor_pooled[50 calls x 5 polls]")
+def _call_monitor_pooled() -> Callable[[], Any]:
+    from cora import CallMonitor
+
+    client = _stub_client(5)
+    call_ids = [f"call-{i}" for i in range(50)]
+
+    def run() -> Any:
+        client.calls.reset()
+        monitor = CallMonitor(client, interval=0.0)
+        for call_id in call_ids:
+            monitor.add(call_id)
+        return sum(1 for _ in monitor.events())
+
+    return run
+
+
+# --- runner -------------------------------------------------------------------------
+
+
+def measure(fn: Callable[[], Any], *, min_time: float, repeat: int) -> Dict[str, Any]:
+    """
+    Calibrate a loop count that runs for at least ``min_time`` seconds, then take
+    ``repeat`` samples and report nanoseconds per call.
+    """
+    fn()
+    loops = 1
+    while True:
+        elapsed = _time_loops(fn, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    samples = [_time_loops(fn, loops) / loops * 1e9 for _ in range(repeat)]
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": min(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def _time_loops(fn: Callable[[], Any], loops: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """
+    Return the names of benchmarks whose fastest sample regressed beyond
+    ``tolerance``.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["min_ns"] > reference["min_ns"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="seconds per sample")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results to --baseline")
+    parser.add_argument("--json", type=Path, help="write machine-readable results to this file")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    selected = {name: setup for name, setup in BENCHMARKS.items() if not args.pattern or args.pattern in name}
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("benchmarks", {})
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'benchmark':<40} {'min':>12} {'median':>12} {'baseline':>12} {'ratio':>7}")
+    for name, setup in selected.items():
+        results[name] = measure(setup(), min_time=args.min_time, repeat=args.repeat)
+        reference = baseline.get(name)
+        ratio = results[name]["min_ns"] / reference["min_ns"] if reference else None
+        print(
+            f"{name:<40} {_format_ns(results[name]['min_ns']):>12} {_format_ns(results[name]['median_ns']):>12} "
+            f"{_format_ns(reference['min_ns']) if reference else '-':>12} "
+            f"{f'{ratio:.2f}x' if ratio else '-':>7}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, sort_keys=True))
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({**report, "benchmarks": merged}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"FAIL: slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("OK" if baseline else "no baseline to compare against (run with --save-baseline)")
+    return 0
+
+
+def _format_ns(value: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value:.0f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
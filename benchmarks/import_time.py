@@ -0,0 +1,81 @@
+"""
+Measure the cold-start cost of `import cora` with `python -X importtime` and
+fail when it exceeds a budget.
+
+    python benchmarks/import_time.py                 # default budget
+    python benchmarks/import_time.py --budget-ms 25 --runs 7 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_BUDGET_MS = 20.0
+DEFAULT_RUNS = 5
+HEAVY_MODULES = ("vapi", "pydantic", "httpx", "pandas")
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(statement: str = "import cora") -> Tuple[float, List[str]]:
+    """
+    Run one fresh interpreter and return the cumulative milliseconds spent
+    importing the top-level package plus the heavy dependencies it loaded.
+    """
+    probe = f"{statement}; import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    loaded_heavy = [name for name in proc.stdout.strip().split(",") if name]
+    target = statement.split()[-1].split(".")[0]
+    return cumulative.get(target, 0) / 1000.0, loaded_heavy
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--json", action="store_true", help="print a machine-readable result")
+    args = parser.parse_args(argv)
+
+    samples = []
+    heavy: List[str] = []
+    for _ in range(args.runs):
+        elapsed_ms, heavy = measure()
+        samples.append(elapsed_ms)
+    median_ms = statistics.median(samples)
+    ok = median_ms <= args.budget_ms and not heavy
+
+    result = {
+        "benchmark": "import_time",
+        "median_ms": round(median_ms, 3),
+        "samples_ms": [round(sample, 3) for sample in samples],
+        "budget_ms": args.budget_ms,
+        "heavy_modules_loaded": heavy,
+        "ok": ok,
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"import cora: median {median_ms:.2f} ms over {args.runs} runs (budget {args.budget_ms:.2f} ms)")
+        if heavy:
+            print(f"eagerly imported heavy modules: {', '.join(heavy)}")
+        print("OK" if ok else "OVER BUDGET")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Compare the per-type cached serializer in ``cora.serialization`` with the
+original hasattr-probing implementation on real-shaped Vapi calls, and check
+that both produce byte-identical output.
+
+    python benchmarks/serializer.py --calls 200 --messages 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+def legacy_object_to_python(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {k: legacy_object_to_python(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [legacy_object_to_python(v) for v in value]
+    for attr in ("model_dump", "dict"):
+        if hasattr(value, attr):
+            method = getattr(value, attr)
+            try:
+                data = method()
+            except TypeError:
+                continue
+            return legacy_object_to_python(data)
+    if hasattr(value, "__dict__"):
+        return {
+            k: legacy_object_to_python(v)
+            for k, v in value.__dict__.items()
+            if not k.startswith("_") and not callable(v)
+        }
+    if hasattr(value, "json"):
+        try:
+            data = value.json()
+        except TypeError:
+            return str(value)
+        if isinstance(data, str):
+            return data
+        return legacy_object_to_python(data)
+    return str(value)
+
+
+def legacy_serialize_messages(messages: Any) -> Optional[str]:
+    if not messages:
+        return None
+    serialized = []
+    for message in messages:
+        if hasattr(message, "json"):
+            try:
+                serialized.append(message.json())
+                continue
+            except TypeError:
+                pass
+        serialized.append(legacy_object_to_python(message))
+    try:
+        return json.dumps(serialized, default=str)
+    except TypeError:
+        return str(serialized)
+
+
+def build_call(rng: random.Random, index: int, n_messages: int) -> Dict[str, Any]:
+    """
+    Return a camelCase call payload shaped like ``GET /call/{id}`` responses.
+    """
+    started = datetime(2025, 6, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "message": "You are a scheduling assistant.", "time": 0.0, "secondsFromStart": 0.0}
+    ]
+    clock = 0.0
+    for turn in range(n_messages):
+        clock += rng.uniform(0.5, 6.0)
+        kind = turn % 5
+        if kind == 3:
+            messages.append(
+                {
+                    "role": "tool_calls",
+                    "toolCalls": [
+                        {
+                            "id": f"call_{index}_{turn}",
+                            "type": "function",
+                            "function": {"name": "lookup_slot", "arguments": json.dumps({"day": "tue", "n": turn})},
+                        }
+                    ],
+                    "message": "",
+                    "time": clock,
+                    "secondsFromStart": clock,
+                }
+            )
+        elif kind == 4:
+            messages.append(
+                {
+                    "role": "tool_call_result",
+                    "toolCallId": f"call_{index}_{turn}",
+                    "name": "lookup_slot",
+                    "result": json.dumps({"slots": ["09:00", "10:30"], "ok": True}),
+                    "time": clock,
+                    "secondsFromStart": clock,
+                    "metadata": {"latencyMs": rng.randint(40, 900)},
+                }
+            )
+        else:
+            role = "user" if kind % 2 else "bot"
+            message = {
+                "role": role,
+                "message": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30))),
+                "time": clock,
+                "endTime": clock + 1.5,
+                "secondsFromStart": clock,
+                "duration": 1500.0,
+            }
+            if role == "user":
+                message["confidence"] = round(rng.random(), 3)
+            else:
+                message["source"] = "model"
+            messages.append(message)
+    return {
+        "id": f"00000000-0000-4000-8000-{index:012d}",
+        "orgId": "11111111-1111-4111-8111-111111111111",
+        "type": "outboundPhoneCall",
+        "status": "ended",
+        "endedReason": rng.choice(["customer-ended-call", "assistant-ended-call", "silence-timed-out"]),
+        "assistantId": "22222222-2222-4222-8222-222222222222",
+        "phoneNumberId": "33333333-3333-4333-8333-333333333333",
+        "customer": {"number": f"+1555{index:07d}"},
+        "createdAt": started.isoformat(),
+        "updatedAt": (started + timedelta(seconds=clock + 5)).isoformat(),
+        "startedAt": (started + timedelta(seconds=2)).isoformat(),
+        "endedAt": (started + timedelta(seconds=clock + 3)).isoformat(),
+        "cost": round(rng.uniform(0.01, 1.5), 4),
+        "messages": messages,
+        "metadata": {"campaign": "june-recall", "row": index, "tags": ["a", "b"], "at": started.isoformat()},
+        "analysis": {
+            "summary": "Patient rescheduled.",
+            "successEvaluation": "true",
+            "structuredData": {"rescheduled": True, "slot": "10:30", "notes": None},
+        },
+    }
+
+
+def nested_datetime_messages() -> List[Any]:
+    """
+    Fern models with datetimes at the top level and nested inside models,
+    lists and dicts, where ``.json()`` and the fast path take different
+    routes to the same text.
+    """
+    from pydantic import create_model
+    from vapi.core.pydantic_utilities import UniversalBaseModel
+
+    # create_model keeps real annotations, so the fast path can inspect them.
+    stamp = create_model("Stamp", __base__=UniversalBaseModel, at=(datetime, ...), note=(Optional[str], None))
+    message = create_model(
+        "StampedMessage",
+        __base__=UniversalBaseModel,
+        role=(str, ...),
+        at=(datetime, ...),
+        stamp=(stamp, ...),
+        history=(List[stamp], ...),
+        extra=(Dict[str, Any], ...),
+    )
+    offset = timezone(timedelta(hours=-5))
+    return [
+        message(
+            role="bot",
+            at=datetime(2025, 6, 1, 1, 2, 3, 456, tzinfo=offset),
+            stamp=stamp(at=datetime(2025, 6, 1, tzinfo=timezone.utc), note=None),
+            history=[stamp(at=datetime(2025, 6, 1, 5)), stamp(at=datetime(2025, 6, 1, 6, tzinfo=offset), note="x")],
+            extra={"when": datetime(2025, 6, 2, tzinfo=timezone.utc), "nested": {"at": datetime(2025, 6, 3)}},
+        )
+    ]
+
+
+WORDS = "the appointment is on tuesday please confirm your date of birth thanks okay".split()
+
+
+def time_it(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=300, help="messages per call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    from vapi.types import Call
+
+    from cora import serialization
+    from cora.calls import _call_to_payload
+
+    rng = random.Random(args.seed)
+    calls = [Call.model_validate(build_call(rng, i, args.messages)) for i in range(args.calls)]
+
+    stamped = nested_datetime_messages()
+    if legacy_serialize_messages(stamped) != serialization.dumps_messages(stamped):
+        print("messages mismatch for nested datetimes", file=sys.stderr)
+        return 1
+    if legacy_object_to_python(stamped) != serialization.to_python(stamped):
+        print("to_python mismatch for nested datetimes", file=sys.stderr)
+        return 1
+
+    for call in calls:
+        if legacy_serialize_messages(call.messages) != serialization.dumps_messages(call.messages):
+            print(f"messages mismatch for call {call.id}", file=sys.stderr)
+            return 1
+        for value in (call.metadata, call.analysis, call.customer, call):
+            if legacy_object_to_python(value) != serialization.to_python(value):
+                print(f"to_python mismatch for call {call.id}", file=sys.stderr)
+                return 1
+
+    results = {
+        "messages_legacy_s": time_it(lambda: [legacy_serialize_messages(c.messages) for c in calls], args.repeat),
+        "messages_cached_s": time_it(lambda: [serialization.dumps_messages(c.messages) for c in calls], args.repeat),
+        "to_python_legacy_s": time_it(lambda: [legacy_object_to_python(c) for c in calls], args.repeat),
+        "to_python_cached_s": time_it(lambda: [serialization.to_python(c) for c in calls], args.repeat),
+        "payload_s": time_it(lambda: [_call_to_payload(c) for c in calls], args.repeat),
+    }
+    if serialization.fast_json_available():
+        results["messages_fast_s"] = time_it(
+            lambda: [serialization.dumps_messages(c.messages, fast=True) for c in calls], args.repeat
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    n = args.calls * (args.messages + 1)
+    print(f"{args.calls} calls x {args.messages + 1} messages ({n} messages), outputs identical")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1000:9.1f} ms")
+    print(f"  messages speedup       {results['messages_legacy_s'] / results['messages_cached_s']:9.2f}x")
+    print(f"  to_python speedup      {results['to_python_legacy_s'] / results['to_python_cached_s']:9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
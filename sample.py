@@ -4,12 +4,12 @@ import cora
 
 
 def build_assistant(connector: cora.VapiConnector):
-    """Provision a sample assistant with voice, transcriber, and analysis plan."""
+    """Provision (or reuse) a sample assistant with voice, transcriber, and analysis plan."""
     voice = cora.openai_voices.nova
     transcriber = cora.deepgram_transcribers.custom(lang="en")
     plan = cora.pass_fail_plan()
 
-    return cora.create_assistant(
+    return cora.upsert_assistant(
         name="demo-patient",
         system_prompt="You are a helpful scheduling assistant.",
         voice=voice,
@@ -20,12 +20,10 @@ def build_assistant(connector: cora.VapiConnector):
     )
 
 
-def choose_phone_number(connector: cora.VapiConnector) -> str:
-    """Pick the first phone number from the account (replace in production)."""
-    numbers = cora.list_phone_numbers(connector=connector)
-    if not numbers:
-        raise RuntimeError("No phone numbers available; provision one in Vapi first.")
-    return numbers[0].id
+def choose_phone_number(connector: cora.VapiConnector, customer: str) -> str:
+    """Pick an account number local to the customer (any active number otherwise)."""
+    directory = cora.PhoneNumberDirectory(connector=connector)
+    return directory.select_for(customer).id
 
 
 def start_call(connector: cora.VapiConnector, assistant_id: str, number: str, phone_number_id: str):
@@ -50,12 +48,11 @@ def main():
     connector = cora.VapiConnector()
 
     assistant = build_assistant(connector)
-    phone_number_id = choose_phone_number(connector)
+    phone_number_id = choose_phone_number(connector, test_phone_number)
     call = start_call(connector, assistant.id, test_phone_number, phone_number_id)
     watch_call(connector, call.id)
 
-    # Delete the assistant to clean up the example
-    connector.assistants.delete(assistant.id)
+    # The assistant is kept and reused by the next run; see cora.AssistantRegistry.
 
 
 if __name__ == "__main__":
@@ -1,40 +1,178 @@
 """
 Top-level package entrypoint for the Cora helper library.
+
+Public names are resolved lazily on first access (PEP 562), so `import cora`
+does not pull in the Vapi SDK, its pydantic models, or the voice/transcriber
+presets until they are actually used.
 """
 
-from .analysis_plan import pass_fail_plan
-from .assistants import create_assistant
-from .calls import (
-    TERMINAL_STATUSES,
-    create_call,
-    normalize_phone,
-    poll_until_terminal,
-    wait_for_terminal,
-    watch_call,
-)
-from .chats import chat, create_chat
-from .phone_numbers import get_phone_number, list_phone_numbers
-from .transcribers import deepgram_transcribers, Deepgram
-from .voices import eleven_labs_voices, openai_voices, azure_voices
-from .vapi_client import VapiConnector
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .analysis_plan import pass_fail_plan
+    from .assistants import create_assistant
+    from .assistants.manifest import SyncResult, sync_assistants
+    from .assistants.registry import AssistantRegistry, upsert_assistant
+    from .assistants.templates import AssistantTemplate, define_template, register_template
+    from .calls import (
+        DEFAULT_POLL_POLICY,
+        TERMINAL_STATUSES,
+        MessageCursor,
+        PollPolicy,
+        create_call,
+        normalize_phone,
+        poll_until_terminal,
+        wait_for_terminal,
+        watch_call,
+    )
+    from .calls.batch import CallResult, create_calls
+    from .calls.cache import TerminalCallCache
+    from .calls.monitor import CallMonitor, MonitorEvent
+    from .calls.normalize import NormalizedPhones, normalize_phones
+    from .chats import ChatSessionCache, ChatStream, chat, create_chat, stream_chat
+    from .chats.broadcast import BroadcastResult, broadcast_chat
+    from .export import ExportResult, export_calls
+    from .metrics import Metrics, enable_metrics
+    from .phone_numbers import PhoneNumberDirectory, get_phone_number, list_phone_numbers
+    from .settings import Settings, get_settings
+    from .store import CallStore
+    from .transcribers import Deepgram, deepgram_transcribers
+    from .vapi_client import (
+        AsyncVapiConnector,
+        CircuitOpenError,
+        RequestPolicy,
+        VapiConnector,
+        get_default_connector,
+    )
+    from .voices import azure_voices, eleven_labs_voices, openai_voices
+    from .webhooks import CallEventHub, WebhookReceiver
+
+_LAZY_ATTRS: Dict[str, str] = {
+    "pass_fail_plan": ".analysis_plan",
+    "create_assistant": ".assistants",
+    "upsert_assistant": ".assistants.registry",
+    "AssistantRegistry": ".assistants.registry",
+    "define_template": ".assistants.templates",
+    "sync_assistants": ".assistants.manifest",
+    "SyncResult": ".assistants.manifest",
+    "register_template": ".assistants.templates",
+    "AssistantTemplate": ".assistants.templates",
+    "TERMINAL_STATUSES": ".calls",
+    "create_call": ".calls",
+    "normalize_phone": ".calls",
+    "normalize_phones": ".calls.normalize",
+    "NormalizedPhones": ".calls.normalize",
+    "poll_until_terminal": ".calls",
+    "wait_for_terminal": ".calls",
+    "watch_call": ".calls",
+    "PollPolicy": ".calls",
+    "DEFAULT_POLL_POLICY": ".calls",
+    "MessageCursor": ".calls",
+    "create_calls": ".calls.batch",
+    "CallResult": ".calls.batch",
+    "TerminalCallCache": ".calls.cache",
+    "CallMonitor": ".calls.monitor",
+    "MonitorEvent": ".calls.monitor",
+    "CallEventHub": ".webhooks",
+    "WebhookReceiver": ".webhooks",
+    "export_calls": ".export",
+    "ExportResult": ".export",
+    "CallStore": ".store",
+    "create_chat": ".chats",
+    "chat": ".chats",
+    "ChatSessionCache": ".chats",
+    "stream_chat": ".chats",
+    "ChatStream": ".chats",
+    "broadcast_chat": ".chats.broadcast",
+    "BroadcastResult": ".chats.broadcast",
+    "deepgram_transcribers": ".transcribers",
+    "Deepgram": ".transcribers",
+    "eleven_labs_voices": ".voices",
+    "openai_voices": ".voices",
+    "azure_voices": ".voices",
+    "VapiConnector": ".vapi_client",
+    "AsyncVapiConnector": ".vapi_client",
+    "get_default_connector": ".vapi_client",
+    "RequestPolicy": ".vapi_client",
+    "CircuitOpenError": ".vapi_client",
+    "Metrics": ".metrics",
+    "enable_metrics": ".metrics",
+    "Settings": ".settings",
+    "get_settings": ".settings",
+    "list_phone_numbers": ".phone_numbers",
+    "get_phone_number": ".phone_numbers",
+    "PhoneNumberDirectory": ".phone_numbers",
+}
 
 __all__ = [
     "pass_fail_plan",
     "create_assistant",
+    "upsert_assistant",
+    "AssistantRegistry",
+    "define_template",
+    "register_template",
+    "AssistantTemplate",
+    "sync_assistants",
+    "SyncResult",
     "TERMINAL_STATUSES",
     "create_call",
+    "create_calls",
+    "CallResult",
+    "TerminalCallCache",
     "normalize_phone",
+    "normalize_phones",
+    "NormalizedPhones",
     "poll_until_terminal",
     "wait_for_terminal",
     "watch_call",
+    "CallMonitor",
+    "MonitorEvent",
+    "PollPolicy",
+    "DEFAULT_POLL_POLICY",
+    "MessageCursor",
+    "CallEventHub",
+    "WebhookReceiver",
+    "export_calls",
+    "ExportResult",
+    "CallStore",
     "create_chat",
     "chat",
+    "ChatSessionCache",
+    "stream_chat",
+    "ChatStream",
+    "broadcast_chat",
+    "BroadcastResult",
     "deepgram_transcribers",
     "Deepgram",
     "eleven_labs_voices",
     "openai_voices",
     "azure_voices",
     "VapiConnector",
+    "AsyncVapiConnector",
+    "get_default_connector",
+    "RequestPolicy",
+    "CircuitOpenError",
+    "Metrics",
+    "enable_metrics",
+    "Settings",
+    "get_settings",
     "list_phone_numbers",
     "get_phone_number",
+    "PhoneNumberDirectory",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,443 @@
+"""
+Asyncio versions of the Cora helpers. Payloads are built by the same private
+builders the blocking helpers use, so sync and async callers can be mixed
+freely against the same assistants, calls and chats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .. import metrics as _metrics
+from ..assistants import TranscriberInput, VoiceInput, _build_assistant_payload
+from ..calls import (
+    Customer,
+    _build_call_payload,
+    _call_to_dataframe,
+    _is_terminal,
+    _newest_event_seq,
+    _terminal_snapshot,
+    _watch_snapshot,
+)
+from ..calls.cursor import MessageCursor
+from ..calls.polling import PollPolicy, _resolve_policy
+from ..calls.batch import DEFAULT_CONCURRENCY, CallResult, CallRow, _batch_phone_number_id, _prepare_rows
+from ..chats import ChatInput, CustomerInput, _build_chat_payload, _chat_payloads, _forget_session, _remember_session
+from ..chats.sessions import ChatSessionCache, is_stale_session_error
+from ..chats.streaming import AsyncChatStream, stream_body
+from ..phone_numbers import PhoneNumberDirectory
+from ..vapi_client import AsyncVapiConnector, get_default_async_connector
+
+if TYPE_CHECKING:
+    from ..webhooks import CallEventHub
+
+__all__ = [
+    "AsyncVapiConnector",
+    "create_assistant",
+    "create_call",
+    "create_calls",
+    "poll_until_terminal",
+    "wait_for_terminal",
+    "watch_call",
+    "create_chat",
+    "chat",
+    "stream_chat",
+    "list_phone_numbers",
+    "get_phone_number",
+]
+
+
+@_metrics.helper("create_assistant")
+async def create_assistant(
+    *,
+    name: str,
+    system_prompt: str,
+    tool_ids: Optional[Sequence[str]] = None,
+    tools: Optional[Sequence[Mapping[str, Any]]] = None,
+    voice: VoiceInput,
+    transcriber: TranscriberInput,
+    analysis_plan: Optional[Any] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    first_message: Optional[str] = None,
+    model_provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    connector: Optional[AsyncVapiConnector] = None,
+    model_overrides: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.create_assistant`.
+    """
+    payload = _build_assistant_payload(
+        name=name,
+        system_prompt=system_prompt,
+        tool_ids=tool_ids,
+        tools=tools,
+        voice=voice,
+        transcriber=transcriber,
+        analysis_plan=analysis_plan,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        first_message=first_message,
+        model_provider=model_provider,
+        model_name=model_name,
+        model_overrides=model_overrides,
+    )
+    client = connector or get_default_async_connector()
+    return await client.assistants.create(**payload)
+
+
+@_metrics.helper("create_call")
+async def create_call(
+    *,
+    assistant_id: str,
+    phone_number_id: Optional[str] = None,
+    customer: Customer,
+    assistant_overrides: Optional[Dict[str, Any]] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    variables: Optional[Mapping[str, Any]] = None,
+    phone_numbers: Optional[PhoneNumberDirectory] = None,
+    v: Optional[AsyncVapiConnector] = None,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.create_call`. A stale ``phone_numbers``
+    directory is reloaded through ``v`` before the number is chosen.
+    """
+    client = v or get_default_async_connector()
+    if phone_numbers is not None:
+        await phone_numbers._aensure_fresh(client)
+    call_payload = _build_call_payload(
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        customer=customer,
+        assistant_overrides=assistant_overrides,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        variables=variables,
+        phone_numbers=phone_numbers,
+    )
+    return await client.calls.create(**call_payload)
+
+
+@_metrics.helper("create_calls")
+async def create_calls(
+    rows: Iterable[CallRow],
+    *,
+    assistant_id: str,
+    phone_number_id: Optional[str] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    phone_numbers: Optional[PhoneNumberDirectory] = None,
+    v: Optional[AsyncVapiConnector] = None,
+) -> AsyncGenerator[CallResult, None]:
+    """
+    Async counterpart of :func:`cora.create_calls`. Rows are validated before
+    the first call is sent, then dispatched with at most ``concurrency``
+    requests in flight; results are yielded in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    client = v or get_default_async_connector()
+    if phone_numbers is not None:
+        await phone_numbers._aensure_fresh(client)
+    resolved_phone_number_id = _batch_phone_number_id(phone_number_id, phone_numbers)
+
+    prepared, rejected = _prepare_rows(
+        rows,
+        assistant_id=assistant_id,
+        phone_number_id=resolved_phone_number_id,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        phone_numbers=phone_numbers,
+    )
+    for result in rejected:
+        yield result
+
+    async def _dial(index: int, customer: Any, call_payload: Dict[str, Any]) -> CallResult:
+        try:
+            call = await client.calls.create(**call_payload)
+        except Exception as exc:  # noqa: BLE001 - recorded per row
+            return CallResult(index=index, customer=customer, error=exc)
+        return CallResult(index=index, customer=customer, call=call)
+
+    queue = iter(prepared)
+    pending: set = set()
+    try:
+        for item in queue:
+            pending.add(asyncio.ensure_future(_dial(*item)))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for item in queue:
+                    pending.add(asyncio.ensure_future(_dial(*item)))
+                    break
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@_metrics.helper("poll_until_terminal")
+async def poll_until_terminal(
+    v: AsyncVapiConnector,
+    call_id: str,
+    *,
+    max_seconds: int = 600,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of :func:`cora.poll_until_terminal`; sleeps with
+    ``asyncio.sleep`` so other calls keep progressing on the same loop.
+    """
+    tracker = _resolve_policy(interval, policy).tracker()
+    deadline = time.monotonic() + max_seconds
+    last_message: Any = None
+    status: Optional[str] = None
+    call_obj: Any = None
+
+    while time.monotonic() < deadline:
+        call_obj = await v.calls.get(call_id)
+        status = getattr(call_obj, "status", None)
+        messages = getattr(call_obj, "messages", None) or []
+        if messages:
+            last_message = messages[-1]
+        if _is_terminal(call_obj, status=status):
+            break
+        await _sleep_until(deadline, tracker.observe(call_obj))
+
+    return _terminal_snapshot(call_obj, call_id, status=status, last_message=last_message)
+
+
+@_metrics.helper("wait_for_terminal")
+async def wait_for_terminal(
+    v: AsyncVapiConnector,
+    call_id: str,
+    *,
+    timeout_seconds: int = 600,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
+    echo_messages: bool = True,
+    pandas: bool = False,
+    events: Optional["CallEventHub"] = None,
+    cursor: Optional[MessageCursor] = None,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.wait_for_terminal`. With ``events``, the
+    coroutine awaits pushed server messages (``CallEventHub.await_event``)
+    instead of polling.
+    """
+    tracker = _resolve_policy(interval, policy).tracker()
+    cursor = cursor if cursor is not None else MessageCursor()
+    deadline = time.monotonic() + timeout_seconds
+    seen_event = 0
+    pushed_terminal = False
+    final_call: Any = None
+
+    while True:
+        call_obj = await v.calls.get(call_id)
+        final_call = call_obj
+        status = getattr(call_obj, "status", None)
+
+        new_messages = cursor.advance(getattr(call_obj, "messages", None))
+        if echo_messages:
+            for message in new_messages:
+                print(message)
+
+        if _is_terminal(call_obj, status=status):
+            break
+
+        if time.monotonic() > deadline:
+            break
+
+        if events is not None and not pushed_terminal:
+            seen_event, pushed_terminal = await _await_terminal_event(
+                events, call_id, after=seen_event, deadline=deadline, fallback=tracker.policy.max_interval
+            )
+            continue
+        await _sleep_until(deadline, tracker.observe(call_obj))
+
+    if pandas:
+        return _call_to_dataframe(final_call)
+    return final_call
+
+
+@_metrics.helper("watch_call")
+async def watch_call(
+    v: AsyncVapiConnector,
+    call_id: str,
+    *,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
+    events: Optional["CallEventHub"] = None,
+    cursor: Optional[MessageCursor] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Async generator that yields the same rolling snapshots as
+    :func:`cora.watch_call` until a terminal state is reached, including its
+    ``events=`` handling.
+    """
+    tracker = _resolve_policy(interval, policy).tracker()
+    cursor = cursor if cursor is not None else MessageCursor()
+    seen_event = 0
+    while True:
+        call_obj = await v.calls.get(call_id)
+        status = getattr(call_obj, "status", None)
+        yield _watch_snapshot(
+            getattr(call_obj, "id", None), status, cursor.advance(getattr(call_obj, "messages", None))
+        )
+        if _is_terminal(call_obj, status=status):
+            break
+        if events is None:
+            await asyncio.sleep(tracker.observe(call_obj))
+            continue
+        event = await events.await_event(call_id, after=seen_event, timeout=tracker.policy.max_interval)
+        if event is not None:
+            seen_event = _newest_event_seq(events, call_id, event)
+
+
+async def _await_terminal_event(
+    events: "CallEventHub",
+    call_id: str,
+    *,
+    after: int,
+    deadline: float,
+    fallback: float,
+) -> Tuple[int, bool]:
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return after, False
+        event = await events.await_event(call_id, after=after, timeout=min(fallback, remaining))
+        if event is None:
+            return after, False
+        after = event.seq
+        if event.terminal:
+            return after, True
+
+
+async def _sleep_until(deadline: float, delay: float) -> None:
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        await asyncio.sleep(min(delay, remaining))
+
+
+@_metrics.helper("create_chat")
+async def create_chat(
+    *,
+    assistant_id: str,
+    message: ChatInput,
+    customer: Optional[CustomerInput] = None,
+    phone_number_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    stream: bool = False,
+    name: Optional[str] = None,
+    previous_chat_id: Optional[str] = None,
+    assistant_overrides: Optional[Mapping[str, Any]] = None,
+    squad_id: Optional[str] = None,
+    use_llm_generated_message_for_outbound: bool = False,
+    variables: Optional[Mapping[str, Any]] = None,
+    sessions: Optional[ChatSessionCache] = None,
+    v: Optional[AsyncVapiConnector] = None,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.create_chat`.
+    """
+    session_payload, payload = _chat_payloads(
+        sessions,
+        assistant_id=assistant_id,
+        message=message,
+        customer=customer,
+        phone_number_id=phone_number_id,
+        session_id=session_id,
+        stream=stream,
+        name=name,
+        previous_chat_id=previous_chat_id,
+        assistant_overrides=assistant_overrides,
+        squad_id=squad_id,
+        use_llm_generated_message_for_outbound=use_llm_generated_message_for_outbound,
+        variables=variables,
+    )
+    client = v or get_default_async_connector()
+    if session_payload is not None:
+        try:
+            response = await client.chats.create(**session_payload)
+        except Exception as exc:
+            if not is_stale_session_error(exc):
+                raise
+            _forget_session(sessions, assistant_id, phone_number_id, customer, session_payload["session_id"])
+        else:
+            return response
+    response = await client.chats.create(**payload)
+    _remember_session(sessions, assistant_id, phone_number_id, customer, response)
+    return response
+
+
+def stream_chat(
+    *,
+    assistant_id: str,
+    message: ChatInput,
+    customer: Optional[CustomerInput] = None,
+    phone_number_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    name: Optional[str] = None,
+    previous_chat_id: Optional[str] = None,
+    assistant_overrides: Optional[Mapping[str, Any]] = None,
+    squad_id: Optional[str] = None,
+    use_llm_generated_message_for_outbound: bool = False,
+    variables: Optional[Mapping[str, Any]] = None,
+    v: Optional[AsyncVapiConnector] = None,
+) -> AsyncChatStream:
+    """
+    Async counterpart of :func:`cora.stream_chat`: returns an
+    :class:`~cora.chats.streaming.AsyncChatStream` to consume with
+    ``async for`` (no ``await`` needed to create it).
+    """
+    payload = _build_chat_payload(
+        assistant_id=assistant_id,
+        message=message,
+        customer=customer,
+        phone_number_id=phone_number_id,
+        session_id=session_id,
+        stream=True,
+        name=name,
+        previous_chat_id=previous_chat_id,
+        assistant_overrides=assistant_overrides,
+        squad_id=squad_id,
+        use_llm_generated_message_for_outbound=use_llm_generated_message_for_outbound,
+        variables=variables,
+    )
+    return AsyncChatStream(v or get_default_async_connector(), stream_body(payload))
+
+
+async def chat(**kwargs: Any) -> Any:
+    """
+    Convenience alias so callers can do `await cora.aio.chat(...)`.
+    """
+    return await create_chat(**kwargs)
+
+
+@_metrics.helper("list_phone_numbers")
+async def list_phone_numbers(
+    *,
+    connector: Optional[AsyncVapiConnector] = None,
+    **filters: Any,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.list_phone_numbers`.
+    """
+    client = connector or get_default_async_connector()
+    return await client.phone_numbers.list(**filters)
+
+
+@_metrics.helper("get_phone_number")
+async def get_phone_number(
+    phone_number_id: str,
+    *,
+    connector: Optional[AsyncVapiConnector] = None,
+) -> Any:
+    """
+    Async counterpart of :func:`cora.get_phone_number`.
+    """
+    client = connector or get_default_async_connector()
+    return await client.phone_numbers.get(phone_number_id)
@@ -1,21 +1,15 @@
 from __future__ import annotations
 
-import os
 import re
 from typing import Any, Dict, Mapping, Optional, Sequence, Union
 
+from .. import metrics as _metrics
 from ..analysis_plan import pass_fail_plan
+from ..settings import get_settings
 from ..transcribers.transcriber_profile import TranscriberProfile
-from ..vapi_client import VapiConnector
+from ..vapi_client import VapiConnector, get_default_connector
 from ..voices.voice_profile import VoiceProfile
 
-DEFAULT_MODEL_PROVIDER = os.getenv("VAPI_MODEL_PROVIDER", "openai")
-DEFAULT_MODEL_NAME = os.getenv("VAPI_MODEL_NAME", "gpt-5.1")
-DEFAULT_TOOL_IDS = [
-    item.strip()
-    for item in (os.getenv("VAPI_TOOL_IDS", "")).split(",")
-    if item.strip()
-]
 DEFAULT_TOOLS = [{"type": "endCall"}]
 UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
 
@@ -23,6 +17,7 @@ VoiceInput = Union[VoiceProfile, Mapping[str, Any]]
 TranscriberInput = Union[TranscriberProfile, Mapping[str, Any]]
 
 
+@_metrics.helper("create_assistant")
 def create_assistant(
     *,
     name: str,
@@ -43,15 +38,49 @@ def create_assistant(
     Thin wrapper around vapi.assistants.create that wires together the common
     defaults used across assistants in this project.
     """
-    client = connector or VapiConnector()
+    payload = _build_assistant_payload(
+        name=name,
+        system_prompt=system_prompt,
+        tool_ids=tool_ids,
+        tools=tools,
+        voice=voice,
+        transcriber=transcriber,
+        analysis_plan=analysis_plan,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        first_message=first_message,
+        model_provider=model_provider,
+        model_name=model_name,
+        model_overrides=model_overrides,
+    )
+    client = connector or get_default_connector()
+    return client.assistants.create(
+        **payload,
+    )
+
 
+def _build_assistant_payload(
+    *,
+    name: str,
+    system_prompt: str,
+    tool_ids: Optional[Sequence[str]] = None,
+    tools: Optional[Sequence[Mapping[str, Any]]] = None,
+    voice: VoiceInput,
+    transcriber: TranscriberInput,
+    analysis_plan: Optional[Any] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    first_message: Optional[str] = None,
+    model_provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    model_overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    settings = get_settings()
     model_payload: Dict[str, Any] = {
-        "provider": model_provider or DEFAULT_MODEL_PROVIDER,
-        "model": model_name or DEFAULT_MODEL_NAME,
+        "provider": model_provider or settings.model_provider,
+        "model": model_name or settings.model_name,
         "messages": [{"role": "system", "content": system_prompt}],
         "tools": list(tools or DEFAULT_TOOLS),
     }
-    resolved_tool_ids = list(tool_ids) if tool_ids else list(DEFAULT_TOOL_IDS)
+    resolved_tool_ids = list(tool_ids) if tool_ids else list(settings.tool_ids)
     if resolved_tool_ids:
         invalid_tool_ids = [tool_id for tool_id in resolved_tool_ids if not UUID_PATTERN.match(tool_id)]
         if invalid_tool_ids:
@@ -78,10 +107,7 @@ def create_assistant(
     }
     if background_speech_denoising_plan is not None:
         payload["background_speech_denoising_plan"] = background_speech_denoising_plan
-
-    return client.assistants.create(
-        **payload,
-    )
+    return payload
 
 
 def _voice_payload(voice: VoiceInput) -> Dict[str, Any]:
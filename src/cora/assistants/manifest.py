@@ -0,0 +1,400 @@
+"""
+Declarative assistant manifests.
+
+A manifest lists the assistants a deployment should have, keyed by name.
+:func:`sync_assistants` lists the account once, diffs every assistant field by
+field against the manifest and sends only the creates, updates and deletes
+that are actually needed, several at a time.
+
+Manifests are JSON or YAML::
+
+    name: clinic-a                  # marks assistants this manifest owns
+    defaults:
+      voice: openai_voices.nova
+      transcriber: deepgram_transcribers.english
+      analysis_plan: pass_fail_plan
+    assistants:
+      - name: recall-es
+        system_prompt: "Eres Cora..."
+        voice: eleven_labs_voices.ana_maria
+        transcriber: {ref: deepgram_transcribers.custom, lang: es}
+        analysis_plan: {ref: summary_plan, enabled: true}
+
+String values of ``voice``, ``transcriber``, ``analysis_plan`` and
+``background_speech_denoising_plan`` may name a preset or builder from Cora
+(``openai_voices.nova``, ``pass_fail_plan``); a mapping with ``ref`` calls
+that builder with the remaining keys. Any other mapping is sent as-is.
+"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .. import metrics as _metrics
+from ..vapi_client import VapiConnector, get_default_connector
+from . import _build_assistant_payload
+from .registry import _camel, _remote_canonical, canonical_assistant
+
+__all__ = ["SyncAction", "SyncResult", "load_manifest", "sync_assistants"]
+
+ManifestInput = Union[str, Path, Mapping[str, Any]]
+
+MANAGED_BY_KEY = "coraManifest"
+DEFAULT_SYNC_CONCURRENCY = 8
+LIST_PAGE_SIZE = 1000
+ASSISTANT_FIELDS = frozenset(
+    {
+        "name",
+        "system_prompt",
+        "tool_ids",
+        "tools",
+        "voice",
+        "transcriber",
+        "analysis_plan",
+        "background_speech_denoising_plan",
+        "first_message",
+        "model_provider",
+        "model_name",
+        "model_overrides",
+        "metadata",
+    }
+)
+REFERENCE_FIELDS = ("voice", "transcriber", "analysis_plan", "background_speech_denoising_plan")
+# Top-level assistant fields a manifest owns. A field the manifest no longer
+# sets is cleared on the server rather than left behind.
+MANAGED_FIELDS = (
+    "model",
+    "voice",
+    "transcriber",
+    "first_message",
+    "analysis_plan",
+    "background_speech_denoising_plan",
+    "metadata",
+)
+
+
+@dataclass(frozen=True)
+class SyncAction:
+    """
+    One planned (or executed) change. ``op`` is ``"create"``, ``"update"``,
+    ``"delete"`` or ``"noop"``; ``fields`` lists the top-level fields an
+    update touches.
+    """
+
+    op: str
+    name: Optional[str]
+    assistant_id: Optional[str] = None
+    fields: Tuple[str, ...] = ()
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    actions: Tuple[SyncAction, ...]
+    dry_run: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return all(action.ok for action in self.actions)
+
+    @property
+    def changes(self) -> List[SyncAction]:
+        return [action for action in self.actions if action.op != "noop"]
+
+    def summary(self) -> Dict[str, int]:
+        counts = {"create": 0, "update": 0, "delete": 0, "noop": 0, "failed": 0}
+        for action in self.actions:
+            counts[action.op] += 1
+            if not action.ok:
+                counts["failed"] += 1
+        return counts
+
+
+def load_manifest(source: ManifestInput) -> Dict[str, Any]:
+    """
+    Read a manifest from a mapping or a ``.json`` / ``.yaml`` / ``.yml`` file
+    and check its shape. YAML needs PyYAML (``pip install "cora[yaml]"``).
+    """
+    if isinstance(source, Mapping):
+        manifest = dict(source)
+    else:
+        path = Path(source)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix.lower() in (".yaml", ".yml"):
+            manifest = _load_yaml(text)
+        else:
+            manifest = json.loads(text)
+    if not isinstance(manifest, Mapping):
+        raise ValueError("A manifest must be a mapping with an 'assistants' list.")
+    assistants = manifest.get("assistants")
+    if not isinstance(assistants, list):
+        raise ValueError("A manifest must define 'assistants' as a list.")
+    defaults = manifest.get("defaults") or {}
+    if not isinstance(defaults, Mapping):
+        raise ValueError("Manifest 'defaults' must be a mapping.")
+    unknown = sorted(set(defaults) - ASSISTANT_FIELDS - {"name"})
+    if unknown or "name" in defaults:
+        raise ValueError(f"Unknown fields in manifest defaults: {unknown or ['name']}")
+    seen = set()
+    for entry in assistants:
+        if not isinstance(entry, Mapping) or not entry.get("name"):
+            raise ValueError("Every manifest assistant must be a mapping with a 'name'.")
+        if entry["name"] in seen:
+            raise ValueError(f"Assistant name {entry['name']!r} appears more than once in the manifest.")
+        seen.add(entry["name"])
+        unknown = sorted(set(entry) - ASSISTANT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields for assistant {entry['name']!r}: {unknown}")
+    return dict(manifest)
+
+
+@_metrics.helper("sync_assistants")
+def sync_assistants(
+    manifest: ManifestInput,
+    *,
+    prune: Optional[bool] = None,
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_SYNC_CONCURRENCY,
+    connector: Optional[VapiConnector] = None,
+) -> SyncResult:
+    """
+    Make the account match ``manifest``. Server state is read with a single
+    ``assistants.list`` (more only past 1000 assistants); assistants are
+    matched by name and only differing fields are sent. With ``prune``
+    (default: the manifest's ``prune`` key) assistants previously created by
+    this manifest but no longer listed are deleted; that requires a top-level
+    manifest ``name``. ``dry_run`` returns the plan without changing anything.
+    Failures are recorded per action, never raised.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    spec = load_manifest(manifest)
+    manifest_name = spec.get("name")
+    if prune is None:
+        prune = bool(spec.get("prune", False))
+    if prune and not manifest_name:
+        raise ValueError("prune needs a manifest 'name' to know which assistants it owns.")
+
+    desired = [_desired_payload(entry, spec.get("defaults") or {}, manifest_name) for entry in spec["assistants"]]
+    client = connector if connector is not None else get_default_connector()
+    remote = _list_assistants(client)
+    by_name = _index_by_name(remote, manifest_name)
+
+    planned: List[Tuple[SyncAction, Optional[Callable[[], Any]]]] = []
+    for payload in desired:
+        planned.append(_plan_one(client, payload, by_name.get(payload["name"])))
+    if prune:
+        wanted = {payload["name"] for payload in desired}
+        for assistant in remote:
+            owner = (getattr(assistant, "metadata", None) or {}).get(MANAGED_BY_KEY)
+            if owner == manifest_name and getattr(assistant, "name", None) not in wanted:
+                action = SyncAction(op="delete", name=assistant.name, assistant_id=assistant.id)
+                planned.append((action, _bind(client.assistants.delete, assistant.id)))
+
+    if dry_run:
+        return SyncResult(actions=tuple(action for action, _ in planned), dry_run=True)
+    actions = _execute(planned, concurrency=concurrency)
+    _register_templates(desired, actions)
+    return SyncResult(actions=actions)
+
+
+def _desired_payload(
+    entry: Mapping[str, Any], defaults: Mapping[str, Any], manifest_name: Optional[str]
+) -> Dict[str, Any]:
+    merged = {**defaults, **entry}
+    for key in REFERENCE_FIELDS:
+        if key in merged:
+            merged[key] = _resolve_reference(merged[key], key)
+    metadata = dict(merged.pop("metadata", None) or {})
+    if "system_prompt" not in merged:
+        raise ValueError(f"Assistant {entry['name']!r} needs a system_prompt.")
+    for key in ("voice", "transcriber"):
+        if key not in merged:
+            raise ValueError(f"Assistant {entry['name']!r} needs a {key} (directly or under 'defaults').")
+    payload = _build_assistant_payload(**merged)
+    if manifest_name:
+        metadata[MANAGED_BY_KEY] = manifest_name
+    if metadata:
+        payload["metadata"] = metadata
+    return payload
+
+
+def _resolve_reference(value: Any, field_name: str) -> Any:
+    if isinstance(value, str):
+        target = _lookup(value, field_name)
+        return target() if callable(target) else target
+    if isinstance(value, Mapping) and "ref" in value:
+        options = {k: v for k, v in value.items() if k != "ref"}
+        target = _lookup(value["ref"], field_name)
+        if not callable(target):
+            raise ValueError(f"{field_name}: {value['ref']!r} is not a builder and takes no arguments.")
+        return target(**options)
+    return value
+
+
+def _lookup(reference: str, field_name: str) -> Any:
+    head, *path = reference.split(".")
+    namespaces = _reference_namespaces()
+    if head not in namespaces:
+        raise ValueError(
+            f"{field_name}: unknown reference {reference!r}; expected one of {sorted(namespaces)}"
+            " followed by an attribute, e.g. 'openai_voices.nova'."
+        )
+    target = namespaces[head]
+    for part in path:
+        if part.startswith("_") or not hasattr(target, part):
+            raise ValueError(f"{field_name}: {reference!r} does not exist.")
+        target = getattr(target, part)
+    return target
+
+
+def _reference_namespaces() -> Dict[str, Any]:
+    from ..analysis_plan import (
+        pass_fail_plan,
+        structured_data_multi_plan,
+        structured_data_plan,
+        success_evaluation_plan,
+        summary_plan,
+    )
+    from ..transcribers import deepgram_transcribers
+    from ..voices import azure_voices, eleven_labs_voices, openai_voices
+
+    return {
+        "openai_voices": openai_voices,
+        "eleven_labs_voices": eleven_labs_voices,
+        "azure_voices": azure_voices,
+        "deepgram_transcribers": deepgram_transcribers,
+        "pass_fail_plan": pass_fail_plan,
+        "summary_plan": summary_plan,
+        "structured_data_plan": structured_data_plan,
+        "structured_data_multi_plan": structured_data_multi_plan,
+        "success_evaluation_plan": success_evaluation_plan,
+    }
+
+
+def _list_assistants(client: VapiConnector) -> List[Any]:
+    """
+    Every assistant on the account, newest first. Pages backwards by
+    ``createdAt`` only when a page comes back full.
+    """
+    assistants: List[Any] = []
+    seen = set()
+    created_before = None
+    while True:
+        filters: Dict[str, Any] = {"limit": LIST_PAGE_SIZE}
+        if created_before is not None:
+            filters["created_at_le"] = created_before
+        page = list(client.assistants.list(**filters))
+        fresh = [assistant for assistant in page if assistant.id not in seen]
+        seen.update(assistant.id for assistant in fresh)
+        assistants.extend(fresh)
+        if len(page) < LIST_PAGE_SIZE or not fresh:
+            return assistants
+        created_before = min(assistant.created_at for assistant in page)
+
+
+def _index_by_name(remote: Sequence[Any], manifest_name: Optional[str]) -> Dict[str, Any]:
+    # Several assistants can share a name; prefer the one this manifest owns,
+    # then the newest (the listing is newest first).
+    index: Dict[str, Any] = {}
+    for assistant in remote:
+        name = getattr(assistant, "name", None)
+        if not name:
+            continue
+        current = index.get(name)
+        owned = (getattr(assistant, "metadata", None) or {}).get(MANAGED_BY_KEY) == manifest_name
+        if current is None or (owned and (current.metadata or {}).get(MANAGED_BY_KEY) != manifest_name):
+            index[name] = assistant
+    return index
+
+
+def _plan_one(
+    client: VapiConnector, payload: Dict[str, Any], existing: Optional[Any]
+) -> Tuple[SyncAction, Optional[Callable[[], Any]]]:
+    name = payload["name"]
+    if existing is None:
+        return SyncAction(op="create", name=name), _bind(client.assistants.create, **payload)
+    # Whole-field comparison catches keys removed from the manifest as well
+    # as changed ones; removed fields are sent as explicit nulls.
+    desired = _without_nulls(canonical_assistant(payload))
+    remote = _without_nulls(_remote_canonical(existing))
+    fields = [key for key in MANAGED_FIELDS if desired.get(_camel(key)) != remote.get(_camel(key))]
+    if not fields:
+        return SyncAction(op="noop", name=name, assistant_id=existing.id), None
+    action = SyncAction(op="update", name=name, assistant_id=existing.id, fields=tuple(fields))
+    return action, _bind(client.assistants.update, existing.id, **{key: payload.get(key) for key in fields})
+
+
+def _execute(
+    planned: List[Tuple[SyncAction, Optional[Callable[[], Any]]]], *, concurrency: int
+) -> Tuple[SyncAction, ...]:
+    work = [(index, send) for index, (_, send) in enumerate(planned) if send is not None]
+    outcomes: Dict[int, Tuple[Any, Optional[BaseException]]] = {}
+    if work:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(work)), thread_name_prefix="cora-sync") as pool:
+            futures = {index: pool.submit(_metrics.carry_helper(send)) for index, send in work}
+            for index, future in futures.items():
+                exc = future.exception()
+                outcomes[index] = (None if exc is not None else future.result(), exc)
+
+    actions = []
+    for index, (action, _) in enumerate(planned):
+        if index not in outcomes:
+            actions.append(action)
+            continue
+        response, exc = outcomes[index]
+        assistant_id = action.assistant_id or getattr(response, "id", None)
+        actions.append(
+            SyncAction(op=action.op, name=action.name, assistant_id=assistant_id, fields=action.fields, error=exc)
+        )
+    return tuple(actions)
+
+
+def _register_templates(desired: Sequence[Dict[str, Any]], actions: Sequence[SyncAction]) -> None:
+    """
+    Bring local template registrations in line with what was synced: every
+    synced assistant is registered with its current placeholders (or
+    unregistered when it has none), and deleted assistants are unregistered.
+    """
+    from .templates import register_template, template_placeholders, unregister_template
+
+    for payload, action in zip(desired, actions):
+        if not action.ok or not action.assistant_id:
+            continue
+        placeholders = template_placeholders(payload)
+        if placeholders:
+            register_template(action.assistant_id, placeholders, name=payload["name"])
+        else:
+            unregister_template(action.assistant_id)
+    for action in actions:
+        if action.op == "delete" and action.ok and action.assistant_id:
+            unregister_template(action.assistant_id)
+
+
+def _without_nulls(value: Any) -> Any:
+    # The API omits unset nested fields; treat an explicit None the same way.
+    if isinstance(value, dict):
+        return {key: _without_nulls(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_without_nulls(item) for item in value]
+    return value
+
+
+def _bind(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Callable[[], Any]:
+    return lambda: fn(*args, **kwargs)
+
+
+def _load_yaml(text: str) -> Any:
+    try:
+        import yaml
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError('Reading YAML manifests requires PyYAML: pip install "cora[yaml]"') from exc
+    return yaml.safe_load(text)
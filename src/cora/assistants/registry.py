@@ -0,0 +1,422 @@
+"""
+Content-addressed assistant provisioning.
+
+Every assistant payload is reduced to a canonical JSON document (model, voice,
+transcriber, analysis plan, tools, first message, ...) and hashed. The
+registry remembers which Vapi assistant was created for each hash in a small
+SQLite file, so provisioning the same configuration again is a local lookup
+instead of another ``assistants.create``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .. import metrics as _metrics
+from ..settings import get_settings
+from ..vapi_client import VapiConnector, get_default_connector
+from . import TranscriberInput, VoiceInput, _build_assistant_payload
+
+__all__ = [
+    "AssistantRegistry",
+    "RegisteredAssistant",
+    "assistant_fingerprint",
+    "canonical_assistant",
+    "get_default_registry",
+    "upsert_assistant",
+]
+
+# Display-only keys: two assistants that differ only here behave identically,
+# so they share a fingerprint (and a Vapi assistant).
+UNHASHED_KEYS = frozenset({"name"})
+DRIFT_ACTIONS = ("update", "recreate", "raise")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assistants (
+    fingerprint TEXT PRIMARY KEY,
+    assistant_id TEXT NOT NULL,
+    name TEXT,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    verified_at REAL
+)
+"""
+
+
+@dataclass(frozen=True)
+class RegisteredAssistant:
+    """
+    Registry entry for one provisioned assistant. ``created`` is True only
+    when this lookup had to call ``assistants.create``.
+    """
+
+    id: str
+    fingerprint: str
+    name: Optional[str]
+    created: bool = False
+    updated: bool = False
+
+
+def canonical_assistant(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return ``payload`` as plain JSON data with camelCase top-level keys (the
+    way the API reports assistants back), pydantic models dumped by alias and
+    ``None`` values dropped.
+    """
+    canonical: Dict[str, Any] = {}
+    for key, value in payload.items():
+        value = _plain(value)
+        if value is not None:
+            canonical[_camel(key)] = value
+    return canonical
+
+
+def assistant_fingerprint(payload: Mapping[str, Any]) -> str:
+    """
+    SHA-256 of the canonical form of ``payload``, ignoring display-only keys
+    such as ``name``.
+    """
+    canonical = {k: v for k, v in canonical_assistant(payload).items() if k not in UNHASHED_KEYS}
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AssistantRegistry:
+    """
+    Fingerprint -> assistant id map persisted in SQLite.
+
+    Lookups are served from an in-memory copy of the table; the file is only
+    touched when a new assistant is recorded or an entry is forgotten. Pass
+    ``":memory:"`` for a process-local registry.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        *,
+        connector: Optional[VapiConnector] = None,
+    ) -> None:
+        if path is None:
+            path = get_settings().assistant_registry_path
+        self.path = str(path)
+        self._connector = connector
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute(_SCHEMA)
+        self._entries: Dict[str, str] = dict(
+            self._db.execute("SELECT fingerprint, assistant_id FROM assistants").fetchall()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self._entries
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """
+        Return the assistant id recorded for ``fingerprint``, if any.
+        """
+        found = self._entries.get(fingerprint)
+        if found is None:
+            # Another process may have provisioned it since we loaded.
+            found = self._load(fingerprint)
+        return found
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every stored row as a dict (fingerprint, assistant_id, name,
+        payload, created_at, verified_at).
+        """
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT fingerprint, assistant_id, name, payload, created_at, verified_at FROM assistants"
+            ).fetchall()
+        for fingerprint, assistant_id, name, payload, created_at, verified_at in rows:
+            yield {
+                "fingerprint": fingerprint,
+                "assistant_id": assistant_id,
+                "name": name,
+                "payload": json.loads(payload),
+                "created_at": created_at,
+                "verified_at": verified_at,
+            }
+
+    def forget(self, fingerprint: str) -> None:
+        """
+        Drop the entry for ``fingerprint`` (the Vapi assistant is left alone).
+        """
+        with self._db_lock, self._db:
+            self._db.execute("DELETE FROM assistants WHERE fingerprint = ?", (fingerprint,))
+        self._entries.pop(fingerprint, None)
+
+    def upsert(
+        self,
+        payload: Mapping[str, Any],
+        *,
+        verify: bool = False,
+        on_drift: str = "update",
+        connector: Optional[VapiConnector] = None,
+    ) -> RegisteredAssistant:
+        """
+        Return the assistant provisioned for ``payload`` (as built by
+        ``_build_assistant_payload``), creating it only when the fingerprint
+        is unknown.
+
+        A hit costs no API calls unless ``verify=True``, in which case the
+        assistant is fetched and compared with the stored configuration. A
+        deleted assistant is always recreated; one edited out-of-band is
+        handled per ``on_drift``: ``"update"`` pushes the registered payload
+        back, ``"recreate"`` provisions a fresh assistant and ``"raise"``
+        raises RuntimeError listing the drifted fields.
+        """
+        if on_drift not in DRIFT_ACTIONS:
+            raise ValueError(f"on_drift must be one of {DRIFT_ACTIONS}, got {on_drift!r}")
+        fingerprint = assistant_fingerprint(payload)
+        name = payload.get("name")
+        with self._key_lock(fingerprint):
+            assistant_id = self.get(fingerprint)
+            if assistant_id is None:
+                return self._create(fingerprint, payload, connector)
+            if not verify:
+                return RegisteredAssistant(id=assistant_id, fingerprint=fingerprint, name=name)
+
+            client = self._client(connector)
+            remote = _fetch(client, assistant_id)
+            if remote is None:
+                self.forget(fingerprint)
+                return self._create(fingerprint, payload, connector)
+            drifted = _drift(payload, remote)
+            if not drifted:
+                self._touch(fingerprint)
+                return RegisteredAssistant(id=assistant_id, fingerprint=fingerprint, name=name)
+            if on_drift == "raise":
+                raise RuntimeError(f"Assistant {assistant_id} has drifted from its registered config: {drifted}")
+            if on_drift == "recreate":
+                self.forget(fingerprint)
+                return self._create(fingerprint, payload, connector)
+            client.assistants.update(assistant_id, **{k: v for k, v in payload.items() if k != "name"})
+            self._touch(fingerprint)
+            return RegisteredAssistant(id=assistant_id, fingerprint=fingerprint, name=name, updated=True)
+
+    @_metrics.helper("AssistantRegistry.verify")
+    def verify(self, *, connector: Optional[VapiConnector] = None) -> Dict[str, List[str]]:
+        """
+        Compare every registered assistant with the server and return
+        ``{fingerprint: [drifted field paths]}`` for the ones that no longer
+        match (``["<missing>"]`` when the assistant was deleted). Nothing is
+        changed on either side.
+        """
+        client = self._client(connector)
+        report: Dict[str, List[str]] = {}
+        for entry in list(self.entries()):
+            remote = _fetch(client, entry["assistant_id"])
+            if remote is None:
+                report[entry["fingerprint"]] = ["<missing>"]
+                continue
+            drifted = _diff(entry["payload"], _remote_canonical(remote), "")
+            if drifted:
+                report[entry["fingerprint"]] = drifted
+            else:
+                self._touch(entry["fingerprint"])
+        return report
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._db.close()
+
+    def _create(
+        self, fingerprint: str, payload: Mapping[str, Any], connector: Optional[VapiConnector]
+    ) -> RegisteredAssistant:
+        client = self._client(connector)
+        assistant = client.assistants.create(**payload)
+        name = payload.get("name")
+        canonical = canonical_assistant(payload)
+        with self._db_lock, self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO assistants (fingerprint, assistant_id, name, payload, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, assistant.id, name, json.dumps(canonical, sort_keys=True), time.time()),
+            )
+            inserted = cursor.rowcount == 1
+        if inserted:
+            self._entries[fingerprint] = assistant.id
+            return RegisteredAssistant(id=assistant.id, fingerprint=fingerprint, name=name, created=True)
+
+        # Another process registered the same fingerprint while we were
+        # creating ours: keep theirs and clean up the duplicate.
+        winner = self._load(fingerprint)
+        try:
+            client.assistants.delete(assistant.id)
+        except Exception:  # noqa: BLE001 - a leftover duplicate is harmless
+            pass
+        return RegisteredAssistant(id=winner or assistant.id, fingerprint=fingerprint, name=name)
+
+    def _load(self, fingerprint: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT assistant_id FROM assistants WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        if row is None:
+            return None
+        self._entries[fingerprint] = row[0]
+        return row[0]
+
+    def _touch(self, fingerprint: str) -> None:
+        with self._db_lock, self._db:
+            self._db.execute(
+                "UPDATE assistants SET verified_at = ? WHERE fingerprint = ?", (time.time(), fingerprint)
+            )
+
+    def _key_lock(self, fingerprint: str) -> threading.Lock:
+        with self._key_locks_guard:
+            lock = self._key_locks.get(fingerprint)
+            if lock is None:
+                lock = self._key_locks[fingerprint] = threading.Lock()
+            return lock
+
+    def _client(self, connector: Optional[VapiConnector]) -> VapiConnector:
+        if connector is not None:
+            return connector
+        if self._connector is not None:
+            return self._connector
+        return get_default_connector()
+
+
+_default_registries: Dict[str, AssistantRegistry] = {}
+_default_registries_lock = threading.Lock()
+
+
+def get_default_registry() -> AssistantRegistry:
+    """
+    Process-wide registry stored at ``VAPI_ASSISTANT_REGISTRY`` (default
+    ``.cora/assistants.sqlite3`` in the working directory).
+    """
+    path = get_settings().assistant_registry_path
+    registry = _default_registries.get(path)
+    if registry is None:
+        with _default_registries_lock:
+            registry = _default_registries.get(path)
+            if registry is None:
+                registry = _default_registries[path] = AssistantRegistry(path)
+    return registry
+
+
+@_metrics.helper("upsert_assistant")
+def upsert_assistant(
+    *,
+    name: str,
+    system_prompt: str,
+    tool_ids: Optional[Sequence[str]] = None,
+    tools: Optional[Sequence[Mapping[str, Any]]] = None,
+    voice: VoiceInput,
+    transcriber: TranscriberInput,
+    analysis_plan: Optional[Any] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    first_message: Optional[str] = None,
+    model_provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    connector: Optional[VapiConnector] = None,
+    model_overrides: Optional[Dict[str, Any]] = None,
+    registry: Optional[AssistantRegistry] = None,
+    verify: bool = False,
+    on_drift: str = "update",
+) -> RegisteredAssistant:
+    """
+    Idempotent :func:`cora.create_assistant`: takes the same arguments and
+    returns the assistant already provisioned for this configuration, creating
+    one only on a registry miss. See :meth:`AssistantRegistry.upsert` for
+    ``verify`` and ``on_drift``.
+    """
+    payload = _build_assistant_payload(
+        name=name,
+        system_prompt=system_prompt,
+        tool_ids=tool_ids,
+        tools=tools,
+        voice=voice,
+        transcriber=transcriber,
+        analysis_plan=analysis_plan,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        first_message=first_message,
+        model_provider=model_provider,
+        model_name=model_name,
+        model_overrides=model_overrides,
+    )
+    target = registry if registry is not None else get_default_registry()
+    return target.upsert(payload, verify=verify, on_drift=on_drift, connector=connector)
+
+
+def _drift(payload: Mapping[str, Any], remote: Any) -> List[str]:
+    """
+    Field paths where the server's copy of an assistant no longer matches
+    ``payload``. Only fields present in ``payload`` are compared, so defaults
+    the API fills in never count as drift.
+    """
+    return _diff(canonical_assistant(payload), _remote_canonical(remote), "")
+
+
+def _remote_canonical(remote: Any) -> Dict[str, Any]:
+    if hasattr(remote, "model_dump"):
+        return remote.model_dump(by_alias=True, exclude_none=True, mode="json")
+    return canonical_assistant(remote)
+
+
+def _diff(expected: Any, actual: Any, path: str) -> List[str]:
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return [path or "<root>"]
+        drifted: List[str] = []
+        for key, value in expected.items():
+            if key in UNHASHED_KEYS and not path:
+                continue
+            drifted.extend(_diff(value, actual.get(key), f"{path}.{key}" if path else key))
+        return drifted
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(actual) != len(expected):
+            return [path]
+        drifted = []
+        for index, (want, have) in enumerate(zip(expected, actual)):
+            drifted.extend(_diff(want, have, f"{path}[{index}]"))
+        return drifted
+    return [] if expected == actual else [path]
+
+
+def _fetch(client: VapiConnector, assistant_id: str) -> Optional[Any]:
+    try:
+        return client.assistants.get(assistant_id)
+    except Exception as exc:  # noqa: BLE001 - only a 404 means "gone"
+        if getattr(exc, "status_code", None) == 404:
+            return None
+        raise
+
+
+def _plain(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Mapping):
+        plain = {str(k): _plain(v) for k, v in value.items()}
+        return {k: v for k, v in plain.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return value.model_dump(by_alias=True, exclude_none=True, mode="json")
+    if hasattr(value, "payload"):
+        return _plain(value.payload())
+    return str(value)
+
+
+def _camel(key: str) -> str:
+    head, *rest = key.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
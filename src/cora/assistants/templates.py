@@ -0,0 +1,208 @@
+"""
+Template assistants: one assistant whose prompt and first message contain
+``{{placeholders}}``, filled in per call or chat through
+``assistant_overrides.variable_values``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence
+
+from ..vapi_client import VapiConnector
+from . import TranscriberInput, VoiceInput, _build_assistant_payload
+from .registry import AssistantRegistry, get_default_registry
+
+__all__ = [
+    "AssistantTemplate",
+    "BUILTIN_VARIABLES",
+    "define_template",
+    "get_template",
+    "register_template",
+    "template_placeholders",
+    "unregister_template",
+]
+
+# Variables Vapi fills in on its own; templates may use them freely.
+BUILTIN_VARIABLES = frozenset({"now", "date", "time", "month", "day", "year", "customer"})
+PLACEHOLDER_PATTERN = re.compile(r"\{\{-?\s*([A-Za-z_][A-Za-z0-9_]*)[^}]*\}\}")
+# Payload keys whose text is rendered with the call's variables. Analysis
+# plans use their own ({{transcript}}, {{rubric}}, ...) and are skipped.
+TEMPLATED_KEYS = (
+    "first_message",
+    "voicemail_message",
+    "end_call_message",
+    "firstMessage",
+    "voicemailMessage",
+    "endCallMessage",
+)
+
+_templates: Dict[str, "AssistantTemplate"] = {}
+_templates_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class AssistantTemplate:
+    """
+    A provisioned assistant plus the placeholders its prompt expects. Pass
+    ``template.id`` as ``assistant_id`` and the values as ``variables=`` to
+    :func:`cora.create_call` / :func:`cora.create_chat`.
+    """
+
+    id: str
+    placeholders: FrozenSet[str]
+    name: Optional[str] = None
+
+    def variable_values(self, variables: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate ``variables`` against :attr:`placeholders` and return them as
+        a plain dict. Raises ValueError on missing or unknown names.
+        """
+        values = dict(variables or {})
+        missing = sorted(self.placeholders - values.keys())
+        unknown = sorted(values.keys() - self.placeholders - BUILTIN_VARIABLES)
+        problems = []
+        if missing:
+            problems.append(f"missing {missing}")
+        if unknown:
+            problems.append(f"unknown {unknown}")
+        if problems:
+            label = self.name or self.id
+            raise ValueError(
+                f"Variables for template {label!r} do not match its placeholders "
+                f"{sorted(self.placeholders)}: {'; '.join(problems)}."
+            )
+        return values
+
+
+def template_placeholders(payload: Any) -> FrozenSet[str]:
+    """
+    Names referenced as ``{{name}}`` (or ``{{ name.field | filter }}``) in a
+    string or an assistant payload's prompt messages and spoken messages,
+    minus Vapi's built-in variables.
+    """
+    names = set()
+    for text in _templated_text(payload):
+        names.update(PLACEHOLDER_PATTERN.findall(text))
+    return frozenset(names - BUILTIN_VARIABLES)
+
+
+def register_template(
+    assistant_id: str,
+    placeholders: Iterable[str],
+    *,
+    name: Optional[str] = None,
+) -> AssistantTemplate:
+    """
+    Record the placeholders of an assistant created elsewhere (dashboard,
+    another process) so calls and chats against it are validated locally.
+    """
+    template = AssistantTemplate(id=assistant_id, placeholders=frozenset(placeholders), name=name)
+    with _templates_lock:
+        _templates[assistant_id] = template
+    return template
+
+
+def unregister_template(assistant_id: str) -> bool:
+    """
+    Stop validating calls and chats against ``assistant_id``. Returns False
+    when no template was registered for it.
+    """
+    with _templates_lock:
+        return _templates.pop(assistant_id, None) is not None
+
+
+def get_template(assistant_id: str) -> Optional[AssistantTemplate]:
+    return _templates.get(assistant_id)
+
+
+def define_template(
+    *,
+    name: str,
+    system_prompt: str,
+    tool_ids: Optional[Sequence[str]] = None,
+    tools: Optional[Sequence[Mapping[str, Any]]] = None,
+    voice: VoiceInput,
+    transcriber: TranscriberInput,
+    analysis_plan: Optional[Any] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    first_message: Optional[str] = None,
+    model_provider: Optional[str] = None,
+    model_name: Optional[str] = None,
+    connector: Optional[VapiConnector] = None,
+    model_overrides: Optional[Dict[str, Any]] = None,
+    registry: Optional[AssistantRegistry] = None,
+) -> AssistantTemplate:
+    """
+    Provision (or reuse, via the assistant registry) one assistant whose
+    ``system_prompt`` / ``first_message`` contain ``{{placeholders}}`` and
+    register it as a template. Takes the same arguments as
+    :func:`cora.create_assistant`.
+    """
+    payload = _build_assistant_payload(
+        name=name,
+        system_prompt=system_prompt,
+        tool_ids=tool_ids,
+        tools=tools,
+        voice=voice,
+        transcriber=transcriber,
+        analysis_plan=analysis_plan,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        first_message=first_message,
+        model_provider=model_provider,
+        model_name=model_name,
+        model_overrides=model_overrides,
+    )
+    target = registry if registry is not None else get_default_registry()
+    assistant = target.upsert(payload, connector=connector)
+    return register_template(assistant.id, template_placeholders(payload), name=name)
+
+
+def apply_variables(
+    assistant_id: str,
+    assistant_overrides: Optional[Mapping[str, Any]],
+    variables: Optional[Mapping[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Merge ``variables`` into ``assistant_overrides["variable_values"]`` and,
+    when ``assistant_id`` is a registered template, validate the combined
+    values against its placeholders. Unregistered assistants are passed
+    through unchecked.
+    """
+    template = _templates.get(assistant_id)
+    if variables is None and template is None:
+        return None if assistant_overrides is None else dict(assistant_overrides)
+
+    overrides = dict(assistant_overrides or {})
+    values: Dict[str, Any] = {}
+    for key in ("variableValues", "variable_values"):
+        existing = overrides.pop(key, None)
+        if existing:
+            values.update(existing)
+    if variables:
+        values.update(variables)
+    if template is not None:
+        values = template.variable_values(values)
+    if values:
+        overrides["variable_values"] = values
+    return overrides or None
+
+
+def _templated_text(payload: Any) -> Iterable[str]:
+    if isinstance(payload, str):
+        yield payload
+        return
+    if not isinstance(payload, Mapping):
+        return
+    model = payload.get("model")
+    if isinstance(model, Mapping):
+        for message in model.get("messages") or ():
+            content = message.get("content") if isinstance(message, Mapping) else None
+            if isinstance(content, str):
+                yield content
+    for key in TEMPLATED_KEYS:
+        value = payload.get(key)
+        if isinstance(value, str):
+            yield value
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-import json
-import os
 import re
+import sys
 import time
-from typing import Any, Dict, Generator, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Generator, Mapping, Optional, Tuple, Union
 
-from ..vapi_client import VapiConnector
+from .. import metrics as _metrics
+from ..serialization import dumps_messages, to_python
+from ..settings import _parse_env_value, get_settings
+from ..vapi_client import VapiConnector, get_default_connector
+from .cursor import MessageCursor
+from .polling import DEFAULT_POLL_POLICY, PollPolicy, _resolve_policy
+
+if TYPE_CHECKING:
+    from ..phone_numbers import PhoneNumberDirectory
+    from ..webhooks import CallEvent, CallEventHub
 
 __all__ = [
     "TERMINAL_STATUSES",
@@ -15,24 +23,18 @@ __all__ = [
     "poll_until_terminal",
     "wait_for_terminal",
     "watch_call",
+    "PollPolicy",
+    "DEFAULT_POLL_POLICY",
+    "MessageCursor",
 ]
 
 TERMINAL_STATUSES = {"ended", "failed", "noAnswer", "busy", "canceled"}
 UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_TEMPLATES_MODULE = __name__.rpartition(".")[0] + ".assistants.templates"
 
 
 def _parse_phone_number_id(raw: Optional[str]) -> Optional[str]:
-    if raw is None:
-        return None
-    trimmed = raw.strip()
-    if not trimmed:
-        return None
-    trimmed = trimmed.split("#", 1)[0].strip()
-    trimmed = trimmed.strip("\"'")
-    return trimmed or None
-
-
-DEFAULT_PHONE_NUMBER_ID = _parse_phone_number_id(os.getenv("VAPI_PHONE_NUMBER_ID"))
+    return _parse_env_value(raw)
 
 
 def normalize_phone(number: str) -> str:
@@ -50,6 +52,7 @@ def normalize_phone(number: str) -> str:
 Customer = Union[str, Dict[str, str]]
 
 
+@_metrics.helper("create_call")
 def create_call(
     *,
     assistant_id: str,
@@ -57,15 +60,60 @@ def create_call(
     customer: Customer,
     assistant_overrides: Optional[Dict[str, Any]] = None,
     background_speech_denoising_plan: Optional[Any] = None,
+    variables: Optional[Mapping[str, Any]] = None,
+    phone_numbers: Optional["PhoneNumberDirectory"] = None,
     v: Optional[VapiConnector] = None,
 ) -> Any:
     """
     Create a Vapi call for the given assistant + phone number combination.
     Accepts customer as either a str (+1…) or {"number": "+1…"} dict.
     Use assistant_overrides/background_speech_denoising_plan to tweak
-    assistant settings per call without changing the base assistant.
+    assistant settings per call without changing the base assistant, and
+    variables to fill a template assistant's {{placeholders}} (checked
+    locally when the assistant came from cora.define_template).
+    With a cora.PhoneNumberDirectory as phone_numbers, phone_number_id may
+    be omitted (a local number is picked for the customer) or given as the
+    number itself.
     """
-    resolved_phone_number_id = _parse_phone_number_id(phone_number_id) or DEFAULT_PHONE_NUMBER_ID
+    call_payload = _build_call_payload(
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        customer=customer,
+        assistant_overrides=assistant_overrides,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        variables=variables,
+        phone_numbers=phone_numbers,
+    )
+    client = v or get_default_connector()
+    return client.calls.create(**call_payload)
+
+
+def _build_call_payload(
+    *,
+    assistant_id: str,
+    phone_number_id: Optional[str],
+    customer: Customer,
+    assistant_overrides: Optional[Dict[str, Any]] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    variables: Optional[Mapping[str, Any]] = None,
+    phone_numbers: Optional["PhoneNumberDirectory"] = None,
+) -> Dict[str, Any]:
+    if phone_numbers is not None:
+        phone_number_id = phone_numbers.resolve(phone_number_id, customer)
+    call_payload: Dict[str, Any] = {
+        "assistant_id": assistant_id,
+        "phone_number_id": _resolve_phone_number_id(phone_number_id),
+        "customer": _normalize_customer(customer),
+    }
+    overrides_payload = _merge_overrides(assistant_overrides, background_speech_denoising_plan)
+    overrides_payload = _apply_variables(assistant_id, overrides_payload, variables)
+    if overrides_payload:
+        call_payload["assistant_overrides"] = overrides_payload
+    return call_payload
+
+
+def _resolve_phone_number_id(phone_number_id: Optional[str]) -> str:
+    resolved_phone_number_id = _parse_phone_number_id(phone_number_id) or get_settings().phone_number_id
     if not resolved_phone_number_id:
         raise ValueError(
             "phone_number_id is required; pass it explicitly or set VAPI_PHONE_NUMBER_ID in your environment."
@@ -74,13 +122,13 @@ def create_call(
         raise ValueError(
             "phone_number_id must be a UUID. Update VAPI_PHONE_NUMBER_ID or pass a UUID explicitly."
         )
-    payload = _normalize_customer(customer)
-    client = v or VapiConnector()
-    call_payload: Dict[str, Any] = {
-        "assistant_id": assistant_id,
-        "phone_number_id": resolved_phone_number_id,
-        "customer": payload,
-    }
+    return resolved_phone_number_id
+
+
+def _merge_overrides(
+    assistant_overrides: Optional[Dict[str, Any]],
+    background_speech_denoising_plan: Optional[Any],
+) -> Optional[Dict[str, Any]]:
     overrides_payload: Optional[Dict[str, Any]] = None
     if assistant_overrides is not None:
         overrides_payload = dict(assistant_overrides)
@@ -88,29 +136,47 @@ def create_call(
         if overrides_payload is None:
             overrides_payload = {}
         overrides_payload["background_speech_denoising_plan"] = background_speech_denoising_plan
-    if overrides_payload:
-        call_payload["assistant_overrides"] = overrides_payload
-
-    return client.calls.create(**call_payload)
+    return overrides_payload
 
 
+def _apply_variables(
+    assistant_id: str,
+    overrides_payload: Optional[Dict[str, Any]],
+    variables: Optional[Mapping[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    # No template can be registered before cora.assistants.templates is
+    # imported, and importing it pulls in the SDK's pydantic types, so plain
+    # calls skip it entirely.
+    templates = sys.modules.get(_TEMPLATES_MODULE)
+    if templates is None:
+        if variables is None:
+            return overrides_payload
+        from ..assistants import templates
+    return templates.apply_variables(assistant_id, overrides_payload, variables)
+
+
+@_metrics.helper("poll_until_terminal")
 def poll_until_terminal(
     v: VapiConnector,
     call_id: str,
     *,
     max_seconds: int = 600,
-    interval: float = 2.5,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
 ) -> Dict[str, Any]:
     """
     Poll the Vapi call endpoint until a terminal status is observed or the
     timeout expires. Returns a lightweight snapshot describing the final state.
+    Poll spacing follows `policy` (adaptive by default); pass `interval` for a
+    fixed delay instead.
     """
-    deadline = time.time() + max_seconds
+    tracker = _resolve_policy(interval, policy).tracker()
+    deadline = time.monotonic() + max_seconds
     last_message: Any = None
     status: Optional[str] = None
     call_obj: Any = None
 
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         call_obj = v.calls.get(call_id)
         status = getattr(call_obj, "status", None)
         messages = getattr(call_obj, "messages", None) or []
@@ -118,34 +184,41 @@ def poll_until_terminal(
             last_message = messages[-1]
         if _is_terminal(call_obj, status=status):
             break
-        time.sleep(interval)
+        _sleep_until(deadline, tracker.observe(call_obj))
 
-    return {
-        "status": status or "unknown",
-        "id": getattr(call_obj, "id", call_id) if call_obj is not None else call_id,
-        "endedAt": getattr(call_obj, "endedAt", None) if call_obj is not None else None,
-        "endedReason": getattr(call_obj, "endedReason", None) if call_obj is not None else None,
-        "last_message": last_message,
-    }
+    return _terminal_snapshot(call_obj, call_id, status=status, last_message=last_message)
 
 
+@_metrics.helper("wait_for_terminal")
 def wait_for_terminal(
     v: VapiConnector,
     call_id: str,
     *,
     timeout_seconds: int = 600,
-    interval: float = 2.5,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
     echo_messages: bool = True,
     pandas: bool = False,
+    events: Optional["CallEventHub"] = None,
+    cursor: Optional[MessageCursor] = None,
 ) -> Any:
     """
-    Block until the call is terminal or the timeout expires. Optionally echo new
-    messages for quick debugging. Returns the final call object as provided by
-    Vapi's SDK, or a pandas DataFrame row with the call payload when
-    ``pandas=True``.
+    Block until the call is terminal or the timeout expires. Optionally echo
+    every new message (each printed once, in order) for quick debugging.
+    Returns the final call object as provided by Vapi's SDK, or a pandas DataFrame row with the call payload when
+    ``pandas=True``. Poll spacing works as in `poll_until_terminal`.
+
+    Pass a `cora.webhooks.CallEventHub` as `events` to wait for pushed server
+    messages instead: the call is fetched once up front, once when a terminal
+    event arrives, and otherwise only if no event arrives for
+    `policy.max_interval` seconds. Pass a `MessageCursor` to resume from, or
+    inspect, the messages already consumed.
     """
-    deadline = time.time() + timeout_seconds
-    seen_messages: set[str] = set()
+    tracker = _resolve_policy(interval, policy).tracker()
+    cursor = cursor if cursor is not None else MessageCursor()
+    deadline = time.monotonic() + timeout_seconds
+    seen_event = 0
+    pushed_terminal = False
     last_status: Optional[str] = None
     final_call: Any = None
 
@@ -156,57 +229,132 @@ def wait_for_terminal(
         if status != last_status:
             last_status = status
 
-        messages = getattr(call_obj, "messages", None) or []
-        if echo_messages and messages:
-            latest = messages[-1]
-            key = str(latest)
-            if key not in seen_messages:
-                print(latest)
-                seen_messages.add(key)
+        new_messages = cursor.advance(getattr(call_obj, "messages", None))
+        if echo_messages:
+            for message in new_messages:
+                print(message)
 
         if _is_terminal(call_obj, status=status):
             break
 
-        if time.time() > deadline:
+        if time.monotonic() > deadline:
             break
 
-        time.sleep(interval)
+        if events is not None and not pushed_terminal:
+            seen_event, pushed_terminal = _await_terminal_event(
+                events, call_id, after=seen_event, deadline=deadline, fallback=tracker.policy.max_interval
+            )
+            continue
+        _sleep_until(deadline, tracker.observe(call_obj))
 
     if pandas:
         return _call_to_dataframe(final_call)
     return final_call
 
 
+@_metrics.helper("watch_call")
 def watch_call(
     v: VapiConnector,
     call_id: str,
     *,
-    interval: float = 2.5,
+    interval: Optional[float] = None,
+    policy: Optional[PollPolicy] = None,
+    events: Optional["CallEventHub"] = None,
+    cursor: Optional[MessageCursor] = None,
 ) -> Generator[Dict[str, Any], None, None]:
     """
-    Generator that yields rolling snapshots {"id", "status", "last_message"}
-    until a terminal state is reached.
+    Generator that yields rolling snapshots
+    {"id", "status", "last_message", "new_messages"} until a terminal state is
+    reached. `new_messages` holds every message added since the previous
+    snapshot (each exactly once); `last_message` is the newest of them, or
+    None when nothing new arrived. Poll spacing works as in
+    `poll_until_terminal`. With `events`, the call is re-read as soon as a
+    pushed server message arrives for it, and otherwise only every
+    `policy.max_interval` seconds. Messages always come from `calls.get`, so
+    they are SDK models either way. Pass `MessageCursor(window=N)` as `cursor`
+    to keep a rolling window of recent messages.
     """
-    seen_msg: Optional[str] = None
+    tracker = _resolve_policy(interval, policy).tracker()
+    cursor = cursor if cursor is not None else MessageCursor()
+    seen_event = 0
     while True:
         call_obj = v.calls.get(call_id)
         status = getattr(call_obj, "status", None)
-        messages = getattr(call_obj, "messages", None) or []
-        last_message = messages[-1] if messages else None
-        payload = {
-            "id": getattr(call_obj, "id", None),
-            "status": status,
-            "last_message": None,
-        }
-        if last_message is not None:
-            last_key = str(last_message)
-            if last_key != seen_msg:
-                payload["last_message"] = last_message
-                seen_msg = last_key
-        yield payload
+        yield _watch_snapshot(
+            getattr(call_obj, "id", None), status, cursor.advance(getattr(call_obj, "messages", None))
+        )
         if _is_terminal(call_obj, status=status):
             break
-        time.sleep(interval)
+        if events is None:
+            time.sleep(tracker.observe(call_obj))
+            continue
+        # Events are only a wake-up: their message lists are raw dicts and
+        # may be partial, so the next snapshot comes from the poll above.
+        event = events.wait(call_id, after=seen_event, timeout=tracker.policy.max_interval)
+        if event is not None:
+            seen_event = _newest_event_seq(events, call_id, event)
+
+
+def _watch_snapshot(call_id: Optional[str], status: Optional[str], new_messages: list) -> Dict[str, Any]:
+    return {
+        "id": call_id,
+        "status": status,
+        "last_message": new_messages[-1] if new_messages else None,
+        "new_messages": new_messages,
+    }
+
+
+def _await_terminal_event(
+    events: "CallEventHub",
+    call_id: str,
+    *,
+    after: int,
+    deadline: float,
+    fallback: float,
+) -> Tuple[int, bool]:
+    """
+    Block until a terminal event for `call_id` is pushed, no event at all
+    arrives for `fallback` seconds, or the deadline passes. Returns the newest
+    event sequence number seen and whether it was terminal.
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return after, False
+        event = events.wait(call_id, after=after, timeout=min(fallback, remaining))
+        if event is None:
+            return after, False
+        after = event.seq
+        if event.terminal:
+            return after, True
+
+
+def _newest_event_seq(events: "CallEventHub", call_id: str, event: "CallEvent") -> int:
+    # A burst of events needs one re-read, not one per event.
+    latest = events.latest(call_id)
+    return max(event.seq, latest.seq) if latest is not None else event.seq
+
+
+def _sleep_until(deadline: float, delay: float) -> None:
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(min(delay, remaining))
+
+
+def _terminal_snapshot(
+    call_obj: Any,
+    call_id: str,
+    *,
+    status: Optional[str],
+    last_message: Any,
+) -> Dict[str, Any]:
+    return {
+        "status": status or "unknown",
+        "id": getattr(call_obj, "id", call_id) if call_obj is not None else call_id,
+        "endedAt": getattr(call_obj, "endedAt", None) if call_obj is not None else None,
+        "endedReason": getattr(call_obj, "endedReason", None) if call_obj is not None else None,
+        "last_message": last_message,
+    }
 
 
 def _normalize_customer(customer: Customer) -> Dict[str, str]:
@@ -268,20 +416,20 @@ def _call_to_payload(call_obj: Any) -> Dict[str, Any]:
         "ended_reason": _safe_attr(call_obj, "ended_reason", "endedReason"),
         "cost": _safe_attr(call_obj, "cost"),
         "transcript": _safe_attr(call_obj, "transcript"),
-        "messages": _serialize_messages(messages),
+        "messages": dumps_messages(messages),
         "first_message": _safe_attr(call_obj, "first_message", "firstMessage"),
-        "metadata": _object_to_python(_safe_attr(call_obj, "metadata")),
+        "metadata": to_python(_safe_attr(call_obj, "metadata")),
         "analysis_summary": _safe_attr(analysis, "summary"),
-        "analysis_success_evaluation": _object_to_python(
+        "analysis_success_evaluation": to_python(
             _safe_attr(analysis, "success_evaluation", "successEvaluation")
         ),
-        "analysis_structured_data": _object_to_python(
+        "analysis_structured_data": to_python(
             _safe_attr(analysis, "structured_data", "structuredData")
         ),
-        "analysis_structured_data_multi": _object_to_python(
+        "analysis_structured_data_multi": to_python(
             _safe_attr(analysis, "structured_data_multi", "structuredDataMulti")
         ),
-        "analysis_outcomes": _object_to_python(_safe_attr(analysis, "outcomes")),
+        "analysis_outcomes": to_python(_safe_attr(analysis, "outcomes")),
     }
 
     return payload
@@ -298,54 +446,3 @@ def _safe_attr(obj: Any, *names: str) -> Any:
             if value is not None:
                 return value
     return None
-
-
-def _serialize_messages(messages: Any) -> Optional[str]:
-    if not messages:
-        return None
-
-    serialized = []
-    for message in messages:
-        if hasattr(message, "json"):
-            try:
-                serialized.append(message.json())
-                continue
-            except TypeError:
-                pass
-        serialized.append(_object_to_python(message))
-    try:
-        return json.dumps(serialized, default=str)
-    except TypeError:
-        return str(serialized)
-
-
-def _object_to_python(value: Any) -> Any:
-    if value is None or isinstance(value, (str, int, float, bool)):
-        return value
-    if isinstance(value, dict):
-        return {k: _object_to_python(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [_object_to_python(v) for v in value]
-    for attr in ("model_dump", "dict"):
-        if hasattr(value, attr):
-            method = getattr(value, attr)
-            try:
-                data = method()
-            except TypeError:
-                continue
-            return _object_to_python(data)
-    if hasattr(value, "__dict__"):
-        return {
-            k: _object_to_python(v)
-            for k, v in value.__dict__.items()
-            if not k.startswith("_") and not callable(v)
-        }
-    if hasattr(value, "json"):
-        try:
-            data = value.json()
-        except TypeError:
-            return str(value)
-        if isinstance(data, str):
-            return data
-        return _object_to_python(data)
-    return str(value)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .. import metrics as _metrics
+from ..vapi_client import VapiConnector, get_default_connector
+from . import Customer, _apply_variables, _merge_overrides, _normalize_customer, _resolve_phone_number_id
+
+if TYPE_CHECKING:
+    from ..phone_numbers import PhoneNumberDirectory
+
+__all__ = ["CallResult", "create_calls"]
+
+CallRow = Union[Customer, Tuple[Customer, Optional[Dict[str, Any]]]]
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class CallResult:
+    """
+    Outcome of a single row dispatched by :func:`create_calls`. Exactly one of
+    ``call`` (the SDK call object) or ``error`` is set.
+    """
+
+    index: int
+    customer: Any
+    call: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_record(self) -> Dict[str, Any]:
+        customer_number = self.customer.get("number") if isinstance(self.customer, dict) else self.customer
+        return {
+            "index": self.index,
+            "customer_number": customer_number,
+            "call_id": getattr(self.call, "id", None),
+            "status": getattr(self.call, "status", None),
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+
+@_metrics.helper("create_calls")
+def create_calls(
+    rows: Iterable[CallRow],
+    *,
+    assistant_id: str,
+    phone_number_id: Optional[str] = None,
+    background_speech_denoising_plan: Optional[Any] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    phone_numbers: Optional["PhoneNumberDirectory"] = None,
+    v: Optional[VapiConnector] = None,
+    pandas: bool = False,
+) -> Any:
+    """
+    Dial many customers with one assistant. Each row is a customer (str or
+    {"number": ...} dict) or a ``(customer, assistant_overrides)`` tuple;
+    template variables go in the overrides as ``{"variable_values": {...}}``.
+
+    Rows are validated and normalized before anything is sent; the phone
+    number and connector are resolved once for the whole batch. At most
+    ``concurrency`` calls are in flight at a time. Returns an iterator of
+    :class:`CallResult` in completion order, or a DataFrame with one row per
+    input when ``pandas=True``. Failures are recorded per row, never raised.
+    With a ``phone_numbers`` directory and no ``phone_number_id``, each row
+    is dialed from a local number picked for that customer.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    resolved_phone_number_id = _batch_phone_number_id(phone_number_id, phone_numbers)
+
+    prepared, rejected = _prepare_rows(
+        rows,
+        assistant_id=assistant_id,
+        phone_number_id=resolved_phone_number_id,
+        background_speech_denoising_plan=background_speech_denoising_plan,
+        phone_numbers=phone_numbers,
+    )
+
+    client = v or get_default_connector()
+    results = _dispatch(client, prepared, rejected, concurrency=concurrency)
+    if pandas:
+        return _results_to_dataframe(results)
+    return results
+
+
+def _batch_phone_number_id(
+    phone_number_id: Optional[str], phone_numbers: Optional["PhoneNumberDirectory"]
+) -> Optional[str]:
+    """
+    The phone number id shared by the whole batch, or None when a directory
+    picks one per row.
+    """
+    if phone_numbers is None:
+        return _resolve_phone_number_id(phone_number_id)
+    if not phone_number_id:
+        return None
+    return _resolve_phone_number_id(phone_numbers.resolve(phone_number_id, None))
+
+
+def _prepare_rows(
+    rows: Iterable[CallRow],
+    *,
+    assistant_id: str,
+    phone_number_id: Optional[str],
+    background_speech_denoising_plan: Optional[Any],
+    phone_numbers: Optional["PhoneNumberDirectory"] = None,
+) -> Tuple[List[Tuple[int, Any, Dict[str, Any]]], List[CallResult]]:
+    prepared: List[Tuple[int, Any, Dict[str, Any]]] = []
+    rejected: List[CallResult] = []
+    for index, row in enumerate(rows):
+        customer = row
+        try:
+            customer, overrides = _split_row(row)
+            call_payload: Dict[str, Any] = {
+                "assistant_id": assistant_id,
+                "phone_number_id": phone_number_id,
+                "customer": _normalize_customer(customer),
+            }
+            if phone_number_id is None and phone_numbers is not None:
+                call_payload["phone_number_id"] = phone_numbers.select_for(call_payload["customer"]).id
+            overrides_payload = _merge_overrides(overrides, background_speech_denoising_plan)
+            overrides_payload = _apply_variables(assistant_id, overrides_payload, None)
+            if overrides_payload:
+                call_payload["assistant_overrides"] = overrides_payload
+        except (TypeError, ValueError) as exc:
+            rejected.append(CallResult(index=index, customer=customer, error=exc))
+            continue
+        prepared.append((index, call_payload["customer"], call_payload))
+    return prepared, rejected
+
+
+def _split_row(row: CallRow) -> Tuple[Customer, Optional[Dict[str, Any]]]:
+    if isinstance(row, tuple):
+        if len(row) != 2:
+            raise ValueError("Tuple rows must be (customer, assistant_overrides).")
+        return row[0], row[1]
+    return row, None
+
+
+@_metrics.helper("create_calls")
+def _dispatch(
+    client: VapiConnector,
+    prepared: List[Tuple[int, Any, Dict[str, Any]]],
+    rejected: List[CallResult],
+    *,
+    concurrency: int,
+) -> Iterator[CallResult]:
+    yield from rejected
+
+    pending: Dict[Future, Tuple[int, Any]] = {}
+    queue = iter(prepared)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cora-dial") as pool:
+        try:
+            for index, customer, call_payload in queue:
+                pending[pool.submit(_metrics.carry_helper(client.calls.create), **call_payload)] = (index, customer)
+                if len(pending) >= concurrency:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, customer = pending.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        yield CallResult(index=index, customer=customer, error=exc)
+                    else:
+                        yield CallResult(index=index, customer=customer, call=future.result())
+                    for next_index, next_customer, call_payload in queue:
+                        pending[pool.submit(_metrics.carry_helper(client.calls.create), **call_payload)] = (next_index, next_customer)
+                        break
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _results_to_dataframe(results: Iterable[CallResult]):
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pandas is required when `pandas=True` is passed to create_calls().") from exc
+
+    records = sorted((result.as_record() for result in results), key=lambda record: record["index"])
+    return pd.DataFrame(records, columns=["index", "customer_number", "call_id", "status", "error"])
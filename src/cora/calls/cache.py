@@ -0,0 +1,371 @@
+"""
+Cache for finished calls. Once a call has ended and its analysis is in, the
+call object never changes again, so re-reading it (reports, reruns,
+re-exports) does not need to touch the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from . import _is_terminal, _safe_attr
+
+__all__ = ["TerminalCallCache", "get_default_call_cache", "is_final_call"]
+
+DEFAULT_MAX_MEMORY_CALLS = 1024
+DEFAULT_MAX_STORED_CALLS = 100_000
+# A call with no analysis plan never gets analysis; treat it as final once it
+# has been over for this long.
+DEFAULT_SETTLE_SECONDS = 600.0
+_ANALYSIS_FIELDS = ("summary", "success_evaluation", "structured_data", "structured_data_multi")
+
+# Stores between size checks; a full cache is trimmed to EVICT_TO of max_stored
+# at once, so eviction is occasional rather than part of every write.
+EVICT_CHECK_EVERY = 64
+EVICT_TO = 0.9
+# Reads note recency in memory; it is written once this many are pending (and
+# with every store).
+TOUCH_FLUSH_EVERY = 256
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS terminal_calls (
+        call_id TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        used_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS terminal_calls_used_at ON terminal_calls (used_at)",
+)
+
+
+def is_final_call(call_obj: Any, *, settle_seconds: float = DEFAULT_SETTLE_SECONDS) -> bool:
+    """
+    True when ``call_obj`` can no longer change: it is terminal and either
+    carries analysis results or ended more than ``settle_seconds`` ago.
+    """
+    if call_obj is None or not _is_terminal(call_obj, status=getattr(call_obj, "status", None)):
+        return False
+    analysis = getattr(call_obj, "analysis", None)
+    if analysis is not None and any(getattr(analysis, name, None) is not None for name in _ANALYSIS_FIELDS):
+        return True
+    ended_at = _safe_attr(call_obj, "ended_at", "endedAt")
+    if not isinstance(ended_at, datetime):
+        return False
+    if ended_at.tzinfo is None:
+        ended_at = ended_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - ended_at).total_seconds() >= settle_seconds
+
+
+class TerminalCallCache:
+    """
+    ``call_id -> call`` cache for finished calls (see :func:`is_final_call`).
+
+    The most recently used ``max_memory`` calls are kept as SDK objects, so
+    hits cost a dict lookup. With ``path`` every cached call is also stored
+    as JSON in SQLite (about ``max_stored`` rows, least recently used evicted
+    first), so restarts and other processes reuse them. The size is checked
+    against the file every few stores, so several processes can share it;
+    SQLite hits record their recency in memory and write it in batches. Pass it to a connector as ``call_cache=``
+    to serve ``calls.get`` from it.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        *,
+        max_memory: int = DEFAULT_MAX_MEMORY_CALLS,
+        max_stored: int = DEFAULT_MAX_STORED_CALLS,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_memory < 1 or max_stored < 1:
+            raise ValueError("max_memory and max_stored must be at least 1.")
+        self.max_memory = max_memory
+        self.max_stored = max_stored
+        self.settle_seconds = settle_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: "OrderedDict[str, Any]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, float] = {}
+        self._stores = 0
+        if path is not None:
+            if str(path) != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+            if str(path) != ":memory:":
+                # A cache can lose its last writes in a crash; skip the fsync
+                # on every commit.
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            with self._db:
+                for statement in _SCHEMA:
+                    self._db.execute(statement)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._calls)
+            return self._db.execute("SELECT COUNT(*) FROM terminal_calls").fetchone()[0]
+
+    @property
+    def persistent(self) -> bool:
+        return self._db is not None
+
+    def __contains__(self, call_id: object) -> bool:
+        return isinstance(call_id, str) and self.get(call_id) is not None
+
+    def get(self, call_id: str) -> Optional[Any]:
+        """
+        Return the cached call, or None.
+        """
+        call_obj = self._get_memory(call_id)
+        return call_obj if call_obj is not None else self._get_stored(call_id)
+
+    def _get_memory(self, call_id: str) -> Optional[Any]:
+        with self._lock:
+            call_obj = self._calls.get(call_id)
+            if call_obj is not None:
+                self._calls.move_to_end(call_id)
+                self.hits += 1
+            return call_obj
+
+    def _get_stored(self, call_id: str) -> Optional[Any]:
+        with self._lock:
+            call_obj = self._load(call_id)
+            if call_obj is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(call_id, call_obj)
+            return call_obj
+
+    def put(self, call_obj: Any) -> bool:
+        """
+        Cache ``call_obj`` if it is final. Returns whether it was cached.
+        """
+        call_id = getattr(call_obj, "id", None)
+        if not isinstance(call_id, str) or not is_final_call(call_obj, settle_seconds=self.settle_seconds):
+            return False
+        payload = _dump(call_obj) if self._db is not None else None
+        with self._lock:
+            self._remember(call_id, call_obj)
+            if payload is not None:
+                self._store(call_id, payload)
+        return True
+
+    def forget(self, call_id: str) -> None:
+        with self._lock:
+            self._calls.pop(call_id, None)
+            self._touched.pop(call_id, None)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM terminal_calls WHERE call_id = ?", (call_id,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._touched.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM terminal_calls")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                if self._touched:
+                    with self._db:
+                        self._flush_touched()
+                self._db.close()
+                self._db = None
+
+    def wrap(self, resource: Any, *, asynchronous: bool = False) -> "CachedCalls":
+        """
+        Wrap an SDK ``calls`` resource so ``get(id)`` is served from the cache.
+        """
+        return CachedCalls(resource, self, asynchronous=asynchronous)
+
+    def _remember(self, call_id: str, call_obj: Any) -> None:
+        self._calls[call_id] = call_obj
+        self._calls.move_to_end(call_id)
+        while len(self._calls) > self.max_memory:
+            self._calls.popitem(last=False)
+
+    def _load(self, call_id: str) -> Optional[Any]:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT payload FROM terminal_calls WHERE call_id = ?", (call_id,)).fetchone()
+        if row is None:
+            return None
+        self._touched[call_id] = self._clock()
+        if len(self._touched) >= TOUCH_FLUSH_EVERY:
+            with self._db:
+                self._flush_touched()
+        return _load_call(row[0])
+
+    def _flush_touched(self) -> None:
+        assert self._db is not None
+        self._db.executemany(
+            "UPDATE terminal_calls SET used_at = ? WHERE call_id = ?",
+            [(used_at, call_id) for call_id, used_at in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _store(self, call_id: str, payload: str) -> None:
+        assert self._db is not None
+        self._touched.pop(call_id, None)
+        self._stores += 1
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO terminal_calls (call_id, payload, used_at) VALUES (?, ?, ?)",
+                (call_id, payload, self._clock()),
+            )
+            if self._touched:
+                self._flush_touched()
+            if self._stores % EVICT_CHECK_EVERY:
+                return
+            # Same transaction as the insert, which holds the write lock, so
+            # the count includes rows written by other processes.
+            stored = self._db.execute("SELECT COUNT(*) FROM terminal_calls").fetchone()[0]
+            if stored > self.max_stored:
+                self._db.execute(
+                    "DELETE FROM terminal_calls WHERE call_id IN"
+                    " (SELECT call_id FROM terminal_calls ORDER BY used_at LIMIT ?)",
+                    (stored - int(self.max_stored * EVICT_TO),),
+                )
+
+
+class CachedCalls:
+    """
+    An SDK ``calls`` resource whose ``get(id)`` is answered from a
+    :class:`TerminalCallCache` when possible; final calls it fetches are
+    added. ``delete`` drops the id. Other attributes pass straight through.
+    For async resources, memory hits are answered on the event loop and
+    SQLite reads and writes run in a worker thread.
+    """
+
+    def __init__(self, resource: Any, cache: TerminalCallCache, *, asynchronous: bool = False) -> None:
+        self._resource = resource
+        self._cache = cache
+        self._asynchronous = asynchronous
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._resource, name)
+        if name == "get" and callable(value):
+            wrapped = self._wrap_get_async(value) if self._asynchronous else self._wrap_get(value)
+        elif name == "delete" and callable(value):
+            wrapped = self._wrap_delete(value)
+        else:
+            return value
+        self.__dict__[name] = wrapped
+        return wrapped
+
+    def _wrap_get(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache = self._cache
+
+        def get(*args: Any, **kwargs: Any) -> Any:
+            call_id = _call_id(args, kwargs)
+            if call_id is not None:
+                cached = cache.get(call_id)
+                if cached is not None:
+                    return cached
+            call_obj = fn(*args, **kwargs)
+            cache.put(call_obj)
+            return call_obj
+
+        get.__doc__ = getattr(fn, "__doc__", None)
+        return get
+
+    def _wrap_get_async(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache = self._cache
+
+        async def get(*args: Any, **kwargs: Any) -> Any:
+            call_id = _call_id(args, kwargs)
+            if call_id is not None:
+                cached = cache._get_memory(call_id)
+                if cached is None:
+                    if cache.persistent:
+                        cached = await asyncio.to_thread(cache._get_stored, call_id)
+                    else:
+                        cached = cache._get_stored(call_id)
+                if cached is not None:
+                    return cached
+            call_obj = await fn(*args, **kwargs)
+            if cache.persistent:
+                await asyncio.to_thread(cache.put, call_obj)
+            else:
+                cache.put(call_obj)
+            return call_obj
+
+        get.__doc__ = getattr(fn, "__doc__", None)
+        return get
+
+    def _wrap_delete(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache = self._cache
+
+        def delete(*args: Any, **kwargs: Any) -> Any:
+            call_id = _call_id(args, kwargs)
+            if call_id is not None:
+                cache.forget(call_id)
+            return fn(*args, **kwargs)
+
+        async def adelete(*args: Any, **kwargs: Any) -> Any:
+            call_id = _call_id(args, kwargs)
+            if call_id is not None:
+                if cache.persistent:
+                    await asyncio.to_thread(cache.forget, call_id)
+                else:
+                    cache.forget(call_id)
+            return await fn(*args, **kwargs)
+
+        if self._asynchronous:
+            delete = adelete
+        delete.__doc__ = getattr(fn, "__doc__", None)
+        return delete
+
+
+_default_caches: Dict[str, TerminalCallCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_default_call_cache(path: Union[str, Path]) -> TerminalCallCache:
+    """
+    Process-wide cache stored at ``path`` (connectors use the
+    ``VAPI_CALL_CACHE`` setting), shared by every connector that names it.
+    """
+    key = str(path)
+    cache = _default_caches.get(key)
+    if cache is None:
+        with _default_caches_lock:
+            cache = _default_caches.get(key)
+            if cache is None:
+                cache = _default_caches[key] = TerminalCallCache(key)
+    return cache
+
+
+def _call_id(args: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+    call_id = args[0] if args else kwargs.get("id")
+    return call_id if isinstance(call_id, str) else None
+
+
+def _dump(call_obj: Any) -> Optional[str]:
+    dump = getattr(call_obj, "model_dump_json", None)
+    if dump is None:
+        return None
+    return dump(by_alias=True, exclude_none=True)
+
+
+def _load_call(payload: str) -> Any:
+    from vapi.types import Call
+
+    return Call.model_validate_json(payload)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, List, Optional, Sequence
+
+__all__ = ["MessageCursor"]
+
+
+class MessageCursor:
+    """
+    Tracks how much of a call's cumulative ``messages`` list has been consumed.
+
+    Vapi returns the whole transcript on every ``calls.get``; the cursor only
+    remembers an index, so :meth:`advance` hands back each message exactly once
+    in O(new messages), including several that arrived between two polls.
+    Pass ``window`` to also keep the last N messages in :attr:`history`;
+    otherwise nothing but the index is retained.
+    """
+
+    def __init__(self, *, window: Optional[int] = None) -> None:
+        if window is not None and window < 1:
+            raise ValueError("window must be a positive number of messages.")
+        self.offset = 0
+        self.history: Optional[Deque[Any]] = deque(maxlen=window) if window else None
+        self.last: Any = None
+
+    def advance(self, messages: Optional[Sequence[Any]]) -> List[Any]:
+        """
+        Return the messages appended since the previous call. An empty or
+        missing list (e.g. a status-only event) leaves the cursor untouched; a
+        non-empty list shorter than the offset (the server trimmed it)
+        resynchronizes the cursor without replaying old messages.
+        """
+        if not messages:
+            return []
+        total = len(messages)
+        if total <= self.offset:
+            self.offset = total
+            return []
+        new = list(messages[self.offset:total])
+        self.offset = total
+        self.last = new[-1]
+        if self.history is not None:
+            self.history.extend(new)
+        return new
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from .. import metrics as _metrics
+from ..vapi_client import VapiConnector, get_default_connector
+from . import _is_terminal, _watch_snapshot
+from .cursor import MessageCursor
+from .polling import PollPolicy, PollTracker, _resolve_policy
+
+__all__ = ["CallMonitor", "MonitorEvent"]
+
+DEFAULT_MONITOR_CONCURRENCY = 16
+# Consecutive 404s after which a call is considered gone and dropped.
+DEFAULT_MAX_NOT_FOUND = 3
+
+
+@dataclass(frozen=True)
+class MonitorEvent:
+    """
+    One observation emitted by :class:`CallMonitor`. ``kind`` is ``"snapshot"``
+    for a regular poll, ``"terminal"`` for the final poll of a call (after which
+    the call is no longer tracked), ``"error"`` when the poll itself failed, or
+    ``"lost"`` when the call kept answering 404 and was dropped.
+    """
+
+    call_id: str
+    kind: str
+    status: Optional[str] = None
+    last_message: Any = None
+    call: Any = None
+    error: Optional[BaseException] = None
+    new_messages: List[Any] = field(default_factory=list)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the same {"id", "status", "last_message", "new_messages"} dict
+        `watch_call` yields.
+        """
+        return _watch_snapshot(self.call_id, self.status, self.new_messages)
+
+
+@dataclass
+class _Tracked:
+    generation: int
+    tracker: PollTracker
+    cursor: MessageCursor = field(default_factory=MessageCursor)
+    not_found: int = 0
+
+
+class CallMonitor:
+    """
+    Watch any number of calls from a single loop. Polls are kept on one
+    deadline-ordered heap, so each tracked call costs a heap entry rather than
+    a thread; each call's poll spacing follows ``policy`` (see
+    :class:`~cora.calls.polling.PollPolicy`). Due polls run on a pool of
+    ``concurrency`` worker threads, so a cycle over many calls takes about
+    ``calls / concurrency`` round trips; events are still delivered on the
+    iterating thread. Calls can be added or removed from any thread while the
+    monitor is being iterated; terminal calls drop out automatically. Failed
+    polls back off like unchanged ones, and a call that answers 404
+    ``max_not_found`` times in a row is dropped.
+
+        monitor = CallMonitor(v)
+        monitor.add(call.id)
+        for event in monitor:
+            print(event.call_id, event.kind, event.status)
+    """
+
+    def __init__(
+        self,
+        v: Optional[VapiConnector] = None,
+        *,
+        interval: Optional[float] = None,
+        policy: Optional[PollPolicy] = None,
+        on_event: Optional[Callable[[MonitorEvent], None]] = None,
+        concurrency: int = DEFAULT_MONITOR_CONCURRENCY,
+        max_not_found: int = DEFAULT_MAX_NOT_FOUND,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self._client = v or get_default_connector()
+        self._policy = _resolve_policy(interval, policy)
+        self._on_event = on_event
+        self.concurrency = concurrency
+        self.max_not_found = max_not_found
+        self._results: Deque[Optional[MonitorEvent]] = deque()
+        self._in_flight = 0
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._tracked: Dict[str, _Tracked] = {}
+        self._sequence = itertools.count()
+        self._generations = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def add(self, call_id: str, *, delay: float = 0.0) -> None:
+        """
+        Start tracking ``call_id``; its first poll is due after ``delay`` seconds.
+        Re-adding a tracked call reschedules it.
+        """
+        with self._cond:
+            tracked = _Tracked(generation=next(self._generations), tracker=self._policy.tracker())
+            self._tracked[call_id] = tracked
+            self._schedule(call_id, tracked, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def remove(self, call_id: str) -> bool:
+        """
+        Stop tracking ``call_id``. Returns False when it was not tracked.
+        """
+        with self._cond:
+            removed = self._tracked.pop(call_id, None) is not None
+            self._cond.notify_all()
+        return removed
+
+    def close(self) -> None:
+        """
+        Stop any running iteration and forget every tracked call.
+        """
+        with self._cond:
+            self._closed = True
+            self._tracked.clear()
+            self._heap.clear()
+            self._results.clear()
+            self._cond.notify_all()
+
+    @property
+    def tracked(self) -> List[str]:
+        with self._cond:
+            return list(self._tracked)
+
+    def __contains__(self, call_id: object) -> bool:
+        with self._cond:
+            return call_id in self._tracked
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._tracked)
+
+    def __iter__(self) -> Iterator[MonitorEvent]:
+        return self.events()
+
+    @_metrics.helper("CallMonitor")
+    def events(
+        self,
+        *,
+        stop_when_idle: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Iterator[MonitorEvent]:
+        """
+        Yield events for every tracked call as their polls come due. Stops when
+        nothing is tracked (unless ``stop_when_idle=False``), when ``timeout``
+        seconds have elapsed, or when :meth:`close` is called.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        # With concurrency=1 polls run inline on this thread; no pool needed.
+        pool: Optional[ThreadPoolExecutor] = None
+        if self.concurrency > 1:
+            pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cora-monitor")
+        poll = _metrics.carry_helper(self._run_poll)
+        try:
+            while True:
+                with self._cond:
+                    ready = self._dispatch(pool, poll, stop_when_idle=stop_when_idle, deadline=deadline)
+                    if ready is False:
+                        return
+                    if ready is True:
+                        event = self._results.popleft()
+                if ready is not True:
+                    event = self._poll(*ready)
+                if event is None:
+                    continue
+                if self._on_event is not None:
+                    self._on_event(event)
+                yield event
+        finally:
+            # Polls already submitted finish and queue their events for the
+            # next iteration.
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    def run(self, **kwargs: Any) -> None:
+        """
+        Drive the monitor until idle, delivering events only to ``on_event``.
+        Accepts the same keyword arguments as :meth:`events`.
+        """
+        for _ in self.events(**kwargs):
+            pass
+
+    def _schedule(self, call_id: str, tracked: _Tracked, due: float) -> None:
+        heapq.heappush(self._heap, (due, next(self._sequence), call_id, tracked.generation))
+
+    def _dispatch(
+        self,
+        pool: Optional[ThreadPoolExecutor],
+        poll: Callable[..., Any],
+        *,
+        stop_when_idle: bool,
+        deadline: Optional[float],
+    ) -> Union[bool, Tuple[str, int]]:
+        """
+        With the condition held: submit due polls (up to ``concurrency`` in
+        flight) until a result is ready. Returns True when one is, False when
+        iteration should stop, or, without a pool, the due
+        ``(call_id, generation)`` for the caller to poll inline.
+        """
+        while not self._closed:
+            if self._results:
+                return True
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return False
+            while self._heap and self._current(*self._heap[0][2:]) is None:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                if stop_when_idle and not self._in_flight:
+                    return False
+                self._cond.wait(None if deadline is None else deadline - now)
+                continue
+            due, _, call_id, generation = self._heap[0]
+            if due <= now and self._in_flight < self.concurrency:
+                heapq.heappop(self._heap)
+                if pool is None:
+                    return call_id, generation
+                self._in_flight += 1
+                pool.submit(poll, call_id, generation)
+                continue
+            # Woken by a finished poll, an add() or the next due time.
+            wait_for = max(due - now, 0.0) if self._in_flight < self.concurrency else None
+            if deadline is not None:
+                wait_for = deadline - now if wait_for is None else min(wait_for, deadline - now)
+            self._cond.wait(wait_for)
+        return False
+
+    def _run_poll(self, call_id: str, generation: int) -> None:
+        try:
+            event = self._poll(call_id, generation)
+        except BaseException as exc:  # noqa: BLE001 - never lose the in-flight slot
+            event = MonitorEvent(call_id=call_id, kind="error", error=exc)
+        with self._cond:
+            self._in_flight -= 1
+            if not self._closed:
+                self._results.append(event)
+            self._cond.notify_all()
+
+    def _current(self, call_id: str, generation: int) -> Optional[_Tracked]:
+        tracked = self._tracked.get(call_id)
+        if tracked is None or tracked.generation != generation:
+            return None
+        return tracked
+
+    def _poll(self, call_id: str, generation: int) -> Optional[MonitorEvent]:
+        try:
+            call_obj = self._client.calls.get(call_id)
+        except Exception as exc:  # noqa: BLE001 - surfaced as an event, polling continues
+            with self._cond:
+                tracked = self._current(call_id, generation)
+                if tracked is None:
+                    return None
+                tracked.not_found = tracked.not_found + 1 if getattr(exc, "status_code", None) == 404 else 0
+                if tracked.not_found >= self.max_not_found:
+                    del self._tracked[call_id]
+                    return MonitorEvent(call_id=call_id, kind="lost", error=exc)
+                self._schedule(call_id, tracked, time.monotonic() + tracked.tracker.observe_error())
+            return MonitorEvent(call_id=call_id, kind="error", error=exc)
+
+        status = getattr(call_obj, "status", None)
+        terminal = _is_terminal(call_obj, status=status)
+
+        with self._cond:
+            tracked = self._current(call_id, generation)
+            if tracked is None:
+                return None
+            tracked.not_found = 0
+            new_messages = tracked.cursor.advance(getattr(call_obj, "messages", None))
+            if terminal:
+                del self._tracked[call_id]
+            else:
+                self._schedule(call_id, tracked, time.monotonic() + tracked.tracker.observe(call_obj))
+
+        return MonitorEvent(
+            call_id=call_id,
+            kind="terminal" if terminal else "snapshot",
+            status=status,
+            last_message=new_messages[-1] if new_messages else None,
+            call=call_obj,
+            new_messages=new_messages,
+        )
@@ -0,0 +1,301 @@
+"""
+Bulk phone normalization for customer lists (CSV imports, campaign rows).
+
+:func:`normalize_phones` does what :func:`cora.normalize_phone` does, one
+column at a time: digits are extracted with a single vectorized string op,
+then classified and keyed as int64 with NumPy arithmetic instead of a regex
+per number.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = ["NormalizedPhones", "normalize_phones"]
+
+US = "us"
+INTERNATIONAL = "international"
+INVALID = "invalid"
+
+# E.164 allows at most 15 digits; shorter than 8 is not a dialable number.
+MIN_INTERNATIONAL_DIGITS = 8
+MAX_E164_DIGITS = 15
+_NANP_SUBSCRIBER = 10_000_000_000  # 10 digits after the +1
+KINDS = (US, INTERNATIONAL, INVALID)
+REASONS = (
+    "empty",
+    "no digits",
+    "invalid US area code or exchange",
+    "too many digits",
+    "not a US number and no +country code",
+    "wrong number of digits for +1",
+    "invalid country code or too few digits",
+)
+# NUL is the row separator in joined buffers, so it counts as blank too.
+_WHITESPACE = [ord(char) for char in "\0 \t\n\r\f\v"]
+
+
+@dataclass(frozen=True)
+class NormalizedPhones:
+    """
+    Result of :func:`normalize_phones`. ``frame`` has one row per input (same
+    index) with columns ``raw``, ``number`` (E.164, or <NA> when invalid),
+    ``kind`` (``"us"``, ``"international"`` or ``"invalid"``), ``key`` (the
+    E.164 digits as int64, -1 when invalid), ``duplicate`` (an earlier row
+    has the same key) and ``reason`` (why an invalid row was rejected).
+    """
+
+    frame: "pd.DataFrame"
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def numbers(self) -> "pd.Series":
+        return self.frame["number"]
+
+    @property
+    def accepted(self) -> "pd.DataFrame":
+        """
+        Valid rows (US and international), duplicates included.
+        """
+        return self.frame[self.frame["kind"] != INVALID]
+
+    @property
+    def unique(self) -> "pd.DataFrame":
+        """
+        Valid rows, keeping only the first row for each number.
+        """
+        frame = self.frame
+        return frame[(frame["kind"] != INVALID) & ~frame["duplicate"]]
+
+    @property
+    def rejected(self) -> "pd.DataFrame":
+        return self.frame.loc[self.frame["kind"] == INVALID, ["raw", "reason"]]
+
+    def summary(self) -> Dict[str, int]:
+        counts = self.frame["kind"].value_counts()
+        return {
+            "total": len(self.frame),
+            US: int(counts.get(US, 0)),
+            INTERNATIONAL: int(counts.get(INTERNATIONAL, 0)),
+            INVALID: int(counts.get(INVALID, 0)),
+            "duplicates": int(self.frame["duplicate"].sum()),
+        }
+
+
+def normalize_phones(values: Iterable[Any]) -> NormalizedPhones:
+    """
+    Normalize, validate, classify and dedupe a column of phone numbers (a
+    pandas Series, NumPy array or any iterable of strings or integers).
+
+    Ten-digit numbers and eleven-digit numbers starting with 1 become
+    ``+1XXXXXXXXXX`` exactly as :func:`cora.normalize_phone` would, and must
+    be valid NANP numbers (area code and exchange not starting with 0 or 1).
+    Other ``+``-prefixed numbers of 8-15 digits are kept as international
+    E.164. Everything else is rejected with a reason. Duplicates are detected
+    on the int64 E.164 key, so ``"954.320.0121"`` and ``"+1 (954) 320-0121"``
+    collapse to one entry. Only ASCII digits count.
+    """
+    import numpy as np
+    import pandas as pd
+
+    raw = values if isinstance(values, pd.Series) else pd.Series(_as_sequence(values, np), dtype=object)
+    count = len(raw)
+    if not count:
+        no_codes = np.empty(0, dtype=np.int8)
+        return NormalizedPhones(
+            frame=_frame(
+                pd,
+                raw,
+                pd.array([], dtype="string"),
+                pd.Categorical.from_codes(no_codes, categories=KINDS),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=bool),
+                pd.Categorical.from_codes(no_codes, categories=REASONS),
+            )
+        )
+
+    # All rows live in one byte buffer (``data[starts[i]:ends[i]]`` is row i),
+    # so digit extraction and parsing are plain array ops over the buffer.
+    data, starts, ends, text_at = _byte_rows(np, pd, raw)
+    blank = ends == starts
+    is_digit = (data - np.uint8(48)) < 10
+    lengths = np.add.reduceat(is_digit.astype(np.int8), starts, dtype=np.int64)
+    lengths[blank] = 0
+    # Only rows without digits need a closer look to tell "empty" from junk.
+    missing = blank.copy()
+    for index in np.flatnonzero((lengths == 0) & ~blank).tolist():
+        missing[index] = not text_at(index).strip()
+
+    first = data[starts]
+    plus = (first == 43) & ~blank
+    padded = np.flatnonzero(np.isin(first, _WHITESPACE) & ~missing)
+    if len(padded):
+        plus[padded] = [text_at(index).lstrip().startswith("+") for index in padded.tolist()]
+
+    pow10 = 10 ** np.arange(MAX_E164_DIGITS + 1, dtype=np.int64)
+    keys = _parse_keys(np, data[is_digit] - np.uint8(48), lengths, pow10)
+    parseable = (lengths > 0) & (lengths <= MAX_E164_DIGITS)
+    keys[~parseable] = -1
+    leading = np.where(parseable, keys // pow10[np.clip(lengths - 1, 0, MAX_E164_DIGITS)], -1)
+
+    us_candidate = (lengths == 10) | ((lengths == 11) & (leading == 1))
+    subscriber = np.where(lengths == 11, keys - _NANP_SUBSCRIBER, keys)
+    area_code = subscriber // 10_000_000
+    exchange = (subscriber // 10_000) % 1000
+    us = us_candidate & (area_code >= 200) & (exchange >= 200)
+    # "+49 30 123456" has ten digits too: any +-prefixed, non-+1 number that
+    # is not a valid NANP number is international. Country codes never start with 0.
+    international = ~us & plus & (leading > 1) & (lengths >= MIN_INTERNATIONAL_DIGITS) & parseable
+    valid = us | international
+
+    keys = np.where(us, subscriber + _NANP_SUBSCRIBER, np.where(international, keys, -1))
+    kind = pd.Categorical.from_codes(np.where(us, 0, np.where(international, 1, 2)), categories=KINDS)
+    # Later assignments win, so the most specific reason is applied last.
+    codes = np.full(count, len(REASONS) - 1, dtype=np.int8)
+    for code, mask in reversed(
+        (
+            (0, missing),
+            (1, lengths == 0),
+            (2, us_candidate),
+            (3, lengths > MAX_E164_DIGITS),
+            (4, ~plus),
+            (5, leading == 1),
+        )
+    ):
+        codes[mask] = code
+    codes[valid] = -1
+    reason = pd.Categorical.from_codes(codes, categories=REASONS)
+
+    numbers = _e164_strings(np, pd, keys, valid)
+    duplicate = np.zeros(count, dtype=bool)
+    duplicate[valid] = pd.Series(keys[valid]).duplicated().to_numpy()
+    return NormalizedPhones(frame=_frame(pd, raw, numbers, kind, keys, duplicate, reason))
+
+
+def _parse_keys(np: Any, digits: Any, lengths: Any, pow10: Any) -> Any:
+    """
+    Per-row integer value of the concatenated ``digits`` (``lengths`` digits
+    per row, in row order). Rows longer than 15 digits come out as garbage
+    and are masked by the caller.
+    """
+    keys = np.zeros(len(lengths), dtype=np.int64)
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return keys
+    # Digit j of the buffer is worth 10 ** (index of its row's last digit - j).
+    last = np.cumsum(lengths) - 1
+    exponent = np.repeat(last, lengths)
+    np.subtract(exponent, np.arange(len(digits), dtype=np.int64), out=exponent)
+    if lengths.max() > MAX_E164_DIGITS:
+        np.minimum(exponent, MAX_E164_DIGITS, out=exponent)
+    keys[nonempty] = np.add.reduceat(digits * pow10[exponent], (last - lengths + 1)[nonempty])
+    return keys
+
+
+def _e164_strings(np: Any, pd: Any, keys: Any, valid: Any) -> Any:
+    """
+    ``"+<key>"`` for valid rows, missing otherwise. With pyarrow the strings
+    are formatted by one compute kernel and never become Python objects.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:  # pragma: no cover - optional dependency
+        numbers = np.full(len(keys), None, dtype=object)
+        numbers[valid] = ["+%d" % key for key in keys[valid].tolist()]
+        return pd.array(numbers, dtype="string")
+    digits = pc.cast(pa.array(keys, mask=~valid), pa.string())
+    return pd.arrays.ArrowExtensionArray(pc.binary_join_element_wise("+", digits, ""))
+
+
+def _frame(pd: Any, raw: Any, numbers: Any, kind: Any, keys: Any, duplicate: Any, reason: Any) -> Any:
+    return pd.DataFrame(
+        {
+            "raw": raw,
+            "number": numbers,
+            "kind": kind,
+            "key": keys,
+            "duplicate": duplicate,
+            "reason": reason,
+        },
+        index=raw.index,
+    )
+
+
+def _byte_rows(np: Any, pd: Any, raw: Any) -> Tuple[Any, Any, Any, Callable[[int], str]]:
+    """
+    ``(data, starts, ends, text_at)`` for the column: a uint8 buffer ending
+    in a NUL byte (so every start is a valid index), row bounds into it and
+    a way to get one row back as str. Arrow-backed string columns (what
+    ``pd.read_csv`` returns on pandas 3) are used in place; anything else is
+    joined into a new buffer.
+    """
+    arrow = _arrow_strings(pd, raw)
+    if arrow is not None:
+        width = np.int64 if str(arrow.type) in ("large_string", "large_utf8") else np.int32
+        buffers = arrow.buffers()
+        offsets = np.frombuffer(buffers[1], dtype=width)[arrow.offset : arrow.offset + len(arrow) + 1]
+        offsets = offsets.astype(np.int64)
+        data = np.frombuffer(buffers[2], dtype=np.uint8) if buffers[2] is not None else np.empty(0, np.uint8)
+        data = np.append(data[offsets[0] : offsets[-1]], np.uint8(0))
+        starts, ends = offsets[:-1] - offsets[0], offsets[1:] - offsets[0]
+        if arrow.null_count:
+            nulls = arrow.is_null().to_numpy(zero_copy_only=False)
+            for index in np.flatnonzero(nulls & (ends > starts)).tolist():
+                data[starts[index] : ends[index]] = 0
+            ends = np.where(nulls, starts, ends)
+        return data, starts, ends, lambda index: arrow[index].as_py() or ""
+
+    texts = _texts(raw, pd)
+    data = np.frombuffer(("\0".join(texts) + "\0").encode(), dtype=np.uint8)
+    ends = np.flatnonzero(data == 0)
+    starts = np.empty(len(texts), dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    return data, starts, ends, texts.__getitem__
+
+
+def _arrow_strings(pd: Any, raw: Any) -> Any:
+    if not hasattr(raw.array, "__arrow_array__"):
+        return None
+    try:
+        import pyarrow as pa
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    array = pa.array(raw.array)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        return None
+    return array
+
+
+def _as_sequence(values: Iterable[Any], np: Any) -> Any:
+    if isinstance(values, (list, tuple, np.ndarray)):
+        return values
+    return list(values)
+
+
+def _texts(raw: Any, pd: Any) -> List[str]:
+    """
+    The column as a list of str; missing values become "" and integral
+    floats (CSV columns with gaps) lose their ".0".
+    """
+    if pd.api.types.infer_dtype(raw, skipna=False) == "string":
+        return raw.tolist()
+    gaps = raw.isna().tolist()
+    return ["" if gap else _text(value) for value, gap in zip(raw.tolist(), gaps)]
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return "%d" % value
+    return str(value)
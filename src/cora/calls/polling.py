@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, Optional, Tuple
+
+__all__ = ["PollPolicy", "PollTracker", "DEFAULT_POLL_POLICY"]
+
+IDLE_STATUSES = frozenset({"scheduled", "queued", "ringing"})
+MAX_BACKOFF_STEPS = 32
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """
+    Decides how long to wait between ``calls.get`` polls for one call.
+
+    - Calls still ``queued``/``ringing`` are polled every ``idle_interval``.
+    - Live calls are polled every ``interval``; once ``expected_duration`` is
+      known, polling tightens to ``near_end_interval`` during the last
+      ``near_end_window`` seconds of the expected call.
+    - Each poll that returns the same snapshot as the previous one multiplies
+      the delay by ``stall_backoff`` (capped at ``max_interval``).
+    - Every delay is spread by ±``jitter`` (a fraction) so many watchers do not
+      poll in lockstep.
+
+    Policies are immutable; per-call state lives in the :class:`PollTracker`
+    returned by :meth:`tracker`.
+    """
+
+    interval: float = 2.5
+    idle_interval: float = 5.0
+    idle_statuses: FrozenSet[str] = field(default=IDLE_STATUSES)
+    expected_duration: Optional[float] = None
+    near_end_window: float = 30.0
+    near_end_interval: float = 1.0
+    stall_backoff: float = 1.5
+    max_interval: float = 20.0
+    jitter: float = 0.1
+
+    @classmethod
+    def fixed(cls, interval: float) -> "PollPolicy":
+        """
+        A policy that always waits exactly ``interval`` seconds (the behavior of
+        the ``interval=`` argument on the wait helpers).
+        """
+        return cls(
+            interval=interval,
+            idle_interval=interval,
+            near_end_interval=interval,
+            stall_backoff=1.0,
+            max_interval=interval,
+            jitter=0.0,
+        )
+
+    def tracker(self) -> "PollTracker":
+        return PollTracker(self)
+
+
+DEFAULT_POLL_POLICY = PollPolicy()
+
+
+class PollTracker:
+    """
+    Per-call polling state for a :class:`PollPolicy`. Feed it every polled call
+    object with :meth:`observe` and sleep for the returned number of seconds.
+    """
+
+    def __init__(self, policy: PollPolicy) -> None:
+        self.policy = policy
+        self.unchanged = 0
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._live_since: Optional[float] = None
+
+    def observe(self, call_obj: Any) -> float:
+        policy = self.policy
+        status = getattr(call_obj, "status", None)
+        fingerprint = _fingerprint(call_obj, status)
+        if fingerprint == self._fingerprint:
+            self.unchanged += 1
+        else:
+            self.unchanged = 0
+            self._fingerprint = fingerprint
+
+        if status in policy.idle_statuses:
+            delay = policy.idle_interval
+        else:
+            now = time.monotonic()
+            if self._live_since is None:
+                self._live_since = now
+            if policy.expected_duration is not None and (
+                now - self._live_since >= policy.expected_duration - policy.near_end_window
+            ):
+                return self._jittered(policy.near_end_interval)
+            delay = policy.interval
+
+        if self.unchanged:
+            delay *= policy.stall_backoff ** min(self.unchanged, MAX_BACKOFF_STEPS)
+        return self._jittered(min(delay, policy.max_interval))
+
+    def observe_error(self) -> float:
+        """
+        Delay after a failed poll: ``interval``, backed off like an unchanged
+        snapshot while failures continue.
+        """
+        policy = self.policy
+        self.unchanged += 1
+        delay = policy.interval * policy.stall_backoff ** min(self.unchanged, MAX_BACKOFF_STEPS)
+        return self._jittered(min(delay, policy.max_interval))
+
+    def _jittered(self, delay: float) -> float:
+        jitter = self.policy.jitter
+        if jitter:
+            delay *= 1.0 + random.uniform(-jitter, jitter)
+        return max(delay, 0.0)
+
+
+def _resolve_policy(interval: Optional[float], policy: Optional[PollPolicy]) -> PollPolicy:
+    if interval is not None and policy is not None:
+        raise ValueError("Pass either interval or policy, not both.")
+    if policy is not None:
+        return policy
+    if interval is not None:
+        return PollPolicy.fixed(interval)
+    return DEFAULT_POLL_POLICY
+
+
+def _fingerprint(call_obj: Any, status: Optional[str]) -> Tuple[Any, ...]:
+    messages = getattr(call_obj, "messages", None) or []
+    updated_at = getattr(call_obj, "updated_at", None) or getattr(call_obj, "updatedAt", None)
+    return (status, len(messages), updated_at)
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, Optional, Sequence, Union
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
 
-from ..calls import normalize_phone
-from ..vapi_client import VapiConnector
+from .. import metrics as _metrics
+from ..calls import _apply_variables, normalize_phone
+from ..vapi_client import VapiConnector, get_default_connector
+from .sessions import ChatSessionCache, is_stale_session_error
+from .streaming import ChatStream, ChatStreamEvent, stream_body
 
 __all__ = [
     "create_chat",
     "chat",
+    "ChatSessionCache",
+    "ChatStream",
+    "ChatStreamEvent",
+    "stream_chat",
 ]
 
 CustomerInput = Union[str, Mapping[str, Any]]
 ChatInput = Union[str, Sequence[Any]]
 
 
+@_metrics.helper("create_chat")
 def create_chat(
     *,
     assistant_id: str,
@@ -27,6 +35,8 @@ def create_chat(
     assistant_overrides: Optional[Mapping[str, Any]] = None,
     squad_id: Optional[str] = None,
     use_llm_generated_message_for_outbound: bool = False,
+    variables: Optional[Mapping[str, Any]] = None,
+    sessions: Optional[ChatSessionCache] = None,
     v: Optional[VapiConnector] = None,
 ) -> Any:
     """
@@ -40,9 +50,105 @@ def create_chat(
     directly to the customer (no LLM processing). Pass
     `use_llm_generated_message_for_outbound=True` when you want the assistant
     to generate the outbound response from that input instead.
+
+    `variables` fills a template assistant's {{placeholders}} through
+    `assistant_overrides.variable_values`.
+
+    Pass a :class:`ChatSessionCache` as `sessions` to continue the
+    customer's existing session automatically (falling back to a new thread
+    when Vapi no longer knows it) and to remember new sessions.
     """
-    client = v or VapiConnector()
+    session_payload, payload = _chat_payloads(
+        sessions,
+        assistant_id=assistant_id,
+        message=message,
+        customer=customer,
+        phone_number_id=phone_number_id,
+        session_id=session_id,
+        stream=stream,
+        name=name,
+        previous_chat_id=previous_chat_id,
+        assistant_overrides=assistant_overrides,
+        squad_id=squad_id,
+        use_llm_generated_message_for_outbound=use_llm_generated_message_for_outbound,
+        variables=variables,
+    )
+    client = v or get_default_connector()
+    if session_payload is not None:
+        try:
+            response = client.chats.create(**session_payload)
+        except Exception as exc:
+            if not is_stale_session_error(exc):
+                raise
+            _forget_session(sessions, assistant_id, phone_number_id, customer, session_payload["session_id"])
+        else:
+            return response
+    response = client.chats.create(**payload)
+    _remember_session(sessions, assistant_id, phone_number_id, customer, response)
+    return response
+
+
+def stream_chat(
+    *,
+    assistant_id: str,
+    message: ChatInput,
+    customer: Optional[CustomerInput] = None,
+    phone_number_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    name: Optional[str] = None,
+    previous_chat_id: Optional[str] = None,
+    assistant_overrides: Optional[Mapping[str, Any]] = None,
+    squad_id: Optional[str] = None,
+    use_llm_generated_message_for_outbound: bool = False,
+    variables: Optional[Mapping[str, Any]] = None,
+    v: Optional[VapiConnector] = None,
+) -> ChatStream:
+    """
+    Streaming variant of :func:`create_chat` (same arguments). Returns a
+    :class:`ChatStream`; iterate it for text and tool-call deltas as they
+    arrive, then read `text`, `message`, `session_id`,
+    `time_to_first_token` and `total_latency`. Nothing is sent until the
+    stream is iterated.
+    """
+    payload = _build_chat_payload(
+        assistant_id=assistant_id,
+        message=message,
+        customer=customer,
+        phone_number_id=phone_number_id,
+        session_id=session_id,
+        stream=True,
+        name=name,
+        previous_chat_id=previous_chat_id,
+        assistant_overrides=assistant_overrides,
+        squad_id=squad_id,
+        use_llm_generated_message_for_outbound=use_llm_generated_message_for_outbound,
+        variables=variables,
+    )
+    return ChatStream(v or get_default_connector(), stream_body(payload))
+
+
+def chat(**kwargs: Any) -> Any:
+    """
+    Convenience alias so callers can do `cora.chat(...)`.
+    """
+    return create_chat(**kwargs)
 
+
+def _build_chat_payload(
+    *,
+    assistant_id: str,
+    message: ChatInput,
+    customer: Optional[CustomerInput] = None,
+    phone_number_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    stream: bool = False,
+    name: Optional[str] = None,
+    previous_chat_id: Optional[str] = None,
+    assistant_overrides: Optional[Mapping[str, Any]] = None,
+    squad_id: Optional[str] = None,
+    use_llm_generated_message_for_outbound: bool = False,
+    variables: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
     if session_id and (phone_number_id or customer is not None):
         raise ValueError("session_id cannot be combined with phone_number_id/customer transport arguments.")
 
@@ -75,19 +181,61 @@ def create_chat(
         payload["session_id"] = session_id
     if previous_chat_id is not None:
         payload["previous_chat_id"] = previous_chat_id
-    if assistant_overrides is not None:
-        payload["assistant_overrides"] = dict(assistant_overrides)
+    overrides = _apply_variables(
+        assistant_id, None if assistant_overrides is None else dict(assistant_overrides), variables
+    )
+    if overrides is not None:
+        payload["assistant_overrides"] = overrides
     if squad_id is not None:
         payload["squad_id"] = squad_id
 
-    return client.chats.create(**payload)
+    return payload
 
 
-def chat(**kwargs: Any) -> Any:
+def _chat_payloads(
+    sessions: Optional[ChatSessionCache], **kwargs: Any
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
     """
-    Convenience alias so callers can do `cora.chat(...)`.
+    Return ``(session_payload, payload)``: the request rerouted onto the
+    customer's cached session (None without a live one) and the request
+    exactly as given, used when there is no session or it has gone stale.
     """
-    return create_chat(**kwargs)
+    payload = _build_chat_payload(**kwargs)
+    phone_number_id = kwargs["phone_number_id"]
+    customer = kwargs["customer"]
+    if sessions is None or kwargs["session_id"] is not None or phone_number_id is None or customer is None:
+        return None, payload
+    cached = sessions.get(assistant_id=kwargs["assistant_id"], phone_number_id=phone_number_id, customer=customer)
+    if cached is None:
+        return None, payload
+    follow_up = dict(kwargs, session_id=cached, phone_number_id=None, customer=None)
+    return _build_chat_payload(**follow_up), payload
+
+
+def _remember_session(
+    sessions: Optional[ChatSessionCache],
+    assistant_id: str,
+    phone_number_id: Optional[str],
+    customer: Optional[CustomerInput],
+    response: Any,
+) -> None:
+    session_id = getattr(response, "session_id", None)
+    if sessions is None or session_id is None or phone_number_id is None or customer is None:
+        return
+    sessions.put(assistant_id=assistant_id, phone_number_id=phone_number_id, customer=customer, session_id=session_id)
+
+
+def _forget_session(
+    sessions: Optional[ChatSessionCache],
+    assistant_id: str,
+    phone_number_id: Optional[str],
+    customer: Optional[CustomerInput],
+    session_id: str,
+) -> None:
+    if sessions is not None and phone_number_id is not None and customer is not None:
+        sessions.forget(
+            assistant_id=assistant_id, phone_number_id=phone_number_id, customer=customer, session_id=session_id
+        )
 
 
 def _build_transport(
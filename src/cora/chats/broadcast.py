@@ -0,0 +1,368 @@
+"""
+SMS fan-out: send one message template to many customers across a pool of
+sending numbers, each held to its own rate.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .. import metrics as _metrics
+from ..calls import normalize_phone
+from ..ratelimit import TokenBucket, retry_after_seconds
+from ..vapi_client import VapiConnector, get_default_connector
+from ..vapi_client.policy import RETRY_STATUSES, RETRYABLE_OUTCOMES, THROTTLED, UNSENT, _classify
+from . import CustomerInput, create_chat
+from .sessions import ChatSessionCache
+
+__all__ = ["BroadcastResult", "broadcast_chat"]
+
+BroadcastRow = Union[CustomerInput, Tuple[CustomerInput, Mapping[str, Any]]]
+MessageTemplate = Union[str, Callable[[Mapping[str, Any]], str]]
+
+DEFAULT_BROADCAST_CONCURRENCY = 16
+# Creating a chat sends an SMS, so a send is only retried when the API surely
+# did not process it: a 429, or a connection that never opened.
+_RESEND_OUTCOMES = frozenset({THROTTLED, UNSENT})
+
+
+@dataclass(frozen=True)
+class BroadcastResult:
+    """
+    Outcome for one recipient of :func:`broadcast_chat`. Exactly one of
+    ``chat`` or ``error`` is set; ``phone_number_id`` is the number that sent
+    (or last tried to send) the message.
+    """
+
+    index: int
+    customer: Any
+    phone_number_id: Optional[str] = None
+    chat: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_record(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "customer_number": self.customer,
+            "phone_number_id": self.phone_number_id,
+            "chat_id": getattr(self.chat, "id", None),
+            "session_id": getattr(self.chat, "session_id", None),
+            "attempts": self.attempts,
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+
+def broadcast_chat(
+    rows: Iterable[BroadcastRow],
+    *,
+    assistant_id: str,
+    message: MessageTemplate,
+    phone_number_ids: Sequence[str],
+    rate_per_number: float = 1.0,
+    burst: int = 1,
+    concurrency: int = DEFAULT_BROADCAST_CONCURRENCY,
+    max_in_flight_per_number: Optional[int] = None,
+    max_attempts: int = 3,
+    failure_threshold: int = 3,
+    cooldown: float = 30.0,
+    sessions: Optional[ChatSessionCache] = None,
+    use_llm_generated_message_for_outbound: bool = False,
+    v: Optional[VapiConnector] = None,
+    pandas: bool = False,
+) -> Any:
+    """
+    Send ``message`` to every customer in ``rows``, spreading sends across
+    ``phone_number_ids``.
+
+    Each row is a customer (str or ``{"number": ...}`` mapping, whose other
+    keys become template fields) or a ``(customer, fields)`` tuple.
+    ``message`` is a ``str.format`` template over those fields (plus
+    ``number``) or a callable taking them. Rows are validated and rendered
+    before anything is sent; bad rows fail on their own.
+
+    Every number gets a token bucket of ``rate_per_number`` messages per
+    second (``burst`` deep) and at most ``max_in_flight_per_number`` requests
+    at a time, with ``concurrency`` in flight overall. A send that was
+    surely not processed (a 429, or a connection that never opened) is
+    retried on another number (up to ``max_attempts`` sends); anything else,
+    5xx and timeouts included, is reported for that recipient rather than
+    risking a duplicate text. A number that keeps failing, or answers 429,
+    sits out for ``cooldown`` seconds (or its ``Retry-After``) while the
+    others carry on.
+
+    With ``sessions``, customers who already have a session on one of the
+    numbers are texted from that number when it is free, keeping their
+    thread intact. Returns an iterator of :class:`BroadcastResult` in
+    completion order, or a DataFrame (one row per input) with
+    ``pandas=True``. Failures are recorded per recipient, never raised.
+    """
+    numbers = list(dict.fromkeys(phone_number_ids))
+    if not numbers:
+        raise ValueError("phone_number_ids must name at least one sending number.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1.")
+    per_number = max_in_flight_per_number or max(1, math.ceil(concurrency / len(numbers)))
+
+    jobs, rejected = _prepare_broadcast(rows, message)
+    client = v or get_default_connector()
+    broadcaster = _Broadcaster(
+        client,
+        assistant_id=assistant_id,
+        lanes=[_Lane(number, TokenBucket(rate_per_number, burst=burst)) for number in numbers],
+        concurrency=concurrency,
+        per_number=per_number,
+        max_attempts=max_attempts,
+        failure_threshold=failure_threshold,
+        cooldown=cooldown,
+        sessions=sessions,
+        use_llm_generated_message_for_outbound=use_llm_generated_message_for_outbound,
+    )
+    results = broadcaster.run(jobs, rejected)
+    if pandas:
+        return _results_to_dataframe(results)
+    return results
+
+
+@dataclass
+class _Job:
+    index: int
+    customer: str
+    text: str
+    attempts: int = 0
+    avoid: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class _Lane:
+    phone_number_id: str
+    bucket: TokenBucket
+    in_flight: int = 0
+    failures: int = 0
+    benched_until: float = 0.0
+    sent: int = field(default=0, repr=False)
+
+
+class _Broadcaster:
+    def __init__(
+        self,
+        client: VapiConnector,
+        *,
+        assistant_id: str,
+        lanes: List[_Lane],
+        concurrency: int,
+        per_number: int,
+        max_attempts: int,
+        failure_threshold: int,
+        cooldown: float,
+        sessions: Optional[ChatSessionCache],
+        use_llm_generated_message_for_outbound: bool,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.assistant_id = assistant_id
+        self.lanes = lanes
+        self.concurrency = concurrency
+        self.per_number = per_number
+        self.max_attempts = max_attempts
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.sessions = sessions
+        self.use_llm = use_llm_generated_message_for_outbound
+        self.clock = clock
+
+    @_metrics.helper("broadcast_chat")
+    def run(self, jobs: List[_Job], rejected: List[BroadcastResult]) -> Iterator[BroadcastResult]:
+        yield from rejected
+
+        queue: Deque[_Job] = deque(jobs)
+        pending: Dict[Future, Tuple[_Lane, _Job]] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cora-sms") as pool:
+            try:
+                while queue or pending:
+                    delay = self._fill(pool, queue, pending)
+                    if not pending:
+                        time.sleep(delay if delay is not None else 0.01)
+                        continue
+                    done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        lane, job = pending.pop(future)
+                        result = self._complete(future, lane, job, queue)
+                        if result is not None:
+                            yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fill(
+        self, pool: ThreadPoolExecutor, queue: Deque[_Job], pending: Dict[Future, Tuple[_Lane, _Job]]
+    ) -> Optional[float]:
+        """
+        Start as many queued sends as lanes and concurrency allow. Returns how
+        long to wait before a lane frees up (None: until a send completes).
+        """
+        while queue and len(pending) < self.concurrency:
+            now = self.clock()
+            lane, delay = self._pick(queue[0], now)
+            if lane is None or delay > 0:
+                return delay
+            job = queue.popleft()
+            lane.bucket.take(now)
+            lane.in_flight += 1
+            job.attempts += 1
+            pending[pool.submit(_metrics.carry_helper(self._send), lane.phone_number_id, job)] = (lane, job)
+        return None
+
+    def _pick(self, job: _Job, now: float) -> Tuple[Optional[_Lane], Optional[float]]:
+        healthy = [lane for lane in self.lanes if lane.benched_until <= now and lane.in_flight < self.per_number]
+        if not healthy:
+            benched = [lane.benched_until - now for lane in self.lanes if lane.benched_until > now]
+            # Everyone busy: wait for a send to finish (or a bench to lift).
+            return None, min(benched) if benched and len(benched) == len(self.lanes) else None
+        candidates = [lane for lane in healthy if lane.phone_number_id not in job.avoid] or healthy
+
+        sticky = self._sticky_lane(job, candidates, now)
+        if sticky is not None:
+            return sticky, 0.0
+        waits = [(lane.bucket.wait_time(now), lane.in_flight, index, lane) for index, lane in enumerate(candidates)]
+        wait_time, _, _, lane = min(waits, key=lambda item: item[:3])
+        return lane, wait_time
+
+    def _sticky_lane(self, job: _Job, candidates: List[_Lane], now: float) -> Optional[_Lane]:
+        if self.sessions is None or job.attempts:
+            return None
+        for lane in candidates:
+            if lane.bucket.wait_time(now) > 0:
+                continue
+            session = self.sessions.get(
+                assistant_id=self.assistant_id, phone_number_id=lane.phone_number_id, customer=job.customer
+            )
+            if session is not None:
+                return lane
+        return None
+
+    def _send(self, phone_number_id: str, job: _Job) -> Any:
+        return create_chat(
+            assistant_id=self.assistant_id,
+            message=job.text,
+            customer=job.customer,
+            phone_number_id=phone_number_id,
+            use_llm_generated_message_for_outbound=self.use_llm,
+            sessions=self.sessions,
+            v=self.client,
+        )
+
+    def _complete(self, future: Future, lane: _Lane, job: _Job, queue: Deque[_Job]) -> Optional[BroadcastResult]:
+        lane.in_flight -= 1
+        exc = future.exception()
+        if exc is None:
+            lane.failures = 0
+            lane.sent += 1
+            return BroadcastResult(
+                index=job.index,
+                customer=job.customer,
+                phone_number_id=lane.phone_number_id,
+                chat=future.result(),
+                attempts=job.attempts,
+            )
+
+        outcome = _classify(exc, RETRY_STATUSES)
+        if outcome in RETRYABLE_OUTCOMES:
+            now = self.clock()
+            lane.failures += 1
+            if outcome == THROTTLED:
+                lane.benched_until = now + (retry_after_seconds(exc) or self.cooldown)
+            elif lane.failures >= self.failure_threshold:
+                lane.benched_until = now + self.cooldown
+                lane.failures = 0
+            if outcome in _RESEND_OUTCOMES and job.attempts < self.max_attempts:
+                job.avoid = job.avoid | {lane.phone_number_id}
+                queue.appendleft(job)
+                return None
+        return BroadcastResult(
+            index=job.index,
+            customer=job.customer,
+            phone_number_id=lane.phone_number_id,
+            error=exc,
+            attempts=job.attempts,
+        )
+
+
+def _prepare_broadcast(
+    rows: Iterable[BroadcastRow], message: MessageTemplate
+) -> Tuple[List[_Job], List[BroadcastResult]]:
+    jobs: List[_Job] = []
+    rejected: List[BroadcastResult] = []
+    for index, row in enumerate(rows):
+        customer: Any = row
+        try:
+            customer, fields = _split_row(row)
+            text = message(fields) if callable(message) else message.format_map(fields)
+            if not isinstance(text, str) or not text:
+                raise ValueError("The message template rendered an empty message.")
+        except KeyError as exc:
+            rejected.append(
+                BroadcastResult(index=index, customer=customer, error=ValueError(f"Missing template field {exc}."))
+            )
+            continue
+        except (IndexError, AttributeError, TypeError, ValueError) as exc:
+            rejected.append(BroadcastResult(index=index, customer=customer, error=exc))
+            continue
+        jobs.append(_Job(index=index, customer=customer, text=text))
+    return jobs, rejected
+
+
+def _split_row(row: BroadcastRow) -> Tuple[str, Dict[str, Any]]:
+    fields: Dict[str, Any] = {}
+    if isinstance(row, tuple):
+        if len(row) != 2:
+            raise ValueError("Tuple rows must be (customer, fields).")
+        row, extra = row
+        fields.update(extra or {})
+    if isinstance(row, Mapping):
+        fields = {**row, **fields}
+        number = row.get("number")
+    else:
+        number = row
+    if not isinstance(number, str) or not number.strip():
+        raise ValueError("Each row needs a customer phone number.")
+    fields["number"] = normalize_phone(number)
+    return fields["number"], fields
+
+
+def _results_to_dataframe(results: Iterable[BroadcastResult]):
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pandas is required when `pandas=True` is passed to broadcast_chat().") from exc
+
+    records = sorted((result.as_record() for result in results), key=lambda record: record["index"])
+    return pd.DataFrame(
+        records,
+        columns=["index", "customer_number", "phone_number_id", "chat_id", "session_id", "attempts", "error"],
+    )
@@ -0,0 +1,192 @@
+"""
+Remember which Vapi chat session belongs to which SMS thread, so follow-up
+messages continue the session instead of opening a new one.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
+
+from ..calls import normalize_phone
+
+__all__ = ["ChatSessionCache", "SessionKey"]
+
+SessionKey = Tuple[str, str, str]
+
+DEFAULT_SESSION_TTL = 24 * 60 * 60.0
+DEFAULT_MAX_SESSIONS = 10_000
+# Status codes Vapi answers with when a session id is expired or unknown.
+STALE_SESSION_STATUSES = frozenset({400, 404})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    assistant_id TEXT NOT NULL,
+    phone_number_id TEXT NOT NULL,
+    customer TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (assistant_id, phone_number_id, customer)
+)
+"""
+
+
+class ChatSessionCache:
+    """
+    ``(assistant_id, phone_number_id, customer number) -> session_id`` map
+    with LRU eviction past ``max_size`` entries and a ``ttl`` (seconds since
+    the session was opened; None keeps entries until evicted).
+
+    Pass it to :func:`cora.create_chat` as ``sessions=``: a message to a
+    customer with a live session is sent on that session, otherwise a new
+    thread is opened and its session remembered. With ``path`` the map is
+    also kept in SQLite, so restarts and other processes share it.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        *,
+        ttl: Optional[float] = DEFAULT_SESSION_TTL,
+        max_size: int = DEFAULT_MAX_SESSIONS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive (or None to disable expiry).")
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[SessionKey, Tuple[str, float]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            if str(path) != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+            with self._db:
+                self._db.execute(_SCHEMA)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, *, assistant_id: str, phone_number_id: str, customer: Any) -> Optional[str]:
+        """
+        Return the live session for this thread, or None.
+        """
+        key = session_key(assistant_id, phone_number_id, customer)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Another process may have opened the session since we loaded.
+                entry = self._select(key)
+                if entry is None:
+                    return None
+                self._entries[key] = entry
+            session_id, created_at = entry
+            if self._expired(created_at):
+                self._drop(key, session_id)
+                return None
+            self._entries.move_to_end(key)
+            self._evict()
+            return session_id
+
+    def put(self, *, assistant_id: str, phone_number_id: str, customer: Any, session_id: str) -> None:
+        """
+        Remember ``session_id`` for this thread. Re-putting the same session
+        keeps its original age.
+        """
+        key = session_key(assistant_id, phone_number_id, customer)
+        with self._lock:
+            current = self._entries.get(key)
+            created_at = current[1] if current is not None and current[0] == session_id else self._clock()
+            self._entries[key] = (session_id, created_at)
+            self._entries.move_to_end(key)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO chat_sessions VALUES (?, ?, ?, ?, ?)", (*key, session_id, created_at)
+                    )
+            self._evict()
+
+    def forget(
+        self, *, assistant_id: str, phone_number_id: str, customer: Any, session_id: Optional[str] = None
+    ) -> None:
+        """
+        Drop this thread's session. With ``session_id``, only when that is
+        still the session on record, so a newer one (possibly opened by
+        another process) is kept.
+        """
+        with self._lock:
+            self._drop(session_key(assistant_id, phone_number_id, customer), session_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM chat_sessions")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and self._clock() - created_at >= self.ttl
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            key, (session_id, _) = next(iter(self._entries.items()))
+            self._drop(key, session_id)
+
+    def _drop(self, key: SessionKey, session_id: Optional[str] = None) -> None:
+        entry = self._entries.get(key)
+        if session_id is None or (entry is not None and entry[0] == session_id):
+            self._entries.pop(key, None)
+        if self._db is not None:
+            where = "assistant_id = ? AND phone_number_id = ? AND customer = ?"
+            params: Tuple[Any, ...] = key
+            if session_id is not None:
+                where += " AND session_id = ?"
+                params = (*key, session_id)
+            with self._db:
+                self._db.execute(f"DELETE FROM chat_sessions WHERE {where}", params)
+
+    def _select(self, key: SessionKey) -> Optional[Tuple[str, float]]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT session_id, created_at FROM chat_sessions"
+            " WHERE assistant_id = ? AND phone_number_id = ? AND customer = ?",
+            key,
+        ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def _load(self) -> None:
+        assert self._db is not None
+        rows = self._db.execute(
+            "SELECT assistant_id, phone_number_id, customer, session_id, created_at FROM chat_sessions"
+            " ORDER BY created_at DESC LIMIT ?",
+            (self.max_size,),
+        ).fetchall()
+        for assistant_id, phone_number_id, customer, session_id, created_at in reversed(rows):
+            if not self._expired(created_at):
+                self._entries[(assistant_id, phone_number_id, customer)] = (session_id, created_at)
+
+
+def session_key(assistant_id: str, phone_number_id: str, customer: Any) -> SessionKey:
+    number = customer.get("number") if isinstance(customer, Mapping) else customer
+    if not number:
+        raise ValueError("Customer must be a phone number or a mapping with a 'number' field.")
+    return (assistant_id, phone_number_id, normalize_phone(str(number)))
+
+
+def is_stale_session_error(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) in STALE_SESSION_STATUSES
@@ -0,0 +1,338 @@
+"""
+Streaming chat responses.
+
+``POST /chat`` with ``stream: true`` answers with server-sent events, one JSON
+object per delta::
+
+    data: {"id": "...", "sessionId": "...", "path": "chat.output[0].content", "delta": "Hel"}
+
+:class:`ChatStream` / :class:`AsyncChatStream` parse those as they arrive into
+:class:`ChatStreamEvent` objects, assemble the final output and time the
+response (time to first token, total latency).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Union
+
+from ..vapi_client import AsyncVapiConnector, VapiConnector
+
+__all__ = ["AsyncChatStream", "ChatStream", "ChatStreamEvent"]
+
+CHAT_PATH = "chat"
+_PATH_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+_TOOL_CALL_KEYS = ("tool_calls", "toolCalls")
+
+
+@dataclass(frozen=True)
+class ChatStreamEvent:
+    """
+    One streamed delta. ``kind`` is ``"text"`` for assistant message content,
+    ``"tool_call"`` for tool-call fragments (name/arguments) and ``"other"``
+    for anything else. ``elapsed`` is seconds since the request was sent.
+    """
+
+    kind: str
+    delta: str
+    path: str
+    chat_id: Optional[str]
+    session_id: Optional[str]
+    elapsed: float
+
+
+class _StreamState:
+    """
+    Parsing and bookkeeping shared by the sync and async streams.
+    """
+
+    def __init__(self, body: Dict[str, Any]) -> None:
+        self.body = body
+        self.chat_id: Optional[str] = None
+        self.session_id: Optional[str] = None
+        self.time_to_first_token: Optional[float] = None
+        self.total_latency: Optional[float] = None
+        self.final: Optional[Dict[str, Any]] = None
+        self.done = False
+        self._started: Optional[float] = None
+        self._text: List[str] = []
+        self._fields: Dict[str, str] = {}
+        self._data: List[str] = []
+        self._raw: List[str] = []
+        self._saw_event = False
+
+    @property
+    def text(self) -> str:
+        """
+        Assistant message text received so far.
+        """
+        return "".join(self._text)
+
+    @property
+    def output(self) -> List[Any]:
+        """
+        Output messages assembled from the deltas received so far.
+        """
+        assembled: Dict[str, Any] = {}
+        for path, value in self._fields.items():
+            _assign(assembled, _path_tokens(path), value)
+        output = assembled.get("output")
+        if output is None and self.final is not None:
+            output = self.final.get("output")
+        return [message for message in output or [] if message is not None]
+
+    @property
+    def message(self) -> Optional[Dict[str, Any]]:
+        """
+        The last assembled output message (the assistant's reply).
+        """
+        output = self.output
+        return output[-1] if output else None
+
+    @property
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        calls: List[Dict[str, Any]] = []
+        for message in self.output:
+            if isinstance(message, Mapping):
+                for key in _TOOL_CALL_KEYS:
+                    calls.extend(call for call in message.get(key) or [] if call is not None)
+        return calls
+
+    def metrics(self) -> Dict[str, Optional[float]]:
+        return {"time_to_first_token": self.time_to_first_token, "total_latency": self.total_latency}
+
+    def _start(self) -> None:
+        self._started = time.perf_counter()
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - (self._started or time.perf_counter())
+
+    def _feed(self, line: str) -> Optional[ChatStreamEvent]:
+        """
+        Consume one line of the response; returns an event once a complete
+        ``data:`` block has been read.
+        """
+        if line.startswith("data:"):
+            self._data.append(line[5:].lstrip())
+            self._saw_event = True
+            return None
+        if line.strip():
+            if not self._saw_event:
+                # Not an event stream (the server answered with a plain chat).
+                self._raw.append(line)
+            return None
+        return self._flush()
+
+    def _flush(self) -> Optional[ChatStreamEvent]:
+        if not self._data:
+            return None
+        data = "\n".join(self._data)
+        self._data = []
+        if data == "[DONE]":
+            return None
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        return self._event(payload)
+
+    def _event(self, payload: Dict[str, Any]) -> Optional[ChatStreamEvent]:
+        self.session_id = payload.get("sessionId") or payload.get("session_id") or self.session_id
+        if "delta" not in payload:
+            # A whole chat object (final message or non-streaming answer).
+            self.final = payload
+            self.chat_id = payload.get("id") or self.chat_id
+            return None
+        self.chat_id = payload.get("id") or self.chat_id
+        path = str(payload.get("path") or "")
+        delta = payload.get("delta")
+        delta = delta if isinstance(delta, str) else json.dumps(delta)
+        elapsed = self._elapsed()
+        if delta and self.time_to_first_token is None:
+            self.time_to_first_token = elapsed
+        tokens = _path_tokens(path)
+        if any(key in tokens for key in _TOOL_CALL_KEYS):
+            kind = "tool_call"
+        elif tokens and tokens[-1] == "content":
+            kind = "text"
+            self._text.append(delta)
+        else:
+            kind = "other"
+        self._fields[path] = self._fields.get(path, "") + delta
+        return ChatStreamEvent(
+            kind=kind, delta=delta, path=path, chat_id=self.chat_id, session_id=self.session_id, elapsed=elapsed
+        )
+
+    def _finish(self) -> Optional[ChatStreamEvent]:
+        event = self._flush()
+        if not self._saw_event and self._raw:
+            try:
+                payload = json.loads("\n".join(self._raw))
+            except ValueError:
+                payload = None
+            if isinstance(payload, dict):
+                self._event(payload)
+                for message in payload.get("output") or []:
+                    content = message.get("content") if isinstance(message, Mapping) else None
+                    if isinstance(content, str):
+                        self._text.append(content)
+        self.total_latency = self._elapsed()
+        self.done = True
+        return event
+
+
+class ChatStream(_StreamState):
+    """
+    Iterate to receive :class:`ChatStreamEvent` objects as the reply streams
+    in; afterwards (or at any point) read :attr:`text`, :attr:`message`,
+    :attr:`tool_calls`, :attr:`session_id` and the timing attributes. Use it
+    as a context manager to release the connection if you stop early.
+    """
+
+    def __init__(self, connector: VapiConnector, body: Dict[str, Any]) -> None:
+        super().__init__(body)
+        self._connector = connector
+        self._context: Any = None
+        self._iterator: Optional[Iterator[ChatStreamEvent]] = None
+
+    def __enter__(self) -> "ChatStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[ChatStreamEvent]:
+        if self._iterator is None:
+            self._iterator = self._events()
+        return self._iterator
+
+    def read(self) -> str:
+        """
+        Consume the rest of the stream and return the full text.
+        """
+        for _ in self:
+            pass
+        return self.text
+
+    def close(self) -> None:
+        if self._iterator is not None:
+            self._iterator.close()
+
+    def _events(self) -> Iterator[ChatStreamEvent]:
+        self._start()
+        with self._connector.stream(CHAT_PATH, json=self.body) as lines:
+            for line in lines:
+                event = self._feed(line)
+                if event is not None:
+                    yield event
+        event = self._finish()
+        if event is not None:
+            yield event
+
+
+class AsyncChatStream(_StreamState):
+    """
+    Async counterpart of :class:`ChatStream` (``async for`` / ``async with``).
+    """
+
+    def __init__(self, connector: AsyncVapiConnector, body: Dict[str, Any]) -> None:
+        super().__init__(body)
+        self._connector = connector
+        self._iterator: Optional[AsyncIterator[ChatStreamEvent]] = None
+
+    async def __aenter__(self) -> "AsyncChatStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[ChatStreamEvent]:
+        if self._iterator is None:
+            self._iterator = self._events()
+        return self._iterator
+
+    async def read(self) -> str:
+        async for _ in self:
+            pass
+        return self.text
+
+    async def aclose(self) -> None:
+        if self._iterator is not None:
+            await self._iterator.aclose()  # type: ignore[attr-defined]
+
+    async def _events(self) -> AsyncIterator[ChatStreamEvent]:
+        self._start()
+        async with self._connector.stream(CHAT_PATH, json=self.body) as lines:
+            async for line in lines:
+                event = self._feed(line)
+                if event is not None:
+                    yield event
+        event = self._finish()
+        if event is not None:
+            yield event
+
+
+def stream_body(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a ``_build_chat_payload`` result into the JSON body the SDK would
+    send for it, with ``stream`` forced on.
+    """
+    from vapi.chats.types import CreateChatDtoInput
+    from vapi.core.jsonable_encoder import jsonable_encoder
+    from vapi.core.serialization import convert_and_respect_annotation_metadata
+    from vapi.types import AssistantOverrides, TwilioSmsChatTransport
+
+    annotations = {
+        "input": CreateChatDtoInput,
+        "transport": TwilioSmsChatTransport,
+        "assistant_overrides": AssistantOverrides,
+    }
+    body: Dict[str, Any] = {}
+    for key, value in payload.items():
+        if value is None:
+            continue
+        annotation = annotations.get(key)
+        if annotation is not None:
+            value = convert_and_respect_annotation_metadata(object_=value, annotation=annotation, direction="write")
+        body[_camel(key)] = value
+    body["stream"] = True
+    return jsonable_encoder(body)
+
+
+def _path_tokens(path: str) -> List[Union[str, int]]:
+    tokens: List[Union[str, int]] = []
+    for name, index in _PATH_TOKEN.findall(path):
+        tokens.append(int(index) if index else name)
+    if tokens and tokens[0] == CHAT_PATH:
+        tokens = tokens[1:]
+    return tokens
+
+
+def _assign(target: Any, tokens: List[Union[str, int]], value: str) -> None:
+    for position, token in enumerate(tokens):
+        last = position == len(tokens) - 1
+        following: Any = value if last else ([] if isinstance(tokens[position + 1], int) else {})
+        if isinstance(token, int):
+            if not isinstance(target, list):
+                return
+            while len(target) <= token:
+                target.append(None)
+            if last or target[token] is None:
+                target[token] = following
+            target = target[token]
+        else:
+            if not isinstance(target, dict):
+                return
+            if last or token not in target:
+                target[token] = following
+            target = target[token]
+
+
+def _camel(key: str) -> str:
+    head, *rest = key.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
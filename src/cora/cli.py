@@ -0,0 +1,65 @@
+"""
+Command-line entry point: ``cora sync manifest.yaml``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+__all__ = ["main"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="cora", description="Cora helpers for Vapi.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="make the account's assistants match a manifest")
+    sync.add_argument("manifest", help="path to a .json, .yaml or .yml manifest")
+    sync.add_argument("--dry-run", action="store_true", help="print the plan without changing anything")
+    sync.add_argument(
+        "--prune",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="delete assistants this manifest created but no longer lists (default: manifest 'prune')",
+    )
+    sync.add_argument("--concurrency", type=int, default=None, help="requests in flight at once")
+    args = parser.parse_args(argv)
+
+    if args.command == "sync":
+        return _sync(args)
+    return 2  # pragma: no cover - argparse rejects unknown commands
+
+
+def _sync(args: argparse.Namespace) -> int:
+    from .assistants.manifest import DEFAULT_SYNC_CONCURRENCY, sync_assistants
+
+    try:
+        result = sync_assistants(
+            args.manifest,
+            prune=args.prune,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency or DEFAULT_SYNC_CONCURRENCY,
+        )
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"cora sync: {exc}", file=sys.stderr)
+        return 2
+
+    for action in result.actions:
+        if action.op == "noop" and not args.dry_run:
+            continue
+        detail = f" ({', '.join(action.fields)})" if action.fields else ""
+        status = "" if action.ok else f"  FAILED: {action.error!r}"
+        print(f"{action.op:<7} {action.name}{detail} {action.assistant_id or ''}{status}".rstrip())
+    counts = result.summary()
+    prefix = "plan" if result.dry_run else "done"
+    print(
+        f"{prefix}: create {counts['create']}, update {counts['update']}, delete {counts['delete']}, "
+        f"unchanged {counts['noop']}, failed {counts['failed']}"
+    )
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
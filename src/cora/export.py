@@ -0,0 +1,399 @@
+"""
+Stream calls out of Vapi into columnar files (Parquet or Arrow IPC) without
+materialising the whole history in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import metrics as _metrics
+from .calls import _call_to_payload
+from .serialization import dumps
+from .vapi_client import VapiConnector, get_default_connector
+
+__all__ = ["CALL_COLUMNS", "ExportResult", "call_schema", "export_calls", "iter_call_batches"]
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 50_000
+CHECKPOINT_NAME = "_checkpoint.json"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Column name -> logical type. "category" columns are dictionary-encoded.
+CALL_COLUMNS: Dict[str, str] = {
+    "call_id": "string",
+    "status": "category",
+    "ended_reason": "category",
+    "assistant_id": "string",
+    "phone_number_id": "string",
+    "customer_number": "string",
+    "created_at": "timestamp",
+    "updated_at": "timestamp",
+    "started_at": "timestamp",
+    "ended_at": "timestamp",
+    "cost": "float",
+    "transcript": "string",
+    "messages": "string",
+    "first_message": "string",
+    "metadata": "json",
+    "analysis_summary": "string",
+    "analysis_success_evaluation": "json",
+    "analysis_structured_data": "json",
+    "analysis_structured_data_multi": "json",
+    "analysis_outcomes": "json",
+}
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    """
+    Summary of an :func:`export_calls` run. ``files`` lists every part written
+    so far (including parts from earlier, resumed runs).
+    """
+
+    path: Path
+    files: Tuple[Path, ...]
+    rows: int
+    complete: bool
+
+
+@_metrics.helper("export_calls")
+def export_calls(
+    path: Union[str, Path],
+    *,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    assistant_id: Optional[str] = None,
+    phone_number_id: Optional[str] = None,
+    format: str = "parquet",  # noqa: A002 - mirrors pandas' to_* naming
+    page_size: int = DEFAULT_PAGE_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    resume: bool = True,
+    v: Optional[VapiConnector] = None,
+) -> ExportResult:
+    """
+    Page through ``calls.list`` (newest first) for calls created in
+    ``[created_after, created_before)`` and write them to ``path`` as a directory
+    of ``part-NNNNN.parquet`` (or ``.arrow``) files, ``batch_size`` rows each.
+    Only one batch is held in memory at a time.
+
+    After every part a ``_checkpoint.json`` is written next to the parts; calling
+    again with the same filters and ``resume=True`` picks up where an
+    interrupted export stopped. Read the result back with
+    ``pandas.read_parquet(path)`` or ``pyarrow.dataset.dataset(path)``.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {sorted(FORMATS)}, got {format!r}.")
+    if page_size < 1 or batch_size < 1:
+        raise ValueError("page_size and batch_size must be positive.")
+    pa = _require_pyarrow()
+
+    out_dir = Path(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filters = {
+        "created_after": _isoformat(created_after),
+        "created_before": _isoformat(created_before),
+        "assistant_id": assistant_id,
+        "phone_number_id": phone_number_id,
+        "format": format,
+    }
+    state = _load_checkpoint(out_dir, filters, resume=resume)
+    if state is None:
+        state = {"filters": filters, "files": [], "rows": 0, "cursor": None, "complete": False}
+        # Claim the directory before any part exists, so a run interrupted
+        # before its first checkpoint can still be resumed.
+        _save_checkpoint(out_dir, state)
+    _remove_stray_parts(out_dir, state)
+    if state["complete"]:
+        return _result(out_dir, state)
+
+    schema = call_schema()
+    pages = _iter_call_pages(
+        v or get_default_connector(),
+        created_after=created_after,
+        created_before=created_before,
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        page_size=page_size,
+        cursor=state["cursor"],
+    )
+    columns = _empty_columns()
+    buffered = 0
+    for calls, cursor in pages:
+        for call_obj in calls:
+            _append_row(columns, call_obj)
+        buffered += len(calls)
+        if buffered >= batch_size:
+            _write_part(pa, out_dir, state, _to_batch(pa, schema, columns), format)
+            state["cursor"] = cursor
+            state["rows"] += buffered
+            _save_checkpoint(out_dir, state)
+            columns = _empty_columns()
+            buffered = 0
+
+    if buffered:
+        _write_part(pa, out_dir, state, _to_batch(pa, schema, columns), format)
+        state["rows"] += buffered
+    state["cursor"] = None
+    state["complete"] = True
+    _save_checkpoint(out_dir, state)
+    return _result(out_dir, state)
+
+
+@_metrics.helper("iter_call_batches")
+def iter_call_batches(
+    *,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    assistant_id: Optional[str] = None,
+    phone_number_id: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    v: Optional[VapiConnector] = None,
+) -> Iterator[Any]:
+    """
+    Yield ``pyarrow.RecordBatch`` objects of up to ``batch_size`` calls using the
+    same paging and schema as :func:`export_calls`, for callers that want to
+    feed another sink (e.g. ``pyarrow.dataset.write_dataset``) directly.
+    """
+    pa = _require_pyarrow()
+    schema = call_schema()
+    columns = _empty_columns()
+    buffered = 0
+    pages = _iter_call_pages(
+        v or get_default_connector(),
+        created_after=created_after,
+        created_before=created_before,
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        page_size=page_size,
+        cursor=None,
+    )
+    for calls, _ in pages:
+        for call_obj in calls:
+            _append_row(columns, call_obj)
+        buffered += len(calls)
+        if buffered >= batch_size:
+            yield _to_batch(pa, schema, columns)
+            columns = _empty_columns()
+            buffered = 0
+    if buffered:
+        yield _to_batch(pa, schema, columns)
+
+
+def call_schema() -> Any:
+    """
+    Return the ``pyarrow.Schema`` used for exported calls.
+    """
+    pa = _require_pyarrow()
+    types = {
+        "string": pa.string(),
+        "json": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "float": pa.float64(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in CALL_COLUMNS.items()])
+
+
+def _iter_call_pages(
+    client: VapiConnector,
+    *,
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    assistant_id: Optional[str],
+    phone_number_id: Optional[str],
+    page_size: int,
+    cursor: Optional[Dict[str, Any]],
+    updated_after: Optional[datetime] = None,
+) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+    """
+    Walk the created_at window from newest to oldest. The list endpoint has no
+    page token, so each request narrows the upper bound to the oldest
+    ``created_at`` seen so far (inclusive) and skips the ids already returned at
+    exactly that timestamp. Yields ``(calls, cursor)`` where ``cursor`` is a
+    JSON-serialisable position to resume after those calls. If more than
+    ``page_size`` calls share a single timestamp, the overflow at that instant
+    is skipped, so keep ``page_size`` comfortably above your peak call rate.
+    With ``updated_after``, only calls updated at or after it are returned.
+    """
+    upper = _parse_datetime(cursor["created_at_le"]) if cursor else None
+    boundary_ids = set(cursor["boundary_ids"]) if cursor else set()
+    while True:
+        query: Dict[str, Any] = {"limit": page_size}
+        if assistant_id:
+            query["assistant_id"] = assistant_id
+        if phone_number_id:
+            query["phone_number_id"] = phone_number_id
+        if created_after is not None:
+            query["created_at_ge"] = created_after
+        if updated_after is not None:
+            query["updated_at_ge"] = updated_after
+        if upper is not None:
+            query["created_at_le"] = upper
+        elif created_before is not None:
+            query["created_at_lt"] = created_before
+
+        page = list(client.calls.list(**query) or [])
+        fresh = [call for call in page if getattr(call, "id", None) not in boundary_ids]
+        if not fresh:
+            if len(page) < page_size or upper is None:
+                return
+            # A full page of calls sharing one timestamp: step strictly past it.
+            query.pop("created_at_le")
+            query["created_at_lt"] = upper
+            page = list(client.calls.list(**query) or [])
+            fresh = page
+            boundary_ids = set()
+            if not fresh:
+                return
+
+        stamps = [_parse_datetime(getattr(call, "created_at", None)) for call in fresh]
+        oldest = min((stamp for stamp in stamps if stamp is not None), default=None)
+        if oldest is None:
+            # Without timestamps there is nothing to page on; emit what we have.
+            yield fresh, {"created_at_le": None, "boundary_ids": []}
+            return
+        if oldest != upper:
+            boundary_ids = set()
+        upper = oldest
+        boundary_ids.update(call.id for call, stamp in zip(fresh, stamps) if stamp == oldest)
+        yield fresh, {"created_at_le": upper.isoformat(), "boundary_ids": sorted(boundary_ids)}
+        if len(page) < page_size:
+            return
+
+
+def _empty_columns() -> Dict[str, List[Any]]:
+    return {name: [] for name in CALL_COLUMNS}
+
+
+def _append_row(columns: Dict[str, List[Any]], call_obj: Any) -> None:
+    payload = _call_to_payload(call_obj)
+    for name, kind in CALL_COLUMNS.items():
+        columns[name].append(_coerce(payload.get(name), kind))
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return _parse_datetime(value)
+    if kind == "float":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "json":
+        return dumps(value)
+    if isinstance(value, str):
+        return value
+    number = getattr(value, "number", None)
+    if isinstance(number, str):
+        return number
+    return str(value)
+
+
+def _to_batch(pa: Any, schema: Any, columns: Dict[str, List[Any]]) -> Any:
+    arrays = [pa.array(columns[field.name], type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _write_part(pa: Any, out_dir: Path, state: Dict[str, Any], batch: Any, format: str) -> None:  # noqa: A002
+    name = _next_part_name(state)
+    final = out_dir / name
+    tmp = out_dir / f".{name}.tmp"
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.Table.from_batches([batch]), tmp)
+    else:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+    os.replace(tmp, final)
+    state["files"].append(name)
+
+
+def _load_checkpoint(out_dir: Path, filters: Dict[str, Any], *, resume: bool) -> Optional[Dict[str, Any]]:
+    """
+    Return the state to resume from, or None to start over. Only directories
+    that are empty or hold an earlier export's checkpoint are written to; with
+    ``resume=False`` the earlier export's own parts are deleted first.
+    """
+    checkpoint = out_dir / CHECKPOINT_NAME
+    if not checkpoint.exists():
+        if any(out_dir.iterdir()):
+            raise ValueError(f"{out_dir} is not empty and has no {CHECKPOINT_NAME}; export to an empty directory.")
+        return None
+    state = json.loads(checkpoint.read_text())
+    if not resume:
+        _remove_stray_parts(out_dir, state)
+        for name in state.get("files", []):
+            (out_dir / name).unlink(missing_ok=True)
+        return None
+    if state.get("filters") != filters:
+        raise ValueError(
+            f"{checkpoint} belongs to an export with different filters; "
+            "use another path or pass resume=False."
+        )
+    return state
+
+
+def _save_checkpoint(out_dir: Path, state: Dict[str, Any]) -> None:
+    checkpoint = out_dir / CHECKPOINT_NAME
+    tmp = out_dir / f".{CHECKPOINT_NAME}.tmp"
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, checkpoint)
+
+
+def _next_part_name(state: Dict[str, Any]) -> str:
+    return f"part-{len(state['files']):05d}{FORMATS[state['filters']['format']]}"
+
+
+def _remove_stray_parts(out_dir: Path, state: Dict[str, Any]) -> None:
+    """
+    Delete the part (and temp files) a run interrupted after its last
+    checkpoint may have left. Parts are written in order, so that can only be
+    the next part name; nothing else in the directory is touched.
+    """
+    name = _next_part_name(state)
+    for stray in (out_dir / name, out_dir / f".{name}.tmp", out_dir / f".{CHECKPOINT_NAME}.tmp"):
+        stray.unlink(missing_ok=True)
+
+
+def _result(out_dir: Path, state: Dict[str, Any]) -> ExportResult:
+    return ExportResult(
+        path=out_dir,
+        files=tuple(out_dir / name for name in state["files"]),
+        rows=state["rows"],
+        complete=state["complete"],
+    )
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    parsed = _parse_datetime(value)
+    return parsed.isoformat() if parsed is not None else None
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pyarrow is required for export_calls(); install cora[export].") from exc
+    return pa
@@ -0,0 +1,441 @@
+"""
+Request metrics for every Vapi SDK call made through a cora connector.
+
+A :class:`Metrics` registry counts requests, errors and latency per
+``(resource, method, helper)``, where ``helper`` is the cora function that
+issued the request (``create_call``, ``watch_call`` ...) or ``"direct"`` for
+raw SDK use. Attach one to a connector with ``VapiConnector(metrics=...)``,
+or to every connector in the process with :func:`enable_metrics`. Without a
+registry, connectors hand out the SDK resources unwrapped.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Metrics",
+    "SpanRecord",
+    "carry_helper",
+    "disable_metrics",
+    "enable_metrics",
+    "get_metrics",
+    "helper",
+    "opentelemetry_callback",
+]
+
+# Upper bounds (seconds) of the latency histogram buckets.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DIRECT = "direct"
+
+_current_helper: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("cora_helper", default=None)
+_active: Optional["Metrics"] = None
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """
+    One finished SDK request, passed to a :class:`Metrics` ``on_span``
+    callback. Times are Unix epoch nanoseconds and the attribute names follow
+    OpenTelemetry conventions, so the record maps directly onto a span.
+    """
+
+    name: str
+    start_time: int
+    end_time: int
+    attributes: Dict[str, Any]
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time - self.start_time) / 1e9
+
+
+@dataclass
+class _Series:
+    buckets: List[int]
+    count: int = 0
+    total: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+class Metrics:
+    """
+    Thread-safe registry of per-request counters and latency histograms.
+
+    ``buckets`` are the histogram's upper bounds in seconds. ``on_span`` is
+    called with a :class:`SpanRecord` after every request (on the thread
+    that made it); see :func:`opentelemetry_callback`.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        on_span: Optional[Callable[[SpanRecord], Any]] = None,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.on_span = on_span
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, resource: Any, name: str, *, asynchronous: bool = False) -> "InstrumentedResource":
+        """
+        Wrap an SDK resource so its methods report to this registry.
+        """
+        return InstrumentedResource(resource, name, self, asynchronous=asynchronous)
+
+    def observe(
+        self,
+        resource: str,
+        method: str,
+        seconds: float,
+        *,
+        helper: Optional[str] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Record one request that took ``seconds`` (and failed with ``error``).
+        """
+        key = (resource, method, helper or DIRECT)
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(buckets=[0] * (len(self.buckets) + 1))
+            series.count += 1
+            series.total += seconds
+            series.buckets[slot] += 1
+            if error is not None:
+                kind = _error_kind(error)
+                series.errors[kind] = series.errors.get(kind, 0) + 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        One dict per ``(resource, method, helper)`` with ``count``,
+        ``errors`` (by status code or exception type), ``mean`` and bucket
+        estimates of ``p50`` / ``p95`` / ``p99`` latency in seconds.
+        """
+        with self._lock:
+            items = sorted(
+                (key, series.count, series.total, list(series.buckets), dict(series.errors))
+                for key, series in self._series.items()
+            )
+        rows = []
+        for (resource, method, helper_name), count, total, buckets, errors in items:
+            rows.append(
+                {
+                    "resource": resource,
+                    "method": method,
+                    "helper": helper_name,
+                    "count": count,
+                    "errors": errors,
+                    "mean": total / count if count else 0.0,
+                    "p50": self._quantile(buckets, count, 0.50),
+                    "p95": self._quantile(buckets, count, 0.95),
+                    "p99": self._quantile(buckets, count, 0.99),
+                }
+            )
+        return rows
+
+    def to_prometheus(self, *, prefix: str = "cora_vapi") -> str:
+        """
+        Render the registry in the Prometheus text exposition format.
+        """
+        with self._lock:
+            items = sorted(
+                (key, series.count, series.total, list(series.buckets), dict(series.errors))
+                for key, series in self._series.items()
+            )
+        requests = [
+            f"# HELP {prefix}_requests_total Vapi API requests made through cora.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        errors = [
+            f"# HELP {prefix}_request_errors_total Failed Vapi API requests, by status code or exception type.",
+            f"# TYPE {prefix}_request_errors_total counter",
+        ]
+        latency = [
+            f"# HELP {prefix}_request_duration_seconds Vapi API request latency.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for (resource, method, helper_name), count, total, buckets, error_counts in items:
+            labels = f'resource="{_escape(resource)}",method="{_escape(method)}",helper="{_escape(helper_name)}"'
+            requests.append(f"{prefix}_requests_total{{{labels}}} {count}")
+            for kind, value in sorted(error_counts.items()):
+                errors.append(f'{prefix}_request_errors_total{{{labels},error="{_escape(kind)}"}} {value}')
+            cumulative = 0
+            for bound, value in zip(self.buckets, buckets):
+                cumulative += value
+                latency.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            latency.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            latency.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {total!r}")
+            latency.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(requests + errors + latency) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _quantile(self, buckets: List[int], count: int, q: float) -> Optional[float]:
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        lower = 0.0
+        for bound, value in zip(self.buckets, buckets):
+            if value and cumulative + value >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / value
+            cumulative += value
+            lower = bound
+        # Past the last bucket: the best estimate is its upper bound.
+        return self.buckets[-1] if self.buckets else None
+
+    def _record(self, resource: str, method: str, started: float, error: Optional[BaseException]) -> None:
+        elapsed = time.perf_counter() - started
+        helper_name = _current_helper.get()
+        self.observe(resource, method, elapsed, helper=helper_name, error=error)
+        if self.on_span is not None:
+            end = time.time_ns()
+            attributes: Dict[str, Any] = {
+                "vapi.resource": resource,
+                "vapi.method": method,
+                "cora.helper": helper_name or DIRECT,
+            }
+            if error is not None:
+                attributes["error.type"] = _error_kind(error)
+                status = getattr(error, "status_code", None)
+                if isinstance(status, int):
+                    attributes["http.response.status_code"] = status
+            self.on_span(
+                SpanRecord(
+                    name=f"vapi {resource}.{method}",
+                    start_time=end - int(elapsed * 1e9),
+                    end_time=end,
+                    attributes=attributes,
+                    error=error,
+                )
+            )
+
+
+class InstrumentedResource:
+    """
+    An SDK resource whose methods report to a :class:`Metrics` registry.
+    Non-callable attributes pass straight through.
+    """
+
+    def __init__(self, resource: Any, name: str, metrics: Metrics, *, asynchronous: bool = False) -> None:
+        self._resource = resource
+        self._name = name
+        self._metrics = metrics
+        self._asynchronous = asynchronous
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._resource, name)
+        if name.startswith("_") or not callable(value):
+            return value
+        wrapped = (self._wrap_async if self._asynchronous else self._wrap)(value, name)
+        self.__dict__[name] = wrapped
+        return wrapped
+
+    def _wrap(self, fn: Callable[..., Any], method: str) -> Callable[..., Any]:
+        metrics, resource = self._metrics, self._name
+
+        @functools.wraps(fn)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                metrics._record(resource, method, started, exc)
+                raise
+            metrics._record(resource, method, started, None)
+            return result
+
+        return call
+
+    def _wrap_async(self, fn: Callable[..., Any], method: str) -> Callable[..., Any]:
+        metrics, resource = self._metrics, self._name
+
+        @functools.wraps(fn)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as exc:
+                metrics._record(resource, method, started, exc)
+                raise
+            metrics._record(resource, method, started, None)
+            return result
+
+        return call
+
+
+def enable_metrics(metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    Report requests from every connector without a registry of its own
+    (including the default connectors) to ``metrics``, creating one if
+    needed. Returns the active registry.
+    """
+    global _active
+    _active = metrics if metrics is not None else (_active if _active is not None else Metrics())
+    return _active
+
+
+def disable_metrics() -> None:
+    global _active
+    _active = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    The process-wide registry set by :func:`enable_metrics`, if any.
+    """
+    return _active
+
+
+def helper(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator labelling the requests a cora helper makes with ``name``.
+    The outermost helper wins, so ``wait_for_terminal``'s polls are not
+    relabelled by anything it calls. Works on plain and async functions and
+    on (async) generators, where the label is applied while they run.
+    """
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isasyncgenfunction(fn):
+
+            @functools.wraps(fn)
+            async def agen(*args: Any, **kwargs: Any) -> Any:
+                if _current_helper.get() is not None:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                    return
+                inner = fn(*args, **kwargs)
+                try:
+                    while True:
+                        token = _current_helper.set(name)
+                        try:
+                            item = await inner.__anext__()
+                        except StopAsyncIteration:
+                            return
+                        finally:
+                            _current_helper.reset(token)
+                        yield item
+                finally:
+                    await inner.aclose()
+
+            return agen
+
+        if inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def gen(*args: Any, **kwargs: Any) -> Any:
+                if _current_helper.get() is not None:
+                    return (yield from fn(*args, **kwargs))
+                inner = fn(*args, **kwargs)
+                try:
+                    while True:
+                        token = _current_helper.set(name)
+                        try:
+                            item = next(inner)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            _current_helper.reset(token)
+                        yield item
+                finally:
+                    inner.close()
+
+            return gen
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def coro(*args: Any, **kwargs: Any) -> Any:
+                if _current_helper.get() is not None:
+                    return await fn(*args, **kwargs)
+                token = _current_helper.set(name)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    _current_helper.reset(token)
+
+            return coro
+
+        @functools.wraps(fn)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            if _current_helper.get() is not None:
+                return fn(*args, **kwargs)
+            token = _current_helper.set(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current_helper.reset(token)
+
+        return call
+
+    return decorate
+
+
+def carry_helper(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Bind the current helper label to ``fn`` so requests it makes on a worker
+    thread are attributed to the helper that scheduled it.
+    """
+    name = _current_helper.get()
+    if name is None:
+        return fn
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        token = _current_helper.set(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_helper.reset(token)
+
+    return call
+
+
+def opentelemetry_callback(tracer: Any = None) -> Callable[[SpanRecord], None]:
+    """
+    An ``on_span`` callback that exports each request as an OpenTelemetry
+    span (a child of whatever span is current), using ``tracer`` or the
+    global tracer provider's ``"cora"`` tracer.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "opentelemetry-api is required for opentelemetry_callback(). Install it with `pip install opentelemetry-api`."
+        ) from exc
+
+    tracer = tracer if tracer is not None else trace.get_tracer("cora")
+
+    def export(record: SpanRecord) -> None:
+        span = tracer.start_span(
+            record.name, kind=trace.SpanKind.CLIENT, start_time=record.start_time, attributes=record.attributes
+        )
+        if record.error is not None:
+            span.record_exception(record.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(record.error)))
+        span.end(end_time=record.end_time)
+
+    return export
+
+
+def _error_kind(error: BaseException) -> str:
+    status = getattr(error, "status_code", None)
+    return str(status) if isinstance(status, int) else type(error).__name__
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
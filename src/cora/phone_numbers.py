@@ -1,12 +1,27 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from .vapi_client import VapiConnector
+from . import metrics as _metrics
+from .calls import UUID_PATTERN, normalize_phone
+from .vapi_client import AsyncVapiConnector, VapiConnector, get_default_async_connector, get_default_connector
 
-__all__ = ["list_phone_numbers", "get_phone_number"]
+__all__ = ["list_phone_numbers", "get_phone_number", "PhoneNumberDirectory"]
 
+DEFAULT_DIRECTORY_TTL = 300.0
+LIST_PAGE_SIZE = 1000
+# ITU zone 2-9 country codes that are two digits long; the rest are three.
+_TWO_DIGIT_COUNTRY_CODES = frozenset(
+    "20 27 30 31 32 33 34 36 39 40 41 43 44 45 46 47 48 49 51 52 53 54 55 56 57 58 "
+    "60 61 62 63 64 65 66 81 82 84 86 90 91 92 93 94 95 98".split()
+)
 
+
+@_metrics.helper("list_phone_numbers")
 def list_phone_numbers(
     *,
     connector: Optional[VapiConnector] = None,
@@ -16,10 +31,11 @@ def list_phone_numbers(
     Return all phone numbers visible to the authenticated Vapi account.
     Optional keyword arguments are forwarded to the underlying SDK call.
     """
-    client = connector or VapiConnector()
+    client = connector or get_default_connector()
     return client.phone_numbers.list(**filters)
 
 
+@_metrics.helper("get_phone_number")
 def get_phone_number(
     phone_number_id: str,
     *,
@@ -28,5 +44,235 @@ def get_phone_number(
     """
     Fetch a single phone number by ID (UUID) using the Vapi SDK.
     """
-    client = connector or VapiConnector()
+    client = connector or get_default_connector()
     return client.phone_numbers.get(phone_number_id)
+
+
+class PhoneNumberDirectory:
+    """
+    Every phone number on the account, loaded by paging the listing and kept
+    for ``ttl`` seconds, indexed by id, E.164 number and area code. When the
+    TTL runs out one caller reloads it while the others keep using the
+    current index.
+
+    :meth:`select_for` picks the sending number for a customer: one in the
+    customer's area code (local presence), else one in the same region (when
+    ``regions`` maps area codes to region names, e.g. ``{"954": "FL"}``),
+    else one in the same country, else any active number. Ties are spread
+    round-robin. Pass the directory to :func:`cora.create_call` /
+    :func:`cora.create_calls` as ``phone_numbers=`` to let it choose; the
+    :mod:`cora.aio` helpers reload it through their async connector
+    (:meth:`arefresh`) so the event loop never blocks on the listing.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: Optional[float] = DEFAULT_DIRECTORY_TTL,
+        regions: Optional[Mapping[str, str]] = None,
+        connector: Optional[VapiConnector] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive (or None to never refresh).")
+        self.ttl = ttl
+        self.regions: Dict[str, str] = dict(regions or {})
+        self._connector = connector
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._arefreshing: Optional[asyncio.Future] = None
+        self._loaded_at: Optional[float] = None
+        self._by_id: Dict[str, Any] = {}
+        self._by_number: Dict[str, Any] = {}
+        self._pools: Dict[Tuple[str, str], List[Any]] = {}
+        self._active: List[Any] = []
+        self._cursors: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._ensure_fresh()
+        return iter(list(self._by_id.values()))
+
+    @_metrics.helper("PhoneNumberDirectory.refresh")
+    def refresh(self) -> None:
+        """
+        Reload the listing now.
+        """
+        client = self._connector if self._connector is not None else get_default_connector()
+        numbers: Dict[str, Any] = {}
+        query: Optional[Dict[str, Any]] = {"limit": LIST_PAGE_SIZE}
+        while query is not None:
+            query = _next_page_query(list(client.phone_numbers.list(**query) or []), numbers)
+        self._index(numbers.values())
+
+    @_metrics.helper("PhoneNumberDirectory.refresh")
+    async def arefresh(self, v: Optional[AsyncVapiConnector] = None) -> None:
+        """
+        Awaitable :meth:`refresh` through an async connector (``v``, else the
+        default async connector).
+        """
+        client = v or get_default_async_connector()
+        numbers: Dict[str, Any] = {}
+        query: Optional[Dict[str, Any]] = {"limit": LIST_PAGE_SIZE}
+        while query is not None:
+            query = _next_page_query(list(await client.phone_numbers.list(**query) or []), numbers)
+        self._index(numbers.values())
+
+    def _index(self, numbers: Iterable[Any]) -> None:
+        by_id: Dict[str, Any] = {}
+        by_number: Dict[str, Any] = {}
+        pools: Dict[Tuple[str, str], List[Any]] = {}
+        active: List[Any] = []
+        for phone in numbers:
+            by_id[phone.id] = phone
+            e164 = _e164(getattr(phone, "number", None))
+            if e164 is None:
+                continue
+            by_number[e164] = phone
+            if getattr(phone, "status", None) not in (None, "active"):
+                continue
+            active.append(phone)
+            for key in self._keys(e164):
+                pools.setdefault(key, []).append(phone)
+        with self._lock:
+            self._by_id, self._by_number, self._pools, self._active = by_id, by_number, pools, active
+            self._loaded_at = self._clock()
+
+    def get(self, phone_number_id: str) -> Optional[Any]:
+        self._ensure_fresh()
+        return self._by_id.get(phone_number_id)
+
+    def by_number(self, number: str) -> Optional[Any]:
+        self._ensure_fresh()
+        e164 = _e164(number)
+        return self._by_number.get(e164) if e164 is not None else None
+
+    def with_area_code(self, area_code: str) -> List[Any]:
+        self._ensure_fresh()
+        return list(self._pools.get(("area", area_code), ()))
+
+    def select_for(self, customer: Any) -> Any:
+        """
+        The number to call or text ``customer`` (str or ``{"number": ...}``)
+        from. Raises ValueError when the account has no active numbers.
+        """
+        self._ensure_fresh()
+        number = customer.get("number") if isinstance(customer, Mapping) else customer
+        e164 = _e164(number) if isinstance(number, str) else None
+        if e164 is not None:
+            for key in self._keys(e164):
+                pool = self._pools.get(key)
+                if pool:
+                    return self._next(key, pool)
+        if not self._active:
+            raise ValueError("No active phone numbers on the account; provision one in Vapi first.")
+        return self._next(("any", ""), self._active)
+
+    def resolve(self, phone_number_id: Optional[str], customer: Any) -> str:
+        """
+        The phone number id for a call: ``phone_number_id`` itself when it is
+        an id, the matching number's id when it is a phone number, otherwise
+        :meth:`select_for` ``customer``.
+        """
+        if phone_number_id and UUID_PATTERN.match(phone_number_id):
+            return phone_number_id
+        if phone_number_id:
+            phone = self.by_number(phone_number_id)
+            if phone is None:
+                raise ValueError(f"{phone_number_id!r} is not a phone number on this account.")
+            return phone.id
+        return self.select_for(customer).id
+
+    def _keys(self, e164: str) -> List[Tuple[str, str]]:
+        # Most specific first: area code, region, country.
+        keys: List[Tuple[str, str]] = []
+        area_code = _area_code(e164)
+        if area_code is not None:
+            keys.append(("area", area_code))
+            region = self.regions.get(area_code)
+            if region is not None:
+                keys.append(("region", region))
+        keys.append(("country", _country_code(e164)))
+        return keys
+
+    def _next(self, key: Tuple[str, str], pool: List[Any]) -> Any:
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        return pool[cursor % len(pool)]
+
+    def _stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or (self.ttl is not None and self._clock() - loaded_at >= self.ttl)
+
+    def _ensure_fresh(self) -> None:
+        if not self._stale():
+            return
+        # Single flight: the first caller reloads; the rest keep using the
+        # current index, or wait when there is none yet.
+        if not self._refresh_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._stale():
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    async def _aensure_fresh(self, v: Optional[AsyncVapiConnector] = None) -> None:
+        if not self._stale():
+            return
+        loop = asyncio.get_running_loop()
+        flight = self._arefreshing
+        if flight is None or flight.done() or flight.get_loop() is not loop:
+            flight = self._arefreshing = loop.create_task(self.arefresh(v))
+        await asyncio.shield(flight)
+
+
+def _next_page_query(page: List[Any], numbers: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Add ``page`` (newest first) to ``numbers`` and return the query for the
+    next page, or None when the listing is exhausted. Like the call export,
+    paging narrows ``created_at_le`` to the oldest number seen so far and
+    skips ids already collected at that instant.
+    """
+    fresh = [phone for phone in page if phone.id not in numbers]
+    for phone in fresh:
+        numbers[phone.id] = phone
+    if len(page) < LIST_PAGE_SIZE:
+        return None
+    stamps = [stamp for stamp in (getattr(phone, "created_at", None) for phone in page) if stamp is not None]
+    if not stamps:
+        return None
+    oldest = min(stamps)
+    if not fresh:
+        # A full page sharing one timestamp: step strictly past it.
+        return {"limit": LIST_PAGE_SIZE, "created_at_lt": oldest}
+    return {"limit": LIST_PAGE_SIZE, "created_at_le": oldest}
+
+
+def _e164(number: Optional[str]) -> Optional[str]:
+    if not number:
+        return None
+    normalized = normalize_phone(number)
+    digits = re.sub(r"\D+", "", normalized)
+    return "+" + digits if digits else None
+
+
+def _area_code(e164: str) -> Optional[str]:
+    # North American Numbering Plan: +1 NPA NXX XXXX.
+    if len(e164) == 12 and e164.startswith("+1"):
+        return e164[2:5]
+    return None
+
+
+def _country_code(e164: str) -> str:
+    digits = e164[1:]
+    if digits.startswith(("1", "7")):
+        return digits[:1]
+    if digits[:2] in _TWO_DIGIT_COUNTRY_CODES:
+        return digits[:2]
+    return digits[:3]
@@ -0,0 +1,79 @@
+"""
+Client-side rate limiting helpers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+__all__ = ["TokenBucket", "retry_after_seconds"]
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, holding at most
+    ``burst``. :meth:`wait_time` says how long until a token is free and
+    :meth:`take` spends one (going into debt is allowed, so callers that
+    reserve ahead of time are simply scheduled later).
+    """
+
+    def __init__(self, rate: float, *, burst: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if burst < 1:
+            raise ValueError("burst must be at least 1.")
+        self.rate = rate
+        self.burst = float(burst)
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """
+        Seconds until one token is available (0.0 when one is available now).
+        """
+        with self._lock:
+            tokens = self._refill(self._clock() if now is None else now)
+            return 0.0 if tokens >= 1.0 else (1.0 - tokens) / self.rate
+
+    def take(self, now: Optional[float] = None) -> float:
+        """
+        Spend one token and return how long the caller should wait before
+        acting on it.
+        """
+        with self._lock:
+            tokens = self._refill(self._clock() if now is None else now)
+            self._tokens = tokens - 1.0
+            return 0.0 if tokens >= 1.0 else (1.0 - tokens) / self.rate
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available and spend it.
+        """
+        delay = self.take()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _refill(self, now: float) -> float:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        return self._tokens
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    The ``Retry-After`` delay (in seconds) carried by an SDK ``ApiError``, if
+    any. HTTP-date values are not supported and return None.
+    """
+    headers = getattr(exc, "headers", None) or {}
+    for key, value in headers.items():
+        if str(key).lower() == "retry-after":
+            try:
+                return max(float(value), 0.0)
+            except (TypeError, ValueError):
+                return None
+    return None
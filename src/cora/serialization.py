@@ -0,0 +1,365 @@
+"""
+Turn Vapi SDK objects (and anything else found on a call) into plain Python
+and JSON.
+
+The conversion strategy for each type is resolved once and cached, instead of
+probing ``model_dump``/``dict``/``__dict__``/``json`` with ``hasattr`` on every
+nested value. Output is identical to the original helpers in ``cora.calls``;
+only ``fast=True`` (orjson) trades byte-for-byte compatibility for speed.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+__all__ = ["dumps", "dumps_messages", "fast_json_available", "to_python"]
+
+_Converter = Callable[[Any], Any]
+
+_SCALARS = (str, int, float, bool)
+_MISSING = object()
+
+_converters: Dict[type, _Converter] = {}
+_message_encoders: Dict[type, _Converter] = {}
+_plain_models: Dict[type, bool] = {}
+_plain_models_lock = threading.Lock()
+
+
+def to_python(value: Any) -> Any:
+    """
+    Recursively convert ``value`` into dicts, lists and scalars: pydantic
+    models via ``model_dump()``, plain objects via their public ``__dict__``,
+    and anything else via ``str()``.
+    """
+    convert = _converters.get(type(value))
+    if convert is None:
+        convert = _resolve(type(value))
+    return convert(value)
+
+
+def dumps(value: Any, *, fast: bool = False) -> str:
+    """
+    ``json.dumps(value, default=str)``, falling back to ``str(value)`` when the
+    value cannot be encoded. ``fast=True`` uses orjson when it is installed
+    (compact separators, ISO datetimes), so the text differs from the default.
+    """
+    if fast:
+        encoded = _orjson_dumps(value)
+        if encoded is not None:
+            return encoded
+    try:
+        return json.dumps(value, default=str)
+    except TypeError:
+        return str(value)
+
+
+def dumps_messages(messages: Any, *, fast: bool = False) -> Optional[str]:
+    """
+    Encode a call's ``messages`` list the way call payloads store it: a JSON
+    array holding each SDK message's own ``.json()`` string (or the
+    :func:`to_python` form for messages without one). Returns None when empty.
+    """
+    if not messages:
+        return None
+    serialized = []
+    for message in messages:
+        encode = _message_encoders.get(type(message))
+        if encode is None:
+            encode = _resolve_message(type(message))
+        serialized.append(encode(message))
+    return dumps(serialized, fast=fast)
+
+
+def fast_json_available() -> bool:
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# --- to_python strategies ---------------------------------------------------
+
+
+def _resolve(tp: type) -> _Converter:
+    if tp is type(None) or issubclass(tp, _SCALARS):
+        convert = _identity
+    elif issubclass(tp, dict):
+        convert = _convert_dict
+    elif issubclass(tp, (list, tuple, set)):
+        convert = _convert_sequence
+    elif issubclass(tp, type) or _has_dynamic_attributes(tp):
+        convert = _probe
+    elif hasattr(tp, "model_dump"):
+        convert = _dump_via("model_dump")
+    elif hasattr(tp, "dict"):
+        convert = _dump_via("dict")
+    else:
+        convert = _convert_object
+    _converters[tp] = convert
+    return convert
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _convert_dict(value: Dict[Any, Any]) -> Dict[Any, Any]:
+    converted = {}
+    for key, item in value.items():
+        convert = _converters.get(type(item))
+        if convert is None:
+            convert = _resolve(type(item))
+        converted[key] = convert(item)
+    return converted
+
+
+def _convert_sequence(value: Any) -> list:
+    converted = []
+    for item in value:
+        convert = _converters.get(type(item))
+        if convert is None:
+            convert = _resolve(type(item))
+        converted.append(convert(item))
+    return converted
+
+
+def _dump_via(name: str) -> _Converter:
+    def convert(value: Any) -> Any:
+        try:
+            data = getattr(value, name)()
+        except TypeError:
+            return _probe(value)
+        return to_python(data)
+
+    return convert
+
+
+def _convert_object(value: Any) -> Any:
+    attrs = getattr(value, "__dict__", _MISSING)
+    if attrs is _MISSING:
+        return _probe(value)
+    if "model_dump" in attrs or "dict" in attrs:
+        return _probe(value)
+    return {k: to_python(v) for k, v in attrs.items() if not k.startswith("_") and not callable(v)}
+
+
+def _probe(value: Any) -> Any:
+    """
+    Per-value attribute probing, for objects whose behaviour cannot be decided
+    from their type alone (custom ``__getattr__``, classes, odd instances).
+    """
+    if value is None or isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, dict):
+        return _convert_dict(value)
+    if isinstance(value, (list, tuple, set)):
+        return _convert_sequence(value)
+    for attr in ("model_dump", "dict"):
+        if hasattr(value, attr):
+            method = getattr(value, attr)
+            try:
+                data = method()
+            except TypeError:
+                continue
+            return to_python(data)
+    if hasattr(value, "__dict__"):
+        return {
+            k: to_python(v)
+            for k, v in value.__dict__.items()
+            if not k.startswith("_") and not callable(v)
+        }
+    if hasattr(value, "json"):
+        try:
+            data = value.json()
+        except TypeError:
+            return str(value)
+        if isinstance(data, str):
+            return data
+        return to_python(data)
+    return str(value)
+
+
+def _has_dynamic_attributes(tp: type) -> bool:
+    getattribute = getattr(tp, "__getattribute__", object.__getattribute__)
+    if getattribute is not object.__getattribute__:
+        return True
+    if not hasattr(tp, "__getattr__"):
+        return False
+    # pydantic models define __getattr__ only for private attributes, which
+    # never shadow the methods we look up.
+    base_model = _pydantic_base_model()
+    return base_model is None or not issubclass(tp, base_model)
+
+
+# --- message strategies -----------------------------------------------------
+
+
+def _resolve_message(tp: type) -> _Converter:
+    if _is_plain_fern_model(tp):
+        encode = _fern_message_json
+    elif issubclass(tp, (dict, list, tuple, set)) or tp is type(None) or issubclass(tp, _SCALARS):
+        encode = to_python
+    elif issubclass(tp, type) or _has_dynamic_attributes(tp) or not hasattr(tp, "json"):
+        encode = _probe_message
+    else:
+        encode = _message_json
+    _message_encoders[tp] = encode
+    return encode
+
+
+def _message_json(message: Any) -> Any:
+    try:
+        return message.json()
+    except TypeError:
+        return to_python(message)
+
+
+def _probe_message(message: Any) -> Any:
+    if hasattr(message, "json"):
+        return _message_json(message)
+    return to_python(message)
+
+
+def _fern_message_json(message: Any) -> Any:
+    """
+    Same text as the SDK's ``message.json()`` for models whose Fern alias
+    rewriting is a no-op: the two pydantic-core dumps Fern's ``dict()`` merges,
+    then pydantic-core's JSON encoder, skipping the pure-Python annotation
+    walk that dominates ``.json()``. Nested datetimes are left to
+    pydantic-core, as they are in ``.json()``.
+    """
+    try:
+        # SDK internals: if a release moves them, use ``.json()`` itself.
+        from pydantic import BaseModel
+        from pydantic_core import to_json
+        from vapi.core.datetime_utils import serialize_datetime
+        from vapi.core.pydantic_utilities import deep_union_pydantic_dicts
+
+        data = deep_union_pydantic_dicts(
+            BaseModel.model_dump(message, by_alias=True, exclude_unset=True, exclude_none=False),
+            BaseModel.model_dump(message, by_alias=True, exclude_none=True, exclude_unset=False),
+        )
+        data = {k: serialize_datetime(v) if isinstance(v, datetime) else v for k, v in data.items()}
+        return to_json(data).decode()
+    except Exception:  # noqa: BLE001 - anything unexpected: defer to the SDK
+        return _message_json(message)
+
+
+def _is_plain_fern_model(tp: type) -> bool:
+    cached = _plain_models.get(tp)
+    if cached is not None:
+        return cached
+    with _plain_models_lock:
+        plain = _check_fern_model(tp)
+        _plain_models[tp] = plain
+    return plain
+
+
+def _check_fern_model(tp: type) -> bool:
+    """
+    True when ``tp`` is a Fern ``UniversalBaseModel`` that keeps the stock
+    ``json``/``dict`` and whose annotations give Fern's alias conversion nothing
+    to rewrite.
+    """
+    try:
+        from vapi.core.datetime_utils import serialize_datetime  # noqa: F401 - used by _fern_message_json
+        from vapi.core.pydantic_utilities import IS_PYDANTIC_V2, UniversalBaseModel, deep_union_pydantic_dicts  # noqa: F401
+    except ImportError:  # pragma: no cover - SDK layout changed
+        return False
+    if not IS_PYDANTIC_V2 or not isinstance(tp, type) or not issubclass(tp, UniversalBaseModel):
+        return False
+    overridable = ("json", "dict", "model_dump", "model_dump_json", "serialize_model")
+    for klass in tp.__mro__[: tp.__mro__.index(UniversalBaseModel)]:
+        if any(name in vars(klass) for name in overridable):
+            return False
+    if set(tp.__pydantic_decorators__.model_serializers) != {"serialize_model"}:
+        return False
+    return _alias_conversion_is_noop(tp, set())
+
+
+def _alias_conversion_is_noop(model: type, seen: Set[type]) -> bool:
+    """
+    Fern's write-direction conversion only touches keys that are dumped under
+    their Python name; everything else is passed through. Those keys are safe
+    when they carry no differing ``FieldMetadata`` alias and their type holds no
+    TypedDict or model that is itself rewritten.
+    """
+    if model in seen:
+        return True
+    seen.add(model)
+    try:
+        import typing_extensions
+        from vapi.core.serialization import _get_alias_from_type
+    except ImportError:  # pragma: no cover - SDK layout changed
+        return False
+    try:
+        hints = typing_extensions.get_type_hints(model, include_extras=True)
+    except Exception:  # noqa: BLE001 - unresolved forward refs and the like
+        return False
+    fields = getattr(model, "model_fields", {})
+    for name, hint in hints.items():
+        field = fields.get(name)
+        if field is None:
+            continue
+        if (field.serialization_alias or field.alias or name) != name:
+            continue
+        if (_get_alias_from_type(hint) or name) != name:
+            return False
+        if not _annotation_is_plain(hint, seen):
+            return False
+    return True
+
+
+def _annotation_is_plain(annotation: Any, seen: Set[type]) -> bool:
+    import typing
+
+    import typing_extensions
+
+    base_model = _pydantic_base_model()
+    origin = typing_extensions.get_origin(annotation)
+    if origin is typing_extensions.Annotated or origin is typing_extensions.NotRequired:
+        return _annotation_is_plain(typing_extensions.get_args(annotation)[0], seen)
+    if origin is typing_extensions.Literal or annotation is typing.Any:
+        return True
+    if origin is not None:
+        if origin not in (dict, list, typing.Union) and not _is_union_origin(origin):
+            return False
+        return all(_annotation_is_plain(arg, seen) for arg in typing_extensions.get_args(annotation))
+    if annotation is type(None) or annotation is Any:
+        return True
+    if not isinstance(annotation, type):
+        return False
+    if typing_extensions.is_typeddict(annotation):
+        return False
+    if base_model is not None and issubclass(annotation, base_model):
+        return _alias_conversion_is_noop(annotation, seen)
+    return not issubclass(annotation, (list, tuple, set, dict))
+
+
+def _is_union_origin(origin: Any) -> bool:
+    import types
+
+    return origin is getattr(types, "UnionType", None)
+
+
+def _pydantic_base_model() -> Optional[type]:
+    try:
+        from pydantic import BaseModel
+    except ImportError:  # pragma: no cover - pydantic ships with the SDK
+        return None
+    return BaseModel
+
+
+def _orjson_dumps(value: Any) -> Optional[str]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    try:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    except (TypeError, orjson.JSONEncodeError):
+        return None
@@ -0,0 +1,120 @@
+"""
+Process-wide configuration read from the environment (and `.env`) exactly once.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+__all__ = ["Settings", "get_settings", "reset_settings"]
+
+DEFAULT_ENV_PATH = Path.cwd() / ".env"
+API_KEY_ENV = "VAPI_API_KEY"
+LEGACY_PRIVATE_KEY_ENV = "VAPI_PRIVATE_KEY"
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_ASSISTANT_REGISTRY = ".cora/assistants.sqlite3"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Snapshot of every environment variable Cora reads. Build it with
+    :func:`get_settings` so `.env` parsing happens once per process.
+    """
+
+    api_key: Optional[str] = field(repr=False)
+    private_key: Optional[str] = field(repr=False)
+    model_provider: str
+    model_name: str
+    phone_number_id: Optional[str]
+    tool_ids: Tuple[str, ...]
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    timeout: float
+    assistant_registry_path: str
+    coalesce_ttl: Optional[float] = None
+    call_cache_path: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            api_key=os.getenv(API_KEY_ENV),
+            private_key=os.getenv(LEGACY_PRIVATE_KEY_ENV),
+            model_provider=os.getenv("VAPI_MODEL_PROVIDER", "openai"),
+            model_name=os.getenv("VAPI_MODEL_NAME", "gpt-5.1"),
+            phone_number_id=_parse_env_value(os.getenv("VAPI_PHONE_NUMBER_ID")),
+            tool_ids=tuple(
+                item
+                for item in (_parse_env_value(raw) for raw in os.getenv("VAPI_TOOL_IDS", "").split(","))
+                if item
+            ),
+            max_connections=int(os.getenv("VAPI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(
+                os.getenv("VAPI_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+            ),
+            keepalive_expiry=float(os.getenv("VAPI_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+            timeout=float(os.getenv("VAPI_TIMEOUT", DEFAULT_TIMEOUT)),
+            assistant_registry_path=os.getenv("VAPI_ASSISTANT_REGISTRY", DEFAULT_ASSISTANT_REGISTRY),
+            coalesce_ttl=_parse_optional_float(os.getenv("VAPI_COALESCE_TTL")),
+            call_cache_path=_parse_env_value(os.getenv("VAPI_CALL_CACHE")),
+        )
+
+
+_settings: Dict[Path, Settings] = {}
+_settings_lock = threading.Lock()
+
+
+def get_settings(env_path: Optional[Path | str] = None) -> Settings:
+    """
+    Load `.env` (without overriding variables already exported) and return the
+    cached :class:`Settings`. Subsequent calls with the same path are free.
+    """
+    env_file = Path(env_path) if env_path is not None else DEFAULT_ENV_PATH
+    cached = _settings.get(env_file)
+    if cached is not None:
+        return cached
+    with _settings_lock:
+        cached = _settings.get(env_file)
+        if cached is None:
+            if env_file.exists():
+                load_dotenv(dotenv_path=env_file, override=False)
+            else:
+                load_dotenv(override=False)
+            cached = _settings[env_file] = Settings.from_env()
+    return cached
+
+
+def reset_settings() -> None:
+    """
+    Forget cached settings so the next :func:`get_settings` re-reads the
+    environment (useful in tests or after rotating credentials).
+    """
+    with _settings_lock:
+        _settings.clear()
+
+
+def _parse_optional_float(raw: Optional[str]) -> Optional[float]:
+    value = _parse_env_value(raw)
+    return float(value) if value is not None else None
+
+
+def _parse_env_value(raw: Optional[str]) -> Optional[str]:
+    if raw is None:
+        return None
+    trimmed = raw.strip()
+    if not trimmed:
+        return None
+    trimmed = trimmed.split("#", 1)[0].strip()
+    trimmed = trimmed.strip("\"'")
+    return trimmed or None
@@ -0,0 +1,362 @@
+"""
+Local SQLite mirror of the account's calls, so reports query indexed tables
+instead of the Vapi API.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import metrics as _metrics
+from .calls import _call_to_payload, normalize_phone
+from .export import CALL_COLUMNS, DEFAULT_PAGE_SIZE, _coerce, _iter_call_pages, _parse_datetime
+from .serialization import dumps, to_python
+from .vapi_client import VapiConnector, get_default_connector
+
+__all__ = ["CallStore", "CallSyncResult"]
+
+# Calls updated this long before the previous sync started are fetched again,
+# to cover clock skew and calls that changed while that sync was running.
+DEFAULT_SYNC_OVERLAP = 300.0
+_STATE_KEY = "calls"
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+# Bound parameters per lookup; older SQLite builds allow at most 999.
+_LOOKUP_CHUNK = 500
+_SQL_TYPES = {"string": "TEXT", "category": "TEXT", "json": "TEXT", "timestamp": "TEXT", "float": "REAL"}
+# Messages live in their own table; everything else is a column of `calls`.
+STORE_COLUMNS: Dict[str, str] = {name: kind for name, kind in CALL_COLUMNS.items() if name != "messages"}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS calls (call_id TEXT PRIMARY KEY, "
+    + ", ".join(f"{name} {_SQL_TYPES[kind]}" for name, kind in STORE_COLUMNS.items() if name != "call_id")
+    + ")",
+    """
+    CREATE TABLE IF NOT EXISTS call_messages (
+        call_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        role TEXT,
+        message TEXT,
+        time REAL,
+        seconds_from_start REAL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (call_id, seq)
+    ) WITHOUT ROWID
+    """,
+    "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS calls_created_at ON calls (created_at)",
+    "CREATE INDEX IF NOT EXISTS calls_status ON calls (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS calls_assistant ON calls (assistant_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS calls_customer ON calls (customer_number, created_at)",
+)
+_UPSERT_CALL = (
+    f"INSERT OR REPLACE INTO calls ({', '.join(STORE_COLUMNS)}) VALUES ({', '.join('?' * len(STORE_COLUMNS))})"
+)
+
+
+@dataclass(frozen=True)
+class CallSyncResult:
+    """
+    Summary of a :meth:`CallStore.sync` run: ``fetched`` calls came back from
+    the API, ``changed`` of them were new or updated locally. ``watermark``
+    is where the next incremental sync starts.
+    """
+
+    fetched: int
+    changed: int
+    watermark: Optional[datetime]
+
+
+class CallStore:
+    """
+    SQLite mirror of calls, their messages and analysis.
+
+    :meth:`sync` pages ``calls.list`` for calls updated since the previous
+    sync and upserts them one page per transaction, checkpointing its
+    position in the same transaction, so an interrupted sync resumes where
+    it stopped. :meth:`query`, :meth:`get` and :meth:`messages` read the
+    local tables, which are indexed on status, assistant id, customer number
+    and creation time. Timestamps are stored as UTC ISO-8601 text, so they
+    sort and compare as strings.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cora/calls.sqlite3", *, v: Optional[VapiConnector] = None) -> None:
+        self.path = str(path)
+        self._connector = v
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            if self.path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM calls").fetchone()[0]
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """
+        Calls updated at or after this time are fetched by the next sync
+        (None: everything is).
+        """
+        return _parse_datetime(self._state().get("watermark"))
+
+    @_metrics.helper("CallStore.sync")
+    def sync(
+        self,
+        *,
+        full: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        overlap: float = DEFAULT_SYNC_OVERLAP,
+        v: Optional[VapiConnector] = None,
+    ) -> CallSyncResult:
+        """
+        Fetch calls created or updated since the last sync and upsert them.
+        ``full=True`` re-reads every call. Messages of a changed call are
+        replaced as a whole; calls whose ``updatedAt`` did not move are
+        skipped without writing.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be positive.")
+        client = v or self._connector or get_default_connector()
+        state = self._state()
+        pending = state.get("pending")
+        if full or pending is None:
+            since = None if full else _parse_datetime(state.get("watermark"))
+            pending = {
+                "updated_after": _text(since),
+                "started": _text(datetime.now(timezone.utc)),
+                "max_updated": None,
+                "cursor": None,
+            }
+        pages = _iter_call_pages(
+            client,
+            created_after=None,
+            created_before=None,
+            assistant_id=None,
+            phone_number_id=None,
+            page_size=page_size,
+            cursor=pending["cursor"],
+            updated_after=_parse_datetime(pending["updated_after"]),
+        )
+        fetched = changed = 0
+        for calls, cursor in pages:
+            rows = [_call_row(call_obj) for call_obj in calls]
+            pending["cursor"] = cursor
+            newest = max((row[1]["updated_at"] for row in rows if row[1]["updated_at"]), default=None)
+            if newest is not None and (pending["max_updated"] is None or newest > pending["max_updated"]):
+                pending["max_updated"] = newest
+            fetched += len(rows)
+            changed += self._upsert(rows, {**state, "pending": pending})
+
+        watermark = _next_watermark(pending, overlap)
+        self._save_state({"watermark": _text(watermark)})
+        return CallSyncResult(fetched=fetched, changed=changed, watermark=watermark)
+
+    def get(self, call_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored row for ``call_id``, or None.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT * FROM calls WHERE call_id = ?", (call_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def query(
+        self,
+        *,
+        status: Union[str, Sequence[str], None] = None,
+        assistant_id: Optional[str] = None,
+        phone_number_id: Optional[str] = None,
+        customer: Optional[str] = None,
+        ended_reason: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        pandas: bool = False,
+    ) -> Any:
+        """
+        Stored calls matching every given filter, newest first, as dicts (or
+        a DataFrame with ``pandas=True``). ``customer`` is normalized like
+        :func:`cora.normalize_phone`; ``created_after`` is inclusive and
+        ``created_before`` exclusive.
+        """
+        where, params = _filters(
+            status=status,
+            assistant_id=assistant_id,
+            phone_number_id=phone_number_id,
+            customer=customer,
+            ended_reason=ended_reason,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        sql = f"SELECT * FROM calls{where} ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        if pandas:
+            return _rows_to_dataframe(rows, columns)
+        return [dict(row) for row in rows]
+
+    def count(self, **filters: Any) -> int:
+        """
+        Number of stored calls matching the :meth:`query` filters.
+        """
+        where, params = _filters(**filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM calls{where}", params).fetchone()[0]
+
+    def messages(self, call_id: str) -> List[Dict[str, Any]]:
+        """
+        The stored messages of ``call_id`` in order, each with its full
+        ``payload`` decoded.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, role, message, time, seconds_from_start, payload FROM call_messages"
+                " WHERE call_id = ? ORDER BY seq",
+                (call_id,),
+            ).fetchall()
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _upsert(self, rows: List[Tuple[str, Dict[str, Any], List[Tuple[Any, ...]]]], state: Dict[str, Any]) -> int:
+        ids = [call_id for call_id, _, _ in rows]
+        with self._lock, self._db:
+            known: Dict[str, Any] = {}
+            for start in range(0, len(ids), _LOOKUP_CHUNK):
+                chunk = ids[start : start + _LOOKUP_CHUNK]
+                known.update(
+                    self._db.execute(
+                        f"SELECT call_id, updated_at FROM calls WHERE call_id IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                )
+            changed = [row for row in rows if row[1]["updated_at"] is None or known.get(row[0]) != row[1]["updated_at"]]
+            if changed:
+                self._db.executemany(_UPSERT_CALL, [tuple(values.values()) for _, values, _ in changed])
+                self._db.executemany("DELETE FROM call_messages WHERE call_id = ?", [(row[0],) for row in changed])
+                self._db.executemany(
+                    "INSERT INTO call_messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [message for _, _, messages in changed for message in messages],
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (_STATE_KEY, json.dumps(state, sort_keys=True))
+            )
+        return len(changed)
+
+    def _state(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM sync_state WHERE key = ?", (_STATE_KEY,)).fetchone()
+        return json.loads(row[0]) if row is not None else {}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (_STATE_KEY, json.dumps(state, sort_keys=True))
+            )
+
+
+def _call_row(call_obj: Any) -> Tuple[str, Dict[str, Any], List[Tuple[Any, ...]]]:
+    payload = _call_to_payload(call_obj)
+    values: Dict[str, Any] = {}
+    for name, kind in STORE_COLUMNS.items():
+        value = _coerce(payload.get(name), kind)
+        values[name] = _text(value) if kind == "timestamp" else value
+    call_id = values["call_id"]
+    messages = [
+        (
+            call_id,
+            seq,
+            _field(message, "role"),
+            _field(message, "message"),
+            _field(message, "time"),
+            _field(message, "seconds_from_start", "secondsFromStart"),
+            dumps(to_python(message)),
+        )
+        for seq, message in enumerate(getattr(call_obj, "messages", None) or [])
+    ]
+    return call_id, values, messages
+
+
+def _field(message: Any, *names: str) -> Any:
+    for name in names:
+        value = message.get(name) if isinstance(message, dict) else getattr(message, name, None)
+        if value is not None:
+            return value if isinstance(value, (str, int, float)) else str(value)
+    return None
+
+
+def _filters(
+    *,
+    status: Union[str, Sequence[str], None] = None,
+    assistant_id: Optional[str] = None,
+    phone_number_id: Optional[str] = None,
+    customer: Optional[str] = None,
+    ended_reason: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if status is not None:
+        statuses = [status] if isinstance(status, str) else list(status)
+        clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    for column, value in (
+        ("assistant_id", assistant_id),
+        ("phone_number_id", phone_number_id),
+        ("ended_reason", ended_reason),
+        ("customer_number", normalize_phone(customer) if customer is not None else None),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if created_after is not None:
+        clauses.append("created_at >= ?")
+        params.append(_text(_parse_datetime(created_after)))
+    if created_before is not None:
+        clauses.append("created_at < ?")
+        params.append(_text(_parse_datetime(created_before)))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _next_watermark(pending: Dict[str, Any], overlap: float) -> Optional[datetime]:
+    newest = _parse_datetime(pending["max_updated"])
+    if newest is None:
+        # Nothing changed: start from the same place next time.
+        return _parse_datetime(pending["updated_after"])
+    # Never past the sync's own start: calls updated while it ran may have
+    # been paged over already.
+    started = _parse_datetime(pending["started"])
+    return min(newest, started) - timedelta(seconds=overlap)
+
+
+def _text(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+
+def _rows_to_dataframe(rows: Iterable[Any], columns: List[str]):
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pandas is required when `pandas=True` is passed to CallStore.query().") from exc
+
+    return pd.DataFrame([tuple(row) for row in rows], columns=columns)
@@ -0,0 +1,848 @@
+"""
+In-process stand-in for the Vapi API, for tests, load tests and benchmarks.
+
+:class:`FakeVapi` implements the ``assistants``, ``calls``, ``chats`` and
+``phone_numbers`` resources Cora uses and returns real SDK models. Calls move
+through ``queued -> ringing -> in-progress -> ended`` on a clock you control,
+and grow realistic transcripts, analysis and cost along the way. Latency, 429s,
+server errors and hung requests can be injected on every request.
+
+    fake = FakeVapi(clock=VirtualClock(step=2.0), seed=7)
+    v = fake.connector()
+    assistant = cora.create_assistant(name="Demo", system_prompt="...", voice=..., transcriber=..., connector=v)
+    call = cora.create_call(
+        assistant_id=assistant.id, phone_number_id=fake.phone_number_id, customer="+15555550100", v=v
+    )
+    final = cora.wait_for_terminal(v, call.id, interval=0.0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .vapi_client import AsyncVapiConnector, VapiConnector
+
+__all__ = [
+    "AsyncFakeVapi",
+    "CallScript",
+    "FakeVapi",
+    "ScaledClock",
+    "VirtualClock",
+]
+
+Duration = Union[float, Tuple[float, float], Callable[[random.Random], float]]
+
+ORG_ID = "00000000-0000-4000-8000-00000000c0a2"
+DEFAULT_OUTCOMES: Mapping[str, float] = {
+    "customer-ended-call": 0.55,
+    "assistant-ended-call": 0.25,
+    "customer-did-not-answer": 0.1,
+    "customer-busy": 0.05,
+    "silence-timed-out": 0.03,
+    "pipeline-error-openai-llm-failed": 0.02,
+}
+UNANSWERED_REASONS = {"customer-did-not-answer", "customer-busy"}
+FAILED_REASON_PREFIXES = ("pipeline-error", "silence-timed-out")
+
+_BOT_LINES = (
+    "I can help you with that. Could you confirm your date of birth?",
+    "Thank you. I see an opening on Tuesday at 10:30 in the morning.",
+    "Would you prefer the main clinic or the downtown office?",
+    "Great, I have booked that for you. You will get a text confirmation shortly.",
+    "Is there anything else I can help you with today?",
+    "Let me check the schedule for you, one moment please.",
+)
+_USER_LINES = (
+    "Hi, I need to reschedule my appointment.",
+    "Sure, it's March 4th, 1980.",
+    "Tuesday works for me.",
+    "The main clinic, please.",
+    "No, that's everything. Thanks!",
+    "Can we do something later in the afternoon?",
+)
+
+
+class VirtualClock:
+    """
+    Simulated time that only moves when told to: :meth:`advance` moves it by
+    hand, every request to the fake moves it by ``step`` seconds, and injected
+    latency moves it instead of sleeping. Tests stay deterministic and never
+    wait on wall time.
+    """
+
+    def __init__(self, start: float = 0.0, *, step: float = 0.0) -> None:
+        self._now = start
+        self.step = step
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> float:
+        with self._lock:
+            self._now += max(seconds, 0.0)
+            return self._now
+
+    def tick(self) -> None:
+        if self.step:
+            self.advance(self.step)
+
+    def delay(self, seconds: float) -> float:
+        self.advance(seconds)
+        return 0.0
+
+
+class ScaledClock:
+    """
+    Wall-clock time sped up by ``speed`` (``speed=60`` plays a minute-long call
+    in one second). Latency really sleeps, scaled down by the same factor, so
+    concurrency and pool behaviour stay observable. ``speed=1`` is real time.
+    """
+
+    def __init__(self, speed: float = 1.0) -> None:
+        if speed <= 0:
+            raise ValueError("speed must be positive.")
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self) -> float:
+        return (time.monotonic() - self._origin) * self.speed
+
+    def tick(self) -> None:
+        return None
+
+    def delay(self, seconds: float) -> float:
+        return max(seconds, 0.0) / self.speed
+
+
+Clock = Union[VirtualClock, ScaledClock]
+
+
+@dataclass(frozen=True)
+class CallScript:
+    """
+    How simulated calls unfold. Durations are seconds of simulated time and may
+    be a constant, a ``(low, high)`` uniform range or ``callable(rng)``.
+    ``outcomes`` maps ``endedReason`` values to relative weights.
+    """
+
+    queued_seconds: Duration = (0.5, 2.0)
+    ringing_seconds: Duration = (2.0, 8.0)
+    talk_seconds: Duration = (30.0, 180.0)
+    turn_seconds: Duration = (2.0, 7.0)
+    outcomes: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_OUTCOMES))
+    cost_per_minute: float = 0.11
+
+
+@dataclass
+class _FakeCall:
+    id: str
+    created: float
+    request: Dict[str, Any]
+    ring_at: float
+    answer_at: Optional[float]
+    end_at: float
+    ended_reason: str
+    transcript: List[Tuple[float, Dict[str, Any]]]
+    name: Optional[str] = None
+    rendered: Optional[Tuple[Tuple[str, int], Any]] = None
+
+
+class FakeVapi:
+    """
+    Drop-in replacement for ``vapi.Vapi`` backed by in-memory state.
+
+    ``latency`` (a :data:`Duration`) is applied to every request. ``error_rate``
+    and ``rate_limit_rate`` are per-request probabilities of a 5xx or a 429.
+    ``requests_per_second`` answers 429 (with ``Retry-After``) whenever more
+    requests arrive within one simulated second. Errors are raised as the SDK's
+    ``ApiError``. A request whose latency exceeds the ``timeout_in_seconds``
+    request option fails with ``httpx.ReadTimeout`` after that long.
+    :attr:`request_counts` counts requests per ``resource.method``.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Optional[Clock] = None,
+        seed: Optional[int] = None,
+        script: Optional[CallScript] = None,
+        latency: Duration = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        requests_per_second: Optional[float] = None,
+        reply: Optional[Callable[[str], str]] = None,
+        start: Optional[datetime] = None,
+    ) -> None:
+        self.clock: Clock = clock if clock is not None else ScaledClock()
+        self.script = script or CallScript()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_second = requests_per_second
+        self.request_counts: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._reply = reply or _default_reply
+        self._epoch = start or datetime.now(timezone.utc)
+        self._lock = threading.RLock()
+        self._faults: Deque[Tuple[Optional[str], Optional[int], Dict[str, str], float]] = deque()
+        self._recent: Deque[float] = deque()
+        self._assistants: Dict[str, Any] = {}
+        self._calls: Dict[str, _FakeCall] = {}
+        self._chats: Dict[str, Any] = {}
+        self._sessions: Dict[str, List[Dict[str, Any]]] = {}
+        self._phone_numbers: Dict[str, Any] = {}
+
+        self.assistants = _Resource(self, "assistants", _Assistants(self))
+        self.calls = _Resource(self, "calls", _Calls(self))
+        self.chats = _Resource(self, "chats", _Chats(self))
+        self.phone_numbers = _Resource(self, "phone_numbers", _PhoneNumbers(self))
+        self.phone_number_id = self.add_phone_number("+15555550123", name="Fake main line").id
+
+    def connector(self, **options: Any) -> VapiConnector:
+        """
+        Return a :class:`~cora.vapi_client.VapiConnector` backed by this fake.
+        ``options`` (``policy``, ``metrics``, ``coalesce``, ``call_cache``) are
+        passed to the connector.
+        """
+        return VapiConnector(client=self, **options)
+
+    def async_connector(self, **options: Any) -> AsyncVapiConnector:
+        """
+        Return an :class:`~cora.vapi_client.AsyncVapiConnector` backed by this fake.
+        """
+        return AsyncVapiConnector(client=AsyncFakeVapi(self), **options)
+
+    def inject(self, status_code: int, *, count: int = 1, op: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Fail the next ``count`` requests (only those to ``op``, e.g.
+        ``"calls.get"``, when given) with ``status_code``.
+        """
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        with self._lock:
+            for _ in range(count):
+                self._faults.append((op, status_code, headers, 0.0))
+
+    def stall(self, seconds: float, *, count: int = 1, op: Optional[str] = None) -> None:
+        """
+        Make the next ``count`` requests (to ``op``, when given) take an extra
+        ``seconds`` of simulated time, as if the API hung.
+        """
+        with self._lock:
+            for _ in range(count):
+                self._faults.append((op, None, {}, seconds))
+
+    def add_phone_number(self, number: str, *, name: Optional[str] = None) -> Any:
+        """
+        Register a phone number (returned by ``phone_numbers.list``/``get``).
+        """
+        from vapi.phone_numbers.types.list_phone_numbers_response_item import (
+            ListPhoneNumbersResponseItem_Vapi,
+        )
+
+        with self._lock:
+            now = self._timestamp(self.clock.now())
+            phone = ListPhoneNumbersResponseItem_Vapi.model_validate(
+                {
+                    "provider": "vapi",
+                    "id": self._new_id(),
+                    "orgId": ORG_ID,
+                    "number": number,
+                    "name": name,
+                    "status": "active",
+                    "createdAt": now,
+                    "updatedAt": now,
+                }
+            )
+            self._phone_numbers[phone.id] = phone
+        return phone
+
+    def end_call(self, call_id: str, *, reason: str = "assistant-ended-call") -> None:
+        """
+        End an active call now (as if hung up), keeping the transcript so far.
+        """
+        with self._lock:
+            call = self._require_call(call_id)
+            now = self.clock.now()
+            if now < call.end_at:
+                call.end_at = now
+                call.ended_reason = reason
+                call.transcript = [(t, m) for t, m in call.transcript if t <= now]
+                call.rendered = None
+
+    @contextmanager
+    def stream(self, path: str, *, json: Mapping[str, Any]) -> Iterator[Iterator[str]]:
+        """
+        Server-sent event lines for ``POST /chat`` with ``stream: true``, used
+        by :meth:`VapiConnector.stream`. The reply arrives word by word.
+        """
+        yield iter(self._run("chats.stream", self._stream_lines, path, json))
+
+    # -- request pipeline ---------------------------------------------------
+
+    def _run(self, op: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        delay, error = self._admit(op, _request_timeout(kwargs))
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        kwargs.pop("request_options", None)
+        with self._lock:
+            return fn(*args, **kwargs)
+
+    async def _arun(self, op: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        delay, error = self._admit(op, _request_timeout(kwargs))
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        kwargs.pop("request_options", None)
+        with self._lock:
+            return fn(*args, **kwargs)
+
+    def _admit(self, op: str, timeout: Optional[float] = None) -> Tuple[float, Optional[Exception]]:
+        self.clock.tick()
+        with self._lock:
+            self.request_counts[op] += 1
+            latency = self._sample(self.latency)
+            fault: Optional[Exception] = None
+            for index, (fault_op, status_code, headers, stall) in enumerate(self._faults):
+                if fault_op is None or fault_op == op:
+                    del self._faults[index]
+                    if status_code is None:
+                        latency += stall
+                    else:
+                        fault = _api_error(status_code, headers)
+                    break
+            if timeout is not None and latency > timeout:
+                return self.clock.delay(timeout), _timeout_error(op, timeout)
+            delay = self.clock.delay(latency)
+            if fault is not None:
+                return delay, fault
+            now = self.clock.now()
+            if self.requests_per_second is not None:
+                while self._recent and self._recent[0] <= now - 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.requests_per_second:
+                    retry_after = max(self._recent[0] + 1.0 - now, 0.0)
+                    return delay, _api_error(429, {"retry-after": f"{retry_after:.3f}"})
+                self._recent.append(now)
+            if self.rate_limit_rate and self._rng.random() < self.rate_limit_rate:
+                return delay, _api_error(429, {"retry-after": "1"})
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return delay, _api_error(self._rng.choice((500, 502, 503)), {})
+        return delay, None
+
+    # -- helpers --------------------------------------------------------------
+
+    def _stream_lines(self, path: str, body: Mapping[str, Any]) -> List[str]:
+        if path.strip("/") != "chat":
+            raise _api_error(404, {}, f"Cannot stream {path}.")
+        request = {_snake(key): value for key, value in body.items() if key != "stream"}
+        chat = self.chats._impl.create(**request)
+        reply = chat.output[-1].content if chat.output else ""
+        lines = []
+        for index, word in enumerate(reply.split(" ")):
+            event = {
+                "id": chat.id,
+                "sessionId": chat.session_id,
+                "path": "chat.output[0].content",
+                "delta": word if index == 0 else " " + word,
+            }
+            lines.extend([f"data: {json.dumps(event)}", ""])
+        lines.extend(["data: [DONE]", ""])
+        return lines
+
+    def _sample(self, duration: Duration) -> float:
+        if callable(duration):
+            return float(duration(self._rng))
+        if isinstance(duration, tuple):
+            low, high = duration
+            return self._rng.uniform(low, high)
+        return float(duration)
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _timestamp(self, seconds: float) -> datetime:
+        return self._epoch + timedelta(seconds=seconds)
+
+    def _require_call(self, call_id: str) -> _FakeCall:
+        call = self._calls.get(call_id)
+        if call is None:
+            raise _api_error(404, {}, f"Call {call_id} not found.")
+        return call
+
+
+class AsyncFakeVapi:
+    """
+    ``vapi.AsyncVapi`` counterpart sharing state with a :class:`FakeVapi`;
+    latency is awaited with ``asyncio.sleep`` instead of blocking the loop.
+    """
+
+    def __init__(self, fake: FakeVapi) -> None:
+        self.fake = fake
+        self.assistants = _Resource(fake, "assistants", fake.assistants._impl, is_async=True)
+        self.calls = _Resource(fake, "calls", fake.calls._impl, is_async=True)
+        self.chats = _Resource(fake, "chats", fake.chats._impl, is_async=True)
+        self.phone_numbers = _Resource(fake, "phone_numbers", fake.phone_numbers._impl, is_async=True)
+
+    @asynccontextmanager
+    async def stream(self, path: str, *, json: Mapping[str, Any]) -> AsyncIterator[AsyncIterator[str]]:
+        lines = await self.fake._arun("chats.stream", self.fake._stream_lines, path, json)
+
+        async def iterate() -> AsyncIterator[str]:
+            for line in lines:
+                yield line
+
+        yield iterate()
+
+
+class _Resource:
+    """
+    Routes ``resource.method(...)`` through the fake's fault/latency pipeline
+    before running the in-memory implementation.
+    """
+
+    def __init__(self, fake: FakeVapi, name: str, impl: Any, *, is_async: bool = False) -> None:
+        self._fake = fake
+        self._name = name
+        self._impl = impl
+        self._is_async = is_async
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        fn = getattr(self._impl, method)
+        op = f"{self._name}.{method}"
+        if self._is_async:
+
+            async def call_async(*args: Any, **kwargs: Any) -> Any:
+                return await self._fake._arun(op, fn, *args, **kwargs)
+
+            return call_async
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._fake._run(op, fn, *args, **kwargs)
+
+        return call
+
+
+class _Assistants:
+    def __init__(self, fake: FakeVapi) -> None:
+        self._fake = fake
+
+    def create(self, **fields: Any) -> Any:
+        from vapi.types import Assistant
+
+        fake = self._fake
+        now = fake._timestamp(fake.clock.now())
+        assistant = Assistant.model_validate(
+            {**fields, "id": fake._new_id(), "orgId": ORG_ID, "createdAt": now, "updatedAt": now}
+        )
+        fake._assistants[assistant.id] = assistant
+        return assistant
+
+    def get(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        assistant = self._fake._assistants.get(id)
+        if assistant is None:
+            raise _api_error(404, {}, f"Assistant {id} not found.")
+        return assistant
+
+    def list(self, *, limit: Optional[float] = None, **filters: Any) -> List[Any]:
+        return _filter_listing(self._fake._assistants.values(), limit=limit, **filters)
+
+    def update(self, id: str, **fields: Any) -> Any:  # noqa: A002 - SDK signature
+        from vapi.types import Assistant
+
+        current = self.get(id)
+        merged = {**current.model_dump(exclude_none=True), **fields}
+        merged["updated_at"] = self._fake._timestamp(self._fake.clock.now())
+        assistant = Assistant.model_validate(merged)
+        self._fake._assistants[id] = assistant
+        return assistant
+
+    def delete(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        assistant = self.get(id)
+        del self._fake._assistants[id]
+        return assistant
+
+
+class _Calls:
+    def __init__(self, fake: FakeVapi) -> None:
+        self._fake = fake
+
+    def create(self, **request: Any) -> Any:
+        fake = self._fake
+        assistant_id = request.get("assistant_id")
+        if assistant_id is not None and assistant_id not in fake._assistants:
+            raise _api_error(400, {}, f"Couldn't Get Assistant. `assistantId` {assistant_id} Does Not Exist.")
+        if assistant_id is None and request.get("assistant") is None and request.get("squad_id") is None:
+            raise _api_error(400, {}, "Need Either `assistantId` Or `assistant` Or `squadId`.")
+        phone_number_id = request.get("phone_number_id")
+        if phone_number_id is not None and phone_number_id not in fake._phone_numbers:
+            raise _api_error(400, {}, f"Couldn't Get Phone Number. `phoneNumberId` {phone_number_id} Does Not Exist.")
+        if not request.get("customer"):
+            raise _api_error(400, {}, "Need Either `customer` Or `customerId`.")
+        call = self._simulate(request)
+        fake._calls[call.id] = call
+        return self._render(call)
+
+    def get(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        return self._render(self._fake._require_call(id))
+
+    def list(
+        self,
+        *,
+        id: Optional[str] = None,  # noqa: A002 - SDK signature
+        assistant_id: Optional[str] = None,
+        phone_number_id: Optional[str] = None,
+        limit: Optional[float] = None,
+        **filters: Any,
+    ) -> List[Any]:
+        calls = [
+            self._render(call)
+            for call in self._fake._calls.values()
+            if (id is None or call.id == id)
+            and (assistant_id is None or call.request.get("assistant_id") == assistant_id)
+            and (phone_number_id is None or call.request.get("phone_number_id") == phone_number_id)
+        ]
+        return _filter_listing(calls, limit=limit, **filters)
+
+    def update(self, id: str, *, name: Optional[str] = None) -> Any:  # noqa: A002 - SDK signature
+        call = self._fake._require_call(id)
+        call.name = name
+        call.rendered = None
+        return self._render(call)
+
+    def delete(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        call = self._fake._require_call(id)
+        rendered = self._render(call)
+        del self._fake._calls[id]
+        return rendered
+
+    def _simulate(self, request: Dict[str, Any]) -> _FakeCall:
+        fake = self._fake
+        script = fake.script
+        rng = fake._rng
+        created = fake.clock.now()
+        ring_at = created + fake._sample(script.queued_seconds)
+        answer_at: Optional[float] = ring_at + fake._sample(script.ringing_seconds)
+        reasons = list(script.outcomes)
+        reason = rng.choices(reasons, weights=[script.outcomes[r] for r in reasons])[0]
+        transcript: List[Tuple[float, Dict[str, Any]]] = []
+        if reason in UNANSWERED_REASONS:
+            end_at = answer_at
+            answer_at = None
+        else:
+            talk = fake._sample(script.talk_seconds)
+            if reason.startswith(FAILED_REASON_PREFIXES):
+                talk *= rng.uniform(0.1, 0.6)
+            end_at = answer_at + talk
+            transcript = self._transcript(request, answer_at, end_at)
+        return _FakeCall(
+            id=fake._new_id(),
+            created=created,
+            request=dict(request),
+            ring_at=ring_at,
+            answer_at=answer_at,
+            end_at=end_at,
+            ended_reason=reason,
+            transcript=transcript,
+            name=request.get("name"),
+        )
+
+    def _transcript(self, request: Dict[str, Any], start: float, end: float) -> List[Tuple[float, Dict[str, Any]]]:
+        fake = self._fake
+        rng = fake._rng
+        assistant = fake._assistants.get(request.get("assistant_id") or "")
+        system_prompt = _system_prompt(assistant) or "You are a helpful assistant."
+        first_message = getattr(assistant, "first_message", None) or "Hello! How can I help you today?"
+        system = {
+            "role": "system",
+            "message": system_prompt,
+            "time": fake._timestamp(start).timestamp() * 1000,
+            "secondsFromStart": 0.0,
+        }
+        entries = [(start, system)]
+        clock = start + 0.5
+        role = "bot"
+        text = first_message
+        while clock < end:
+            duration = min(rng.uniform(1.0, 4.0), max(end - clock, 0.1))
+            message: Dict[str, Any] = {
+                "role": role,
+                "message": text,
+                "time": fake._timestamp(clock).timestamp() * 1000,
+                "endTime": fake._timestamp(clock + duration).timestamp() * 1000,
+                "secondsFromStart": round(clock - start, 3),
+                "duration": round(duration * 1000, 1),
+            }
+            if role == "bot":
+                message["source"] = "model"
+            entries.append((clock + duration, message))
+            clock += duration + fake._sample(fake.script.turn_seconds) / 2
+            role = "user" if role == "bot" else "bot"
+            text = rng.choice(_USER_LINES if role == "user" else _BOT_LINES)
+        return entries
+
+    def _render(self, call: _FakeCall) -> Any:
+        from vapi.types import Call
+
+        fake = self._fake
+        now = fake.clock.now()
+        if now < call.ring_at:
+            status, changed = "queued", call.created
+        elif call.answer_at is not None and now < call.answer_at:
+            status, changed = "ringing", call.ring_at
+        elif call.answer_at is None and now < call.end_at:
+            status, changed = "ringing", call.ring_at
+        elif now < call.end_at:
+            status, changed = "in-progress", call.answer_at or call.ring_at
+        else:
+            status, changed = "ended", call.end_at
+        visible = [message for at, message in call.transcript if at <= now]
+        if visible:
+            changed = max(changed, max(at for at, _ in call.transcript if at <= now))
+        key = (status, len(visible))
+        if call.rendered is not None and call.rendered[0] == key:
+            return call.rendered[1]
+
+        request = call.request
+        payload: Dict[str, Any] = {
+            "id": call.id,
+            "orgId": ORG_ID,
+            "type": "outboundPhoneCall",
+            "status": status,
+            "assistantId": request.get("assistant_id"),
+            "phoneNumberId": request.get("phone_number_id"),
+            "customer": request.get("customer"),
+            "assistantOverrides": request.get("assistant_overrides"),
+            "name": call.name,
+            "createdAt": fake._timestamp(call.created),
+            "updatedAt": fake._timestamp(changed),
+            "messages": visible,
+        }
+        if call.answer_at is not None and now >= call.answer_at:
+            payload["startedAt"] = fake._timestamp(call.answer_at)
+        if status == "ended":
+            talk_seconds = call.end_at - call.answer_at if call.answer_at is not None else 0.0
+            payload.update(
+                endedReason=call.ended_reason,
+                endedAt=fake._timestamp(call.end_at),
+                cost=round(talk_seconds / 60 * fake.script.cost_per_minute, 4),
+                transcript=_transcript_text(visible),
+                analysis=_analysis(call, visible),
+            )
+        rendered = Call.model_validate({k: v for k, v in payload.items() if v is not None})
+        call.rendered = (key, rendered)
+        return rendered
+
+
+class _Chats:
+    def __init__(self, fake: FakeVapi) -> None:
+        self._fake = fake
+
+    def create(
+        self,
+        *,
+        input: Any,  # noqa: A002 - SDK signature
+        assistant_id: Optional[str] = None,
+        assistant: Optional[Any] = None,
+        session_id: Optional[str] = None,
+        previous_chat_id: Optional[str] = None,
+        transport: Optional[Any] = None,
+        **fields: Any,
+    ) -> Any:
+        from vapi.types import Chat
+
+        fake = self._fake
+        if session_id is not None and session_id not in fake._sessions:
+            raise _api_error(404, {}, f"Session {session_id} not found.")
+        if assistant_id is None and assistant is None and session_id is None:
+            raise _api_error(400, {}, "Need Either `assistantId` Or `assistant` Or `sessionId`.")
+        if assistant_id is not None and assistant_id not in fake._assistants:
+            raise _api_error(400, {}, f"Couldn't Get Assistant. `assistantId` {assistant_id} Does Not Exist.")
+        if previous_chat_id is not None and previous_chat_id not in fake._chats:
+            raise _api_error(404, {}, f"Chat {previous_chat_id} not found.")
+
+        if session_id is not None:
+            history = list(fake._sessions[session_id])
+        elif previous_chat_id is not None:
+            previous = fake._chats[previous_chat_id]
+            history = [_message_dict(m) for m in (previous.messages or []) + (previous.output or [])]
+        else:
+            history = []
+        if session_id is None and transport is not None:
+            session_id = fake._new_id()
+
+        inputs = [{"role": "user", "content": input}] if isinstance(input, str) else [_message_dict(m) for m in input]
+        last_user = next((m.get("content") for m in reversed(inputs) if m.get("role") == "user"), "") or ""
+        output = [{"role": "assistant", "content": fake._reply(str(last_user))}]
+        now = fake._timestamp(fake.clock.now())
+        chat = Chat.model_validate(
+            {
+                **{k: v for k, v in fields.items() if k not in ("stream",)},
+                "id": fake._new_id(),
+                "orgId": ORG_ID,
+                "assistantId": assistant_id,
+                "sessionId": session_id,
+                "previousChatId": previous_chat_id,
+                "input": input,
+                "messages": history + inputs,
+                "output": output,
+                "cost": round(0.0004 * sum(len(str(m.get("content", ""))) for m in inputs + output) / 4, 6),
+                "createdAt": now,
+                "updatedAt": now,
+            }
+        )
+        fake._chats[chat.id] = chat
+        if session_id is not None:
+            fake._sessions[session_id] = history + inputs + output
+        return chat
+
+    def get(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        chat = self._fake._chats.get(id)
+        if chat is None:
+            raise _api_error(404, {}, f"Chat {id} not found.")
+        return chat
+
+    def list(
+        self,
+        *,
+        assistant_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        limit: Optional[float] = None,
+        **filters: Any,
+    ) -> Any:
+        from vapi.types import ChatPaginatedResponse
+
+        chats = [
+            chat
+            for chat in self._fake._chats.values()
+            if (assistant_id is None or chat.assistant_id == assistant_id)
+            and (session_id is None or chat.session_id == session_id)
+        ]
+        filters.pop("page", None)
+        results = _filter_listing(chats, limit=limit, **filters)
+        return ChatPaginatedResponse.model_validate(
+            {
+                "results": results,
+                "metadata": {"itemsPerPage": len(results), "totalItems": len(chats), "currentPage": 1},
+            }
+        )
+
+    def delete(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        chat = self.get(id)
+        del self._fake._chats[id]
+        return chat
+
+
+class _PhoneNumbers:
+    def __init__(self, fake: FakeVapi) -> None:
+        self._fake = fake
+
+    def list(self, *, limit: Optional[float] = None, **filters: Any) -> List[Any]:
+        return _filter_listing(self._fake._phone_numbers.values(), limit=limit, **filters)
+
+    def get(self, id: str) -> Any:  # noqa: A002 - SDK signature
+        phone = self._fake._phone_numbers.get(id)
+        if phone is None:
+            raise _api_error(404, {}, f"Phone number {id} not found.")
+        return phone
+
+
+def _filter_listing(items: Any, *, limit: Optional[float] = None, **filters: Any) -> List[Any]:
+    """
+    Apply the SDK's ``created_at_*``/``updated_at_*`` filters and return newest
+    first, ``limit`` (default 100) at most.
+    """
+    ops = {
+        "gt": lambda a, b: a > b,
+        "ge": lambda a, b: a >= b,
+        "lt": lambda a, b: a < b,
+        "le": lambda a, b: a <= b,
+    }
+    selected = list(items)
+    for key, bound in filters.items():
+        if bound is None:
+            continue
+        attr, _, op = key.rpartition("_")
+        if attr not in ("created_at", "updated_at") or op not in ops:
+            raise TypeError(f"unexpected filter {key!r}")
+        bound = bound if bound.tzinfo is not None else bound.replace(tzinfo=timezone.utc)
+        selected = [item for item in selected if ops[op](getattr(item, attr), bound)]
+    selected.sort(key=lambda item: item.created_at, reverse=True)
+    return selected[: int(limit) if limit is not None else 100]
+
+
+def _request_timeout(kwargs: Mapping[str, Any]) -> Optional[float]:
+    return (kwargs.get("request_options") or {}).get("timeout_in_seconds")
+
+
+def _timeout_error(op: str, timeout: float) -> Exception:
+    import httpx
+
+    return httpx.ReadTimeout(f"{op} timed out after {timeout:g}s")
+
+
+def _api_error(status_code: int, headers: Dict[str, str], message: Optional[str] = None) -> Exception:
+    from vapi.core.api_error import ApiError
+
+    default = {429: "Too Many Requests", 404: "Not Found"}.get(status_code, "Internal Server Error")
+    body = {"statusCode": status_code, "message": message or default}
+    return ApiError(status_code=status_code, headers=headers, body=body)
+
+
+def _system_prompt(assistant: Any) -> Optional[str]:
+    model = getattr(assistant, "model", None)
+    for message in getattr(model, "messages", None) or []:
+        if getattr(message, "role", None) == "system":
+            return getattr(message, "content", None)
+    return None
+
+
+def _transcript_text(messages: List[Dict[str, Any]]) -> str:
+    labels = {"bot": "AI", "user": "User"}
+    return "\n".join(f"{labels[m['role']]}: {m['message']}" for m in messages if m["role"] in labels)
+
+
+def _analysis(call: _FakeCall, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if call.answer_at is None:
+        return {"summary": "The customer did not pick up.", "successEvaluation": "false"}
+    turns = sum(1 for m in messages if m["role"] in ("bot", "user"))
+    success = not call.ended_reason.startswith(FAILED_REASON_PREFIXES) and turns >= 4
+    summary = (
+        f"The assistant spoke with the customer over {turns} turns; the call ended with {call.ended_reason}."
+    )
+    return {"summary": summary, "successEvaluation": "true" if success else "false"}
+
+
+def _message_dict(message: Any) -> Dict[str, Any]:
+    if isinstance(message, Mapping):
+        return dict(message)
+    dump = getattr(message, "model_dump", None)
+    if dump is not None:
+        return dump(by_alias=True, exclude_none=True)
+    return {"role": "user", "content": str(message)}
+
+
+def _default_reply(text: str) -> str:
+    if not text:
+        return "Hi! How can I help you today?"
+    return f"Thanks for your message. You said: {text.strip()}"
+
+
+def _snake(key: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
@@ -1,3 +1,22 @@
-from .connector import VapiConnector
+from .connector import (
+    AsyncVapiConnector,
+    VapiConnector,
+    get_default_async_connector,
+    get_default_connector,
+    reset_default_connectors,
+)
+from .coalesce import ReadCoalescer
+from .policy import DEFAULT_REQUEST_POLICY, CircuitBreaker, CircuitOpenError, RequestPolicy
 
-__all__ = ["VapiConnector"]
+__all__ = [
+    "VapiConnector",
+    "AsyncVapiConnector",
+    "get_default_connector",
+    "get_default_async_connector",
+    "reset_default_connectors",
+    "RequestPolicy",
+    "DEFAULT_REQUEST_POLICY",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ReadCoalescer",
+]
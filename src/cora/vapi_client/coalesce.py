@@ -0,0 +1,257 @@
+"""
+Single-flight coalescing for ``get`` requests: concurrent reads of the same
+resource id share one in-flight request, and with a TTL its answer is reused
+for that long afterwards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+__all__ = ["ReadCoalescer"]
+
+# Finished answers kept for the TTL; expired ones are dropped past this size.
+MAX_CACHED_READS = 4096
+# Methods that change a resource, so its cached read must be dropped.
+_WRITE_METHODS = frozenset({"update", "delete"})
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _LeaderCancelled(Exception):
+    """
+    Raised to async followers when the task performing their read is
+    cancelled; they retry instead of inheriting the cancellation.
+    """
+
+
+class ReadCoalescer:
+    """
+    Shares ``get`` requests between callers. While a read of a given id is in
+    flight, other callers wait for it and receive the same result (or
+    exception). With ``ttl`` > 0, a successful result is also served to
+    callers arriving within ``ttl`` seconds after it completed. Every caller
+    receives the same SDK object, so treat it as read-only.
+
+    ``sent`` counts reads that reached the API and ``shared`` those answered
+    from another caller's request or the cache.
+    """
+
+    def __init__(self, ttl: float = 0.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if ttl < 0:
+            raise ValueError("ttl must be zero or positive.")
+        self.ttl = ttl
+        self.sent = 0
+        self.shared = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Any] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def call(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Return ``fn(*args, **kwargs)``, sharing the call with concurrent (or,
+        within the TTL, recent) callers using the same ``key``.
+        """
+        with self._lock:
+            hit, result = self._cached(key)
+            if hit:
+                return result
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.sent += 1
+            else:
+                self.shared += 1
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                # An invalidate() during the read detached it: don't cache it.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                    if flight.error is None:
+                        self._store(key, flight.result)
+            flight.event.set()
+        return flight.result
+
+    async def acall(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Awaitable counterpart of :meth:`call` for one event loop. If the
+        caller performing the read is cancelled, its followers are not: the
+        first of them to resume sends the read again for the rest.
+        """
+        while True:
+            hit, result = self._cached(key)
+            if hit:
+                return result
+            future = self._flights.get(key)
+            if future is None:
+                break
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                self.shared -= 1
+        future = self._flights[key] = asyncio.get_running_loop().create_future()
+        self.sent += 1
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                # Detach first so followers start a new flight, not rejoin this one.
+                if self._flights.get(key) is future:
+                    del self._flights[key]
+                future.set_exception(_LeaderCancelled())
+            else:
+                future.set_exception(exc)
+            # Nobody may be waiting; don't log "exception never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if self._flights.get(key) is future:
+                self._store(key, result)
+            return result
+        finally:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Forget the cached answer for ``key``. Reads already in flight still
+        answer their callers but are neither shared with later callers nor
+        cached.
+        """
+        with self._lock:
+            self._cache.pop(key, None)
+            self._flights.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= self._clock():
+            self._cache.pop(key, None)
+            return False, None
+        self.shared += 1
+        return True, entry[1]
+
+    def _store(self, key: Hashable, result: Any) -> None:
+        if self.ttl <= 0:
+            return
+        now = self._clock()
+        if len(self._cache) >= MAX_CACHED_READS:
+            for stale in [item for item, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[stale]
+            while len(self._cache) >= MAX_CACHED_READS:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (now + self.ttl, result)
+
+
+class CoalescingResource:
+    """
+    An SDK resource whose ``get(id)`` goes through a :class:`ReadCoalescer`;
+    ``update``/``delete`` drop the id's cached and in-flight reads, before
+    and again after the write. Other attributes pass straight through.
+    """
+
+    def __init__(self, resource: Any, name: str, coalescer: ReadCoalescer, *, asynchronous: bool = False) -> None:
+        self._resource = resource
+        self._name = name
+        self._coalescer = coalescer
+        self._asynchronous = asynchronous
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._resource, name)
+        if name == "get" and callable(value):
+            wrapped = self._wrap_get(value)
+        elif name in _WRITE_METHODS and callable(value):
+            wrapped = self._wrap_write(value)
+        else:
+            return value
+        self.__dict__[name] = wrapped
+        return wrapped
+
+    def _wrap_get(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        coalescer, resource, asynchronous = self._coalescer, self._name, self._asynchronous
+
+        def get(*args: Any, **kwargs: Any) -> Any:
+            # Only plain ``get(id)`` reads are shared; anything with options
+            # (request_options, filters) goes straight through.
+            resource_id = _plain_id(args, kwargs)
+            if resource_id is None:
+                return fn(*args, **kwargs)
+            key = (resource, resource_id)
+            if asynchronous:
+                return coalescer.acall(key, fn, *args, **kwargs)
+            return coalescer.call(key, fn, *args, **kwargs)
+
+        get.__doc__ = getattr(fn, "__doc__", None)
+        return get
+
+    def _wrap_write(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        coalescer, resource = self._coalescer, self._name
+
+        def write(*args: Any, **kwargs: Any) -> Any:
+            resource_id = args[0] if args else kwargs.get("id")
+            if not isinstance(resource_id, str):
+                return fn(*args, **kwargs)
+            key = (resource, resource_id)
+            coalescer.invalidate(key)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                # A read that started during the write may hold the old object.
+                coalescer.invalidate(key)
+
+        async def awrite(*args: Any, **kwargs: Any) -> Any:
+            resource_id = args[0] if args else kwargs.get("id")
+            if not isinstance(resource_id, str):
+                return await fn(*args, **kwargs)
+            key = (resource, resource_id)
+            coalescer.invalidate(key)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                coalescer.invalidate(key)
+
+        if self._asynchronous:
+            write = awrite
+
+        write.__name__ = getattr(fn, "__name__", "write")
+        write.__doc__ = getattr(fn, "__doc__", None)
+        return write
+
+
+def _plain_id(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[str]:
+    if len(args) == 1 and not kwargs:
+        resource_id = args[0]
+    elif not args and kwargs.keys() == {"id"}:
+        resource_id = kwargs["id"]
+    else:
+        return None
+    return resource_id if isinstance(resource_id, str) else None
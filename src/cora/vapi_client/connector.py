@@ -1,15 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 
-from vapi import Vapi
-from dotenv import load_dotenv
+from .. import metrics as _metrics
+from ..settings import (
+    API_KEY_ENV,
+    LEGACY_PRIVATE_KEY_ENV,
+    Settings,
+    get_settings,
+)
 
-DEFAULT_ENV_PATH = Path.cwd() / ".env"
-API_KEY_ENV = "VAPI_API_KEY"
-LEGACY_PRIVATE_KEY_ENV = "VAPI_PRIVATE_KEY"
+if TYPE_CHECKING:
+    from ..calls.cache import TerminalCallCache
+    from ..metrics import Metrics
+    from .coalesce import ReadCoalescer
+    from .policy import CircuitBreaker, RequestPolicy
+
+__all__ = [
+    "VapiConnector",
+    "AsyncVapiConnector",
+    "get_default_connector",
+    "get_default_async_connector",
+    "reset_default_connectors",
+]
 
 
 class VapiConnector:
@@ -21,37 +40,159 @@ class VapiConnector:
       3. The .env file at the project root (unless overridden)
 
     This keeps the assistants agnostic of how credentials are stored.
+
+    Requests go through a keep-alive ``httpx`` connection pool sized by
+    ``max_connections`` / ``max_keepalive_connections`` / ``keepalive_expiry``
+    (defaulting to the ``VAPI_MAX_CONNECTIONS``, ``VAPI_MAX_KEEPALIVE_CONNECTIONS``
+    and ``VAPI_KEEPALIVE_EXPIRY`` settings). Pass ``httpx_client`` to supply
+    your own transport instead, or ``client`` to wrap an already-built client
+    object (such as :class:`cora.testing.FakeVapi`) with no credentials or
+    HTTP pool at all.
+
+    ``policy`` (a :class:`~cora.vapi_client.RequestPolicy`) governs retries,
+    timeouts, hedged reads and the circuit breaker for every resource method.
+    SDK-backed connectors use ``DEFAULT_REQUEST_POLICY`` unless given one;
+    wrapped ``client`` objects are left alone unless a policy is passed (the
+    client must then accept the SDK's ``request_options`` argument).
+
+    ``metrics`` (a :class:`cora.metrics.Metrics`) records the count, errors
+    and latency of every request; without one the registry set by
+    :func:`cora.metrics.enable_metrics` is used, if any.
+
+    With ``coalesce`` (seconds, default ``VAPI_COALESCE_TTL`` for SDK-backed
+    connectors), concurrent ``get(id)`` calls for the same resource share one
+    request, and its answer is reused for that many seconds (0: only while it
+    is in flight). See :class:`~cora.vapi_client.ReadCoalescer`.
+
+    ``call_cache`` (a :class:`cora.TerminalCallCache`) answers ``calls.get``
+    for finished calls without a request; SDK-backed connectors use the
+    shared cache at ``VAPI_CALL_CACHE`` when that is set.
     """
 
+    _async = False
+
     def __init__(
         self,
         *,
         token: Optional[str] = None,
         env_path: Optional[Path | str] = None,
+        httpx_client: Optional[Any] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        client: Optional[Any] = None,
+        policy: Optional["RequestPolicy"] = None,
+        metrics: Optional["Metrics"] = None,
+        coalesce: Optional[float] = None,
+        call_cache: Optional["TerminalCallCache"] = None,
     ) -> None:
-        env_file = Path(env_path) if env_path is not None else DEFAULT_ENV_PATH
-        if env_file.exists():
-            load_dotenv(dotenv_path=env_file, override=False)
-        else:
-            load_dotenv(override=False)
-
-        api_key = token or os.getenv(API_KEY_ENV)
-        private_key = os.getenv(LEGACY_PRIVATE_KEY_ENV)
-
-        if not private_key and not api_key:
-            raise RuntimeError(
-                f"Missing Vapi credentials. Provide {API_KEY_ENV} (or legacy {LEGACY_PRIVATE_KEY_ENV}) "
-                "via argument, environment variable, or .env file."
+        settings = get_settings(env_path)
+        self.settings = settings
+        self.metrics = metrics
+        self.call_cache = call_cache
+        self._resources: Dict[str, Tuple[Optional["Metrics"], Any]] = {}
+        if client is not None:
+            self._httpx_client = httpx_client
+            self._client = client
+            self._set_policy(policy)
+            self._set_coalescer(coalesce)
+            return
+
+        import httpx
+
+        private_key, api_key = _resolve_credentials(token=token, settings=settings)
+        client_cls, httpx_client_cls = self._sdk_classes()
+        if httpx_client is None:
+            httpx_client = httpx_client_cls(
+                limits=httpx.Limits(
+                    max_connections=max_connections or settings.max_connections,
+                    max_keepalive_connections=max_keepalive_connections or settings.max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else settings.keepalive_expiry,
+                ),
+                timeout=timeout if timeout is not None else settings.timeout,
             )
+        self._httpx_client = httpx_client
+        self._client = self._init_client(
+            private_key=private_key,
+            api_key=api_key,
+            client_cls=client_cls,
+            httpx_client=httpx_client,
+            timeout=timeout if timeout is not None else settings.timeout,
+        )
+        if policy is None:
+            from .policy import DEFAULT_REQUEST_POLICY
+
+            policy = DEFAULT_REQUEST_POLICY
+        self._set_policy(policy)
+        self._set_coalescer(coalesce if coalesce is not None else settings.coalesce_ttl)
+        if call_cache is None and settings.call_cache_path is not None:
+            from ..calls.cache import get_default_call_cache
+
+            self.call_cache = get_default_call_cache(settings.call_cache_path)
+
+    def _set_policy(self, policy: Optional["RequestPolicy"]) -> None:
+        self.policy = policy
+        self.breaker: Optional["CircuitBreaker"] = None
+        self._runner: Any = None
+        if policy is not None:
+            from .policy import _AsyncRunner, _Runner
+
+            self.breaker = policy.breaker()
+            self._runner = (_AsyncRunner if self._async else _Runner)(policy, self.breaker)
+
+    def _set_coalescer(self, ttl: Optional[float]) -> None:
+        self.coalescer: Optional["ReadCoalescer"] = None
+        if ttl is not None:
+            from .coalesce import ReadCoalescer
 
-        self._client = self._init_client(private_key=private_key, api_key=api_key)
+            self.coalescer = ReadCoalescer(ttl)
+
+    def _resource(self, name: str) -> Any:
+        metrics = self.metrics if self.metrics is not None else _metrics._active
+        call_cache = self.call_cache if name == "calls" else None
+        if self._runner is None and metrics is None and self.coalescer is None and call_cache is None:
+            return getattr(self._client, name)
+        cached = self._resources.get(name)
+        if cached is not None and cached[0] is metrics:
+            return cached[1]
+        # Metrics wrap the raw methods so every attempt (retries and hedges
+        # included) is counted; the policy wraps those.
+        wrapped = getattr(self._client, name)
+        if metrics is not None:
+            wrapped = metrics.instrument(wrapped, name, asynchronous=self._async)
+        if self._runner is not None:
+            from .policy import PolicyResource
+
+            wrapped = PolicyResource(wrapped, self._runner)
+        if self.coalescer is not None:
+            # Outermost, so one shared read covers its retries too.
+            from .coalesce import CoalescingResource
+
+            wrapped = CoalescingResource(wrapped, name, self.coalescer, asynchronous=self._async)
+        if call_cache is not None:
+            wrapped = call_cache.wrap(wrapped, asynchronous=self._async)
+        self._resources[name] = (metrics, wrapped)
+        return wrapped
+
+    @staticmethod
+    def _sdk_classes() -> Tuple[type, type]:
+        # Imported here so `import cora` stays cheap until a connector is built.
+        import httpx
+        from vapi import Vapi
+
+        return Vapi, httpx.Client
 
     @staticmethod
     def _init_client(
         *,
         private_key: Optional[str],
         api_key: Optional[str],
-    ) -> Vapi:
+        client_cls: Optional[type] = None,
+        **client_kwargs: Any,
+    ) -> Any:
+        if client_cls is None:
+            client_cls = VapiConnector._sdk_classes()[0]
         attempts = []
         if api_key:
             attempts.append(("api_key", api_key))
@@ -63,8 +204,8 @@ class VapiConnector:
         for param, value in attempts:
             try:
                 if param == "token":
-                    return Vapi(token=value)
-                return Vapi(api_key=value)
+                    return client_cls(token=value, **client_kwargs)
+                return client_cls(api_key=value, **client_kwargs)
             except TypeError:
                 continue
 
@@ -75,7 +216,7 @@ class VapiConnector:
             os.environ[LEGACY_PRIVATE_KEY_ENV] = fallback_value
             os.environ[API_KEY_ENV] = fallback_value
             try:
-                return Vapi()
+                return client_cls(**client_kwargs)
             finally:
                 if prev_private is None:
                     os.environ.pop(LEGACY_PRIVATE_KEY_ENV, None)
@@ -90,16 +231,176 @@ class VapiConnector:
 
     @property
     def assistants(self):
-        return self._client.assistants
+        return self._resource("assistants")
 
     @property
     def calls(self):
-        return self._client.calls
+        return self._resource("calls")
 
     @property
     def chats(self):
-        return self._client.chats
+        return self._resource("chats")
 
     @property
     def phone_numbers(self):
-        return self._client.phone_numbers
+        return self._resource("phone_numbers")
+
+    @contextmanager
+    def stream(self, path: str, *, json: Any) -> Iterator[Iterator[str]]:
+        """
+        POST ``json`` to ``path`` and yield the response body line by line as
+        it arrives (for server-sent event endpoints such as streaming chats).
+        Non-2xx responses raise the SDK's ``ApiError`` before anything is read.
+        """
+        wrapper = getattr(self._client, "_client_wrapper", None)
+        if wrapper is None:
+            # Wrapped clients (cora.testing.FakeVapi) stream themselves.
+            with self._client.stream(path, json=json) as lines:
+                yield lines
+            return
+        with wrapper.httpx_client.stream(
+            path, method="POST", json=json, headers={"accept": "text/event-stream"}
+        ) as response:
+            if not 200 <= response.status_code < 300:
+                response.read()
+                raise _api_error(response)
+            yield response.iter_lines()
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP connections held by this connector.
+        """
+        if self._httpx_client is not None:
+            self._httpx_client.close()
+
+
+class AsyncVapiConnector(VapiConnector):
+    """
+    Asyncio counterpart of :class:`VapiConnector`. Credentials and pool sizing
+    are resolved the same way, but the resources are backed by
+    ``vapi.AsyncVapi`` (over an ``httpx.AsyncClient``) so every SDK method
+    returns an awaitable.
+    """
+
+    _async = True
+
+    @staticmethod
+    def _sdk_classes() -> Tuple[type, type]:
+        import httpx
+        from vapi import AsyncVapi
+
+        return AsyncVapi, httpx.AsyncClient
+
+    @asynccontextmanager
+    async def stream(self, path: str, *, json: Any) -> AsyncIterator[AsyncIterator[str]]:  # type: ignore[override]
+        """
+        Async counterpart of :meth:`VapiConnector.stream`; yields an async
+        iterator of lines.
+        """
+        wrapper = getattr(self._client, "_client_wrapper", None)
+        if wrapper is None:
+            async with self._client.stream(path, json=json) as lines:
+                yield lines
+            return
+        async with wrapper.httpx_client.stream(
+            path, method="POST", json=json, headers={"accept": "text/event-stream"}
+        ) as response:
+            if not 200 <= response.status_code < 300:
+                await response.aread()
+                raise _api_error(response)
+            yield response.aiter_lines()
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP connections held by this connector.
+        """
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+
+    def close(self) -> None:
+        raise TypeError("AsyncVapiConnector must be closed with `await connector.aclose()`.")
+
+
+_default_connectors: Dict[Optional[str], VapiConnector] = {}
+_default_async_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], AsyncVapiConnector]]" = (
+    weakref.WeakKeyDictionary()
+)
+_default_lock = threading.Lock()
+
+
+def get_default_connector(*, token: Optional[str] = None) -> VapiConnector:
+    """
+    Return the process-wide connector for ``token`` (or the configured
+    credentials), creating it on first use. Helpers fall back to this when no
+    connector is passed, so repeated calls share warm pooled connections.
+    """
+    key = _credential_key(token)
+    connector = _default_connectors.get(key)
+    if connector is not None:
+        return connector
+    with _default_lock:
+        connector = _default_connectors.get(key)
+        if connector is None:
+            connector = _default_connectors[key] = VapiConnector(token=token)
+    return connector
+
+
+def get_default_async_connector(*, token: Optional[str] = None) -> AsyncVapiConnector:
+    """
+    Async counterpart of :func:`get_default_connector`. Connectors are cached
+    per running event loop because ``httpx.AsyncClient`` pools cannot be shared
+    across loops.
+    """
+    loop = asyncio.get_running_loop()
+    key = _credential_key(token)
+    with _default_lock:
+        per_loop = _default_async_connectors.setdefault(loop, {})
+        connector = per_loop.get(key)
+        if connector is None:
+            connector = per_loop[key] = AsyncVapiConnector(token=token)
+    return connector
+
+
+def reset_default_connectors() -> None:
+    """
+    Close and forget the process-wide default connectors.
+    """
+    with _default_lock:
+        connectors = list(_default_connectors.values())
+        _default_connectors.clear()
+        _default_async_connectors.clear()
+    for connector in connectors:
+        connector.close()
+
+
+def _credential_key(token: Optional[str]) -> Optional[str]:
+    if token is not None:
+        return token
+    settings = get_settings()
+    return settings.api_key or settings.private_key
+
+
+def _resolve_credentials(
+    *,
+    token: Optional[str],
+    settings: Settings,
+) -> Tuple[Optional[str], Optional[str]]:
+    api_key = token or settings.api_key
+    private_key = settings.private_key
+
+    if not private_key and not api_key:
+        raise RuntimeError(
+            f"Missing Vapi credentials. Provide {API_KEY_ENV} (or legacy {LEGACY_PRIVATE_KEY_ENV}) "
+            "via argument, environment variable, or .env file."
+        )
+    return private_key, api_key
+
+
+def _api_error(response: Any) -> Exception:
+    from vapi.core.api_error import ApiError
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    return ApiError(status_code=response.status_code, headers=dict(response.headers), body=body)
@@ -0,0 +1,393 @@
+"""
+Request policy for :class:`~cora.vapi_client.VapiConnector` resources:
+bounded retries with jittered backoff (honoring ``Retry-After``), per-request
+timeouts and an overall deadline, hedged duplicate reads, and a circuit
+breaker that fails fast while the API is degraded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from ..metrics import carry_helper
+from ..ratelimit import retry_after_seconds
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DEFAULT_REQUEST_POLICY",
+    "RequestPolicy",
+]
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"get", "list", "update", "delete"})
+HEDGED_METHODS = frozenset({"get", "list"})
+HEDGE_WORKERS = 8
+
+# How a failed attempt is treated (see _classify).
+THROTTLED = "throttled"  # 429: not processed, the API is healthy
+UNSENT = "unsent"  # never reached the API (connect errors, open circuit)
+TRANSIENT = "transient"  # 5xx / timeouts: may or may not have been processed
+ANSWERED = "answered"  # a response from the API: success or a final 4xx
+RETRYABLE_OUTCOMES = frozenset({THROTTLED, UNSENT, TRANSIENT})
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of sending a request while the circuit breaker is open.
+    ``retry_in`` is the number of seconds until a probe request is allowed.
+    """
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"Vapi circuit breaker is open; retry in {retry_in:.1f}s.")
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """
+    How a connector sends requests.
+
+    - Failed requests are retried up to ``max_attempts`` in total, waiting a
+      random ("full jitter") delay of up to ``backoff * 2 ** (attempt - 1)``
+      seconds, capped at ``max_backoff``. A 429's ``Retry-After`` is used
+      as-is, unless it is longer than ``max_retry_after`` (then the 429 is
+      raised).
+    - Reads and updates (``idempotent_methods``) are retried on 408/429/5xx,
+      timeouts and connection errors. Everything else (``calls.create``,
+      ``chats.create`` ...) is retried only when the request surely was not
+      processed: a 429, or a connection that never opened.
+    - ``timeout`` bounds each attempt and ``deadline`` the whole call,
+      retries included (None: the connector's HTTP timeout / no deadline).
+    - With ``hedge_after``, a ``get``/``list`` still pending after that many
+      seconds is sent a second time and the first answer wins.
+    - ``breaker_threshold`` consecutive 5xx/timeout failures open the
+      circuit for ``breaker_cooldown`` seconds: requests fail immediately
+      with :class:`CircuitOpenError`, then a single probe decides whether to
+      close it again. None disables the breaker.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 20.0
+    max_retry_after: float = 60.0
+    timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    hedge_after: Optional[float] = None
+    breaker_threshold: Optional[int] = 5
+    breaker_cooldown: float = 30.0
+    retry_statuses: FrozenSet[int] = field(default=RETRY_STATUSES)
+    idempotent_methods: FrozenSet[str] = field(default=IDEMPOTENT_METHODS)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if self.breaker_threshold is not None and self.breaker_threshold < 1:
+            raise ValueError("breaker_threshold must be at least 1 (or None to disable the breaker).")
+
+    def backoff_delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """
+        Seconds to wait after failed attempt number ``attempt`` (1-based).
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** min(attempt - 1, 32))
+        return (rng or random).uniform(0.0, ceiling)
+
+    def breaker(self, *, clock: Callable[[], float] = time.monotonic) -> Optional["CircuitBreaker"]:
+        if self.breaker_threshold is None:
+            return None
+        return CircuitBreaker(self.breaker_threshold, self.breaker_cooldown, clock=clock)
+
+
+DEFAULT_REQUEST_POLICY = RequestPolicy()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker shared by all resources of a
+    connector. ``state`` is ``"closed"``, ``"open"`` or ``"half-open"``.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._clock = clock
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._clock() - self._opened_at < self.cooldown:
+                return "open"
+            return "half-open"
+
+    def before_request(self) -> None:
+        """
+        Raise :class:`CircuitOpenError` unless a request may be sent now.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = self._clock() - self._opened_at
+            if waited < self.cooldown:
+                raise CircuitOpenError(self.cooldown - waited)
+            if self._probing:
+                raise CircuitOpenError(0.0)
+            self._probing = True
+
+    def record(self, outcome: Optional[str]) -> bool:
+        """
+        Record an attempt's outcome: ``ANSWERED`` for a response from the API
+        (success or a final 4xx), one of the failure kinds, or None for a
+        local error. Returns whether this outcome opened the circuit.
+        """
+        with self._lock:
+            if outcome == ANSWERED:
+                self.failures = 0
+                self._opened_at = None
+                self._probing = False
+            elif outcome == TRANSIENT:
+                self.failures += 1
+                if self._probing or (self._opened_at is None and self.failures >= self.threshold):
+                    self._opened_at = self._clock()
+                    self._probing = False
+                    return True
+            else:
+                # Throttled, never sent or a local error: says nothing about
+                # API health, but a probe that ended this way is over.
+                self._probing = False
+            return False
+
+    def reset(self) -> None:
+        self.record(ANSWERED)
+
+
+class _Runner:
+    """
+    Applies a :class:`RequestPolicy` to SDK method calls.
+    """
+
+    def __init__(
+        self,
+        policy: RequestPolicy,
+        breaker: Optional[CircuitBreaker],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        self.policy = policy
+        self.breaker = breaker
+        self._clock = clock
+        self._sleep = sleep
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def wrap(self, fn: Callable[..., Any], method: str) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self.call(fn, method, args, kwargs)
+
+        call.__name__ = getattr(fn, "__name__", method)
+        call.__doc__ = getattr(fn, "__doc__", None)
+        return call
+
+    def call(self, fn: Callable[..., Any], method: str, args: Any, kwargs: Dict[str, Any]) -> Any:
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.breaker is not None:
+                self.breaker.before_request()
+            options = self._options(kwargs, started)
+            try:
+                if self.policy.hedge_after is not None and method in HEDGED_METHODS:
+                    result = self._hedged(fn, args, options)
+                else:
+                    result = fn(*args, **options)
+            except Exception as exc:
+                delay = self._after_failure(exc, method, attempt, started)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record(ANSWERED)
+            return result
+
+    def _hedged(self, fn: Callable[..., Any], args: Any, options: Dict[str, Any]) -> Any:
+        pool = self._hedge_pool()
+        fn = carry_helper(fn)
+        primary = pool.submit(fn, *args, **options)
+        try:
+            return primary.result(timeout=self.policy.hedge_after)
+        except FutureTimeout:
+            pass
+        pending = {primary, pool.submit(fn, *args, **options)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="cora-hedge")
+        return self._pool
+
+    def _options(self, kwargs: Dict[str, Any], started: float) -> Dict[str, Any]:
+        # The SDK retries on its own unless told not to; the policy owns that now.
+        request_options: Dict[str, Any] = {"max_retries": 0}
+        timeout = self._attempt_timeout(started)
+        if timeout is not None:
+            request_options["timeout_in_seconds"] = timeout
+        request_options.update(kwargs.get("request_options") or {})
+        return {**kwargs, "request_options": request_options}
+
+    def _attempt_timeout(self, started: float) -> Optional[float]:
+        policy = self.policy
+        if policy.deadline is None:
+            return policy.timeout
+        remaining = max(policy.deadline - (self._clock() - started), 0.001)
+        return remaining if policy.timeout is None else min(policy.timeout, remaining)
+
+    def _after_failure(self, exc: BaseException, method: str, attempt: int, started: float) -> Optional[float]:
+        """
+        Record the failure and return how long to wait before retrying, or
+        None to give up and raise it.
+        """
+        if isinstance(exc, CircuitOpenError):
+            return None
+        outcome = _classify(exc, self.policy.retry_statuses)
+        if self.breaker is not None and self.breaker.record(outcome):
+            # This failure opened the circuit: raise it rather than CircuitOpenError.
+            return None
+        policy = self.policy
+        if outcome not in RETRYABLE_OUTCOMES or attempt >= policy.max_attempts:
+            return None
+        if outcome == TRANSIENT and method not in policy.idempotent_methods:
+            return None
+        delay = retry_after_seconds(exc) if outcome == THROTTLED else None
+        if delay is None:
+            delay = policy.backoff_delay(attempt)
+        elif delay > policy.max_retry_after:
+            return None
+        if policy.deadline is not None and self._clock() - started + delay >= policy.deadline:
+            return None
+        return delay
+
+
+class _AsyncRunner(_Runner):
+    """
+    :class:`_Runner` for awaitable SDK methods; timeouts are also enforced
+    locally with :func:`asyncio.wait_for`.
+    """
+
+    def wrap(self, fn: Callable[..., Any], method: str) -> Callable[..., Any]:
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.acall(fn, method, args, kwargs)
+
+        call.__name__ = getattr(fn, "__name__", method)
+        call.__doc__ = getattr(fn, "__doc__", None)
+        return call
+
+    async def acall(self, fn: Callable[..., Any], method: str, args: Any, kwargs: Dict[str, Any]) -> Any:
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.breaker is not None:
+                self.breaker.before_request()
+            options = self._options(kwargs, started)
+            timeout = options["request_options"].get("timeout_in_seconds")
+            try:
+                if self.policy.hedge_after is not None and method in HEDGED_METHODS:
+                    result = await asyncio.wait_for(self._ahedged(fn, args, options), timeout)
+                else:
+                    result = await asyncio.wait_for(fn(*args, **options), timeout)
+            except Exception as exc:
+                delay = self._after_failure(exc, method, attempt, started)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record(ANSWERED)
+            return result
+
+    async def _ahedged(self, fn: Callable[..., Any], args: Any, options: Dict[str, Any]) -> Any:
+        primary = asyncio.ensure_future(fn(*args, **options))
+        done, _ = await asyncio.wait({primary}, timeout=self.policy.hedge_after)
+        if done:
+            return primary.result()
+        pending = {primary, asyncio.ensure_future(fn(*args, **options))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        assert error is not None
+        raise error
+
+
+class PolicyResource:
+    """
+    An SDK resource (``assistants``, ``calls`` ...) whose methods run under a
+    request policy. Non-callable attributes pass straight through.
+    """
+
+    def __init__(self, resource: Any, runner: _Runner) -> None:
+        self._resource = resource
+        self._runner = runner
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._resource, name)
+        if name.startswith("_") or not callable(value):
+            return value
+        wrapped = self._runner.wrap(value, name)
+        self.__dict__[name] = wrapped
+        return wrapped
+
+
+def _classify(exc: BaseException, retry_statuses: FrozenSet[int]) -> Optional[str]:
+    """
+    THROTTLED / UNSENT / TRANSIENT for failures worth retrying, ANSWERED for
+    final answers from the API (4xx), None for local and programming errors.
+    """
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        if status == 429:
+            return THROTTLED
+        return TRANSIENT if status in retry_statuses else ANSWERED
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return TRANSIENT
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - httpx ships with the SDK
+        return TRANSIENT if isinstance(exc, ConnectionError) else None
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return UNSENT
+    if isinstance(exc, (httpx.TransportError, ConnectionError)):
+        return TRANSIENT
+    return None
@@ -0,0 +1,398 @@
+"""
+Receive Vapi server messages (``status-update``, ``end-of-call-report``,
+``conversation-update``) so call lifecycle changes are pushed to Cora instead of
+polled. Point the assistant's server URL at a :class:`WebhookReceiver` (stdlib
+HTTP server) or mount :func:`asgi_app` in an existing ASGI service, then pass
+the shared :class:`CallEventHub` to ``wait_for_terminal``/``watch_call`` via
+``events=``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+from .calls import TERMINAL_STATUSES
+
+__all__ = [
+    "CallEvent",
+    "CallEventHub",
+    "WebhookReceiver",
+    "asgi_app",
+    "parse_server_message",
+]
+
+SECRET_HEADER = "x-vapi-secret"
+CALL_EVENT_TYPES = {"status-update", "end-of-call-report", "conversation-update"}
+DEFAULT_MAX_CALLS = 10_000
+DEFAULT_EVENTS_PER_CALL = 32
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CallEvent:
+    """
+    A parsed server message about one call. ``seq`` increases monotonically per
+    hub so waiters can ask for "anything newer than what I have seen".
+    """
+
+    call_id: str
+    type: str
+    status: Optional[str] = None
+    ended_reason: Optional[str] = None
+    messages: List[Any] = field(default_factory=list)
+    call: Dict[str, Any] = field(default_factory=dict)
+    raw: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
+    received_at: float = 0.0
+
+    @property
+    def terminal(self) -> bool:
+        return (
+            self.type == "end-of-call-report"
+            or self.status in TERMINAL_STATUSES
+            or self.ended_reason is not None
+        )
+
+    @property
+    def last_message(self) -> Any:
+        return self.messages[-1] if self.messages else None
+
+
+def parse_server_message(body: Union[bytes, str, Mapping[str, Any]]) -> Optional[CallEvent]:
+    """
+    Parse a Vapi server-message body into a :class:`CallEvent`. Returns None for
+    message types that do not describe call lifecycle or carry no call id, and
+    raises ValueError for malformed bodies.
+    """
+    if isinstance(body, (bytes, str)):
+        body = json.loads(body or "{}")
+    if not isinstance(body, Mapping):
+        raise ValueError("Server message body must be a JSON object.")
+    message = body.get("message", body)
+    if not isinstance(message, Mapping):
+        return None
+    event_type = message.get("type")
+    if not isinstance(event_type, str) or event_type not in CALL_EVENT_TYPES:
+        return None
+    call = message.get("call") or {}
+    call_id = call.get("id") if isinstance(call, Mapping) else None
+    if not call_id:
+        return None
+    if not isinstance(call_id, str):
+        raise ValueError("Server message 'call.id' must be a string.")
+
+    artifact = message.get("artifact") or {}
+    if not isinstance(artifact, Mapping):
+        raise ValueError("Server message 'artifact' must be a JSON object.")
+    messages = message.get("messages") or artifact.get("messages") or []
+    if not isinstance(messages, list):
+        raise ValueError("Server message 'messages' must be a JSON array.")
+    status = message.get("status")
+    if status is not None and not isinstance(status, str):
+        raise ValueError("Server message 'status' must be a string.")
+    if event_type == "end-of-call-report" and status is None:
+        status = "ended"
+    return CallEvent(
+        call_id=call_id,
+        type=event_type,
+        status=status,
+        ended_reason=message.get("endedReason"),
+        messages=list(messages),
+        call=dict(call),
+        raw=dict(message),
+    )
+
+
+class CallEventHub:
+    """
+    Thread-safe mailbox of recent events per call. Keeps at most
+    ``events_per_call`` events for the ``max_calls`` most recently active calls,
+    so events that arrive before anyone waits are not lost. Threads block in
+    :meth:`wait`; coroutines await :meth:`await_event`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_calls: int = DEFAULT_MAX_CALLS,
+        events_per_call: int = DEFAULT_EVENTS_PER_CALL,
+    ) -> None:
+        self._max_calls = max_calls
+        self._events_per_call = events_per_call
+        self._calls: "OrderedDict[str, Deque[CallEvent]]" = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[[CallEvent], None]] = []
+        # call_id -> waiters, so a publish only wakes coroutines waiting on that call.
+        self._async_waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    def publish(self, event: CallEvent) -> CallEvent:
+        """
+        Record ``event`` (stamping its ``seq``) and wake every waiter.
+        """
+        with self._cond:
+            event = replace(event, seq=next(self._sequence), received_at=time.monotonic())
+            queue = self._calls.pop(event.call_id, None)
+            if queue is None:
+                queue = deque(maxlen=self._events_per_call)
+            queue.append(event)
+            self._calls[event.call_id] = queue
+            while len(self._calls) > self._max_calls:
+                self._calls.popitem(last=False)
+            listeners = list(self._listeners)
+            async_waiters = list(self._async_waiters.get(event.call_id, ()))
+            self._cond.notify_all()
+        for loop, wake in async_waiters:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:  # the waiter's loop is closed
+                pass
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:  # noqa: BLE001 - one bad listener must not fail the webhook
+                logger.exception("CallEventHub listener %r failed for call %s", listener, event.call_id)
+        return event
+
+    def subscribe(self, listener: Callable[[CallEvent], None]) -> None:
+        """
+        Call ``listener`` (from the receiving thread) for every published event.
+        Exceptions it raises are logged and otherwise ignored.
+        """
+        with self._cond:
+            self._listeners.append(listener)
+
+    def latest(self, call_id: str) -> Optional[CallEvent]:
+        with self._cond:
+            queue = self._calls.get(call_id)
+            return queue[-1] if queue else None
+
+    def wait(
+        self,
+        call_id: str,
+        *,
+        after: int = 0,
+        timeout: Optional[float] = None,
+        terminal_only: bool = False,
+    ) -> Optional[CallEvent]:
+        """
+        Return the oldest retained event for ``call_id`` with ``seq > after``
+        (only terminal events when ``terminal_only``), blocking up to
+        ``timeout`` seconds. Returns None on timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                event = self._find(call_id, after, terminal_only)
+                if event is not None:
+                    return event
+                if deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    async def await_event(
+        self,
+        call_id: str,
+        *,
+        after: int = 0,
+        timeout: Optional[float] = None,
+        terminal_only: bool = False,
+    ) -> Optional[CallEvent]:
+        """
+        Awaitable :meth:`wait`: suspends the coroutine, not the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while True:
+            wake = asyncio.Event()
+            waiter = (loop, wake)
+            with self._cond:
+                event = self._find(call_id, after, terminal_only)
+                if event is not None:
+                    return event
+                # Registered under the lock, so a publish cannot slip in
+                # between the check and the wait.
+                self._async_waiters.setdefault(call_id, set()).add(waiter)
+            try:
+                if deadline is None:
+                    await wake.wait()
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._cond:
+                    waiters = self._async_waiters.get(call_id)
+                    if waiters is not None:
+                        waiters.discard(waiter)
+                        if not waiters:
+                            del self._async_waiters[call_id]
+
+    def _find(self, call_id: str, after: int, terminal_only: bool) -> Optional[CallEvent]:
+        for event in self._calls.get(call_id, ()):
+            if event.seq > after and (event.terminal or not terminal_only):
+                return event
+        return None
+
+    def handle(self, body: Union[bytes, str, Mapping[str, Any]]) -> Optional[CallEvent]:
+        """
+        Parse a raw server-message body and publish it. Returns the published
+        event, or None when the message was not a call lifecycle event.
+        """
+        event = parse_server_message(body)
+        if event is None:
+            return None
+        return self.publish(event)
+
+
+class WebhookReceiver:
+    """
+    Minimal stdlib HTTP server that feeds POSTed server messages into a
+    :class:`CallEventHub`. Runs on a daemon thread:
+
+        with WebhookReceiver(port=8080, secret="...") as receiver:
+            final_call = cora.wait_for_terminal(v, call.id, events=receiver.hub)
+    """
+
+    def __init__(
+        self,
+        hub: Optional[CallEventHub] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/",
+        secret: Optional[str] = None,
+    ) -> None:
+        self.hub = hub or CallEventHub()
+        self.path = path
+        self._secret = secret
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def start(self) -> "WebhookReceiver":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="cora-webhooks", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "WebhookReceiver":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _handler_class(self) -> type:
+        receiver = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                if self.path.split("?", 1)[0] != receiver.path:
+                    self._reply(404)
+                    return
+                if not _secret_matches(receiver._secret, self.headers.get(SECRET_HEADER)):
+                    self._reply(401)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    receiver.hub.handle(self.rfile.read(length))
+                except ValueError:
+                    self._reply(400)
+                    return
+                self._reply(200)
+
+            def _reply(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return _Handler
+
+
+def asgi_app(hub: CallEventHub, *, secret: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Return an ASGI application that publishes POSTed server messages into
+    ``hub``. Mount it under the path configured as the assistant's server URL.
+    """
+
+    async def app(scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope.get("type") != "http":
+            return
+        if scope.get("method") != "POST":
+            await _asgi_reply(send, 405)
+            return
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        if not _secret_matches(secret, headers.get(SECRET_HEADER)):
+            await _asgi_reply(send, 401)
+            return
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        try:
+            hub.handle(b"".join(chunks))
+        except ValueError:
+            await _asgi_reply(send, 400)
+            return
+        await _asgi_reply(send, 200)
+
+    return app
+
+
+async def _asgi_reply(send: Callable[..., Any], status: int) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def _secret_matches(expected: Optional[str], provided: Optional[str]) -> bool:
+    if expected is None:
+        return True
+    if provided is None:
+        return False
+    return hmac.compare_digest(expected.encode(), provided.encode())